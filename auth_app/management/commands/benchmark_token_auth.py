@@ -0,0 +1,93 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable
+from django.contrib.auth.hashers import BasePasswordHasher, PBKDF2PasswordHasher
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from auth_app.authentication import AccessTokenAuthentication
+from auth_app.models import Access
+from core.models.utils.verified_token import verified_tokens
+from core.utils import generate_email
+from user.models import Device, User
+
+
+class Command(BaseCommand):
+    help = ('Measures token authentications per second by legacy PBKDF2 '
+            'tokens and by HMAC tokens, with and without verified-token '
+            'cache. The users and tokens that are created for it are '
+            'rolled back')
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('-n', '--requests', type=int, default=300,
+                            help='number of authentications to measure')
+
+    def measure(self, func: Callable, count: int) -> float:
+        """Call `func` for `count` times and return calls per second"""
+        start = perf_counter()
+        for _ in range(count):
+            func()
+        return count / (perf_counter() - start)
+
+    @contextmanager
+    def use_hasher(self, hasher: BasePasswordHasher):
+        """Hash and check tokens of `Access` by `hasher`"""
+        default_hasher = Access._hasher
+        Access._hasher = hasher
+        try:
+            yield
+        finally:
+            Access._hasher = default_hasher
+
+    def create_access(self) -> Access:
+        user = User.objects.create_user(generate_email(), is_active=True)
+        device = Device.objects.create(
+            user=user, type=Device.TypeChoices.WINDOWS, model='benchmark')
+        return Access.objects.create(user=user, device=device,
+                                     last_used=timezone.now())
+
+    def get_authenticate(self, access: Access, cached: bool) -> Callable:
+        """
+        Return a function that authenticates token of `access`.
+
+        Only `authenticate_credentials` is called, so token information
+        isn't buffered in cache like a real request.
+        """
+        auth = AccessTokenAuthentication()
+        key = access.encrypted_token
+
+        def authenticate():
+            if not cached:
+                verified_tokens.clear()
+            if auth.authenticate_credentials(key)[-1] != access:
+                raise CommandError("Token isn't authenticated")
+        return authenticate
+
+    def run_benchmark(self, count: int) -> tuple[float, float, float]:
+        with self.use_hasher(PBKDF2PasswordHasher()):
+            legacy_access = self.create_access()
+            legacy = self.measure(
+                self.get_authenticate(legacy_access, cached=False), count)
+
+        access = self.create_access()
+        uncached = self.measure(
+            self.get_authenticate(access, cached=False), count)
+        verified_tokens.clear()
+        cached = self.measure(
+            self.get_authenticate(access, cached=True), count)
+        return legacy, uncached, cached
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            try:
+                legacy, uncached, cached = self.run_benchmark(
+                    options['requests'])
+            finally:
+                transaction.set_rollback(True)
+                verified_tokens.clear()
+
+        self.stdout.write(f"PBKDF2 without cache: {legacy:10.1f} requests/sec")
+        self.stdout.write(f"HMAC without cache:   {uncached:10.1f} requests/sec")
+        self.stdout.write(f"HMAC with cache:      {cached:10.1f} requests/sec")
+        self.stdout.write(self.style.SUCCESS(f"Speedup: x{cached / legacy:.1f}"))
@@ -7,11 +7,12 @@ from .utils import get_user_from_token, update_token_information
 
 
 @database_sync_to_async
-def get_user(token_key):
+def get_user(token_key, scope):
     token = Access.objects.find_token(token_key, select=['user', 'device'])
     if not token:
         return None
 
+    update_token_information(token, scope=scope)
     user = get_user_from_token(token)
     return (user, token)
 
@@ -28,11 +29,8 @@ class TokenAuthMiddleware(BaseMiddleware):
 
         if token_key is None:
             user = AnonymousUser()
-        elif (db_user := await get_user(token_key)):
+        elif (db_user := await get_user(token_key, scope)):
             user, token = db_user
-            await database_sync_to_async(
-                update_token_information
-            )(token, scope=scope)
 
         scope['user'] = user
         return await super().__call__(scope, receive, send)
@@ -1,15 +1,15 @@
 from django.conf import settings
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from django.contrib.auth.hashers import PBKDF2PasswordHasher
 from django.utils import timezone
 from core.models.base import BaseToken
+from core.models.utils.hashers import HMACTokenHasher
 from user.models import Device
 
 
 class Access(BaseToken):
     _token_length = 64
-    _hasher = PBKDF2PasswordHasher()
+    _hasher = HMACTokenHasher()
     _encrypt_key = settings.ACCESSTOKEN_KEY
 
     ip = models.GenericIPAddressField(null=True, blank=True)
@@ -1,8 +1,15 @@
 from celery import shared_task as task
 
 from .models import VerifyCode
+from . import utils
 
 
 @task
 def delete_verifycode(pk):
     VerifyCode.objects.filter(pk=pk, is_used=False).delete()
+
+
+@task
+def flush_token_information():
+    """Save buffered `last_used` and `ip` of accesses to database"""
+    return utils.flush_token_information()
@@ -1,9 +1,12 @@
+from unittest.mock import patch
 from django.test.testcases import TransactionTestCase
-from rest_framework.test import APITransactionTestCase
+from rest_framework.test import APIRequestFactory, APITransactionTestCase
 from rest_framework import status
 
+from auth_app import utils
 from auth_app.models import Access
-from core.tests.mixins import TokenTest
+from core.cache import cache
+from core.tests.mixins import TokenTest, ClearCacheMixin
 from .utils import create_access
 from user.tests.utils import create_device
 from .utils.callers import AccessViewCaller
@@ -16,6 +19,82 @@ class AccessModelTest(TokenTest, TransactionTestCase):
         return create_access()
 
 
+class AccessInformationBufferTest(ClearCacheMixin, TransactionTestCase):
+    def __update(self, access, ip='127.0.0.1'):
+        request = APIRequestFactory().get('/', REMOTE_ADDR=ip)
+        utils.update_token_information(access, request=request)
+
+    def test_update_buffered(self):
+        access = create_access()
+        with self.assertNumQueries(0):
+            self.__update(access)
+            self.__update(access)
+        self.assertEqual(utils.get_buffered_token_information_count(), 1)
+
+        access.refresh_from_db()
+        self.assertIsNone(access.last_used)
+
+    def test_ip_change_buffered(self):
+        access = create_access()
+        self.__update(access)
+        self.__update(access, ip='127.0.0.2')
+        self.assertEqual(utils.get_buffered_token_information_count(), 2)
+
+    def test_flush(self):
+        access = create_access()
+        access_2 = create_access()
+        self.__update(access)
+        self.__update(access, ip='127.0.0.2')
+        self.__update(access_2)
+
+        # select, begin and a single update
+        with self.assertNumQueries(3):
+            self.assertEqual(utils.flush_token_information(), 2)
+        self.assertEqual(utils.get_buffered_token_information_count(), 0)
+
+        access.refresh_from_db()
+        access_2.refresh_from_db()
+        self.assertEqual(access.ip, '127.0.0.2')
+        self.assertIsNotNone(access.last_used)
+        self.assertIsNotNone(access_2.last_used)
+
+        self.assertEqual(utils.flush_token_information(), 0)
+
+    def test_full_buffer_flushed(self):
+        with patch.object(utils, 'ACCESS_INFO_BUFFER_SIZE', 2), \
+                patch('auth_app.tasks.flush_token_information.delay') as flush:
+            self.__update(create_access())
+            flush.assert_not_called()
+            self.__update(create_access())
+            flush.assert_called_once()
+
+    def test_unwritten_slot(self):
+        access = create_access()
+        self.__update(access)
+        # Reserved by another writer that didn't write it yet
+        cache.incr(cache.format_key(key_name='access_info_count'))
+        self.__update(access, ip='127.0.0.2')
+
+        self.assertEqual(utils.flush_token_information(), 1)
+        self.assertEqual(utils.get_buffered_token_information_count(), 2)
+        access.refresh_from_db()
+        self.assertEqual(access.ip, '127.0.0.1')
+
+        # Writer is gone, the slot is skipped by next flush
+        self.assertEqual(utils.flush_token_information(), 1)
+        self.assertEqual(utils.get_buffered_token_information_count(), 0)
+        access.refresh_from_db()
+        self.assertEqual(access.ip, '127.0.0.2')
+
+    def test_flush_locked(self):
+        self.__update(create_access())
+        lock_key = cache.format_key(key_name='access_info_lock')
+        cache.acquire_lock(lock_key, 10)
+
+        self.assertEqual(utils.flush_token_information(), 0)
+        self.assertEqual(utils.get_buffered_token_information_count(), 1)
+
+
 class AccessViewTest(APITransactionTestCase):
     caller: AccessViewCaller
 
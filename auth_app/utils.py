@@ -1,9 +1,18 @@
+from typing import Optional
 from django.conf import settings
 from ipware import get_client_ip
 from django.utils import timezone
 
+from core.cache import cache
 from .models import Access
 
+ACCESS_INFO_BUFFER_SIZE = getattr(settings, 'ACCESS_INFO_BUFFER_SIZE', 1000)
+"""Max number of buffered token updates before an early flush is requested"""
+ACCESS_INFO_SLOT_TIMEOUT = getattr(settings, 'ACCESS_INFO_SLOT_TIMEOUT',
+                                   60 * 60 * 24)
+"""Buffered items that aren't flushed in this time are dropped"""
+ACCESS_INFO_LOCK_TIMEOUT = 60
+
 
 def get_user_from_token(token: Access):
     user = token.user
@@ -13,6 +22,9 @@ def get_user_from_token(token: Access):
 
 
 def update_token_information(token: Access, request=None, scope=None):
+    """Buffer `last_used` and `ip` of token if `UPDATE_AUTH_TOKEN_INFO_INTERVAL`
+    has passed or ip has changed. buffered items will be saved to database
+    by `flush_token_information` task"""
     assert not all([request, scope]) and any([request, scope]), (
         "Only one of `request` or `scope` should set"
     )
@@ -24,9 +36,117 @@ def update_token_information(token: Access, request=None, scope=None):
 
     interval = getattr(settings, 'UPDATE_AUTH_TOKEN_INFO_INTERVAL',
                        timezone.timedelta(seconds=2))
-    if ((timezone.now() - token.last_used) < interval) and ip == token.ip:
+
+    key = cache.format_key(token.pk, key_name='access_info')
+    last_used, last_ip = cache.get(key) or (token.last_used, token.ip)
+    now = timezone.now()
+    if (last_used is not None and (now - last_used) < interval
+            and ip == last_ip):
         return
 
-    token.ip = ip
-    token.update_last_used(save=False)
-    token.save()
+    cache.set(key, (now, ip), timeout=interval.total_seconds())
+    buffer_token_information(token.pk, now, ip)
+
+
+def buffer_token_information(token_id, last_used, ip):
+    """
+    Add an item to token information buffer.
+
+    A slot is reserved before it's written, so flush stops at a slot
+    that isn't written yet, see `_get_written_items`.
+    """
+    count_key = cache.format_key(key_name='access_info_count')
+    slot = cache.incr(count_key, timeout=None)
+    cache.set(cache.format_key(slot, key_name='access_info_slot'),
+              (token_id, last_used, ip), timeout=ACCESS_INFO_SLOT_TIMEOUT)
+
+    flushed = cache.get(
+        cache.format_key(key_name='access_info_flushed'), 0)
+    if (slot - flushed) % ACCESS_INFO_BUFFER_SIZE == 0:
+        from .tasks import flush_token_information
+        flush_token_information.delay()
+
+
+def get_buffered_token_information_count() -> int:
+    """Return number of items that are waiting in buffer to be flushed"""
+    count, flushed = _get_buffer_bounds()
+    return max(count - flushed, 0)
+
+
+def _get_buffer_bounds() -> tuple[int, int]:
+    return (
+        cache.get(cache.format_key(key_name='access_info_count'), 0),
+        cache.get(cache.format_key(key_name='access_info_flushed'), 0),
+    )
+
+
+def _get_written_items(first: int, last: int) -> tuple[dict, int]:
+    """
+    Return `({token_id: (last_used, ip)}, last_slot)` of written slots
+    from `first` until `last`, or until the first slot that isn't written.
+
+    A slot that isn't written in two flushes in a row is skipped,
+    its writer is stopped between reserving and writing it.
+    """
+    slot_keys = [cache.format_key(slot, key_name='access_info_slot')
+                 for slot in range(first, last + 1)]
+    unwritten_key = cache.format_key(key_name='access_info_unwritten')
+    items = cache.get_many(slot_keys)
+
+    # Slots are in order, so later items overwrite older ones
+    infos = {}
+    for slot, key in enumerate(slot_keys, first):
+        if key in items:
+            token_id, last_used, ip = items[key]
+            infos[token_id] = (last_used, ip)
+        elif cache.get(unwritten_key) != slot:
+            cache.set(unwritten_key, slot, timeout=None)
+            return infos, slot - 1
+    return infos, last
+
+
+def flush_token_information(batch_size: Optional[int] = None) -> int:
+    """Save buffered token information with `bulk_update` and
+    return number of updated accesses.
+
+    Only one flush runs at a time, others return 0 at once."""
+    lock_key = cache.format_key(key_name='access_info_lock')
+    token = cache.acquire_lock(lock_key, ACCESS_INFO_LOCK_TIMEOUT)
+    if token is None:
+        return 0
+
+    try:
+        return _flush_token_information(
+            batch_size or ACCESS_INFO_BUFFER_SIZE, lock_key, token)
+    finally:
+        cache.release_lock(lock_key, token)
+
+
+def _flush_token_information(batch_size: int, lock_key: str,
+                             token: str) -> int:
+    count, flushed = _get_buffer_bounds()
+    updated = 0
+
+    while flushed < count:
+        batch_last = min(flushed + batch_size, count)
+        infos, last = _get_written_items(flushed + 1, batch_last)
+
+        accesses = list(Access.objects.filter(pk__in=infos)
+                        .only('pk', 'last_used', 'ip'))
+        for access in accesses:
+            access.last_used, access.ip = infos[access.pk]
+        Access.objects.bulk_update(accesses, ['last_used', 'ip'])
+        updated += len(accesses)
+
+        cache.set(cache.format_key(key_name='access_info_flushed'),
+                  last, timeout=None)
+        cache.delete_many(
+            cache.format_key(slot, key_name='access_info_slot')
+            for slot in range(flushed + 1, last + 1))
+        flushed = last
+        # Next flush checks the unwritten slot again
+        if (last < batch_last or not cache.extend_lock(
+                lock_key, token, ACCESS_INFO_LOCK_TIMEOUT)):
+            break
+
+    return updated
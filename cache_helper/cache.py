@@ -1,21 +1,126 @@
-from typing import Callable
+from collections import Counter
+from contextlib import contextmanager
+from threading import Lock
+from time import monotonic, sleep
+from typing import Callable, Iterable, Optional
+from uuid import uuid4
 from django.core.cache import cache
 from django.core.cache.backends.base import DEFAULT_TIMEOUT
 from django.conf import settings
 
+from .invalidation import CLEAR_ALL, LocalInvalidator, get_invalidator
+from .local import LocalCache
+
 CACHE_TTL = getattr(settings, 'CACHE_TTL', DEFAULT_TIMEOUT)
+CACHE_LOCAL_SIZE = getattr(settings, 'CACHE_LOCAL_SIZE', 0)
+CACHE_LOCAL_TTL = getattr(settings, 'CACHE_LOCAL_TTL', 5)
+CACHE_LOCK_TIMEOUT = getattr(settings, 'CACHE_LOCK_TIMEOUT', 10)
+"""Max seconds that callers of `get_or_set` wait for value of a missing key"""
+CACHE_LOCK_POLL_INTERVAL = 0.05
+
+_missing = object()
 
 
 class Cache:
     """
     Cache helper class that has a pattern for keys.
+
+    Keys of `local_key_names` patterns are kept in a process-local LRU
+    (`CACHE_LOCAL_SIZE` items for `CACHE_LOCAL_TTL` seconds) in front of
+    the shared cache too. Keys that are set or deleted are invalidated
+    in other processes by `invalidator`. Values of local tier are shared
+    between callers, so they shouldn't be changed in place.
+
+    Hits and misses are counted per key name, see `get_stats`.
+
+    `get_or_set` runs `default_func` of a missing key once at a time
+    (by a lock key in shared cache) to prevent cache stampede, see
+    `acquire_lock`.
     """
     key_patterns = None
+    local_key_names: Iterable[str] = ()
+    lock_suffix = ':lock'
 
-    def __init__(self) -> None:
+    def __init__(self, local_size: int = CACHE_LOCAL_SIZE,
+                 local_timeout: Optional[float] = CACHE_LOCAL_TTL,
+                 invalidator: Optional[LocalInvalidator] = None) -> None:
         assert self.key_patterns is not None, (
             f"`key_patterns` attr must set in {self.__class__.__name__}"
         )
+        self._id = uuid4().hex
+        self._local = LocalCache(max_size=local_size, timeout=local_timeout)
+        self._invalidator = invalidator
+        self._subscribed = False
+        self._key_prefixes = self._get_key_prefixes()
+        self._flights: dict[str, list] = {}
+        self._flights_lock = Lock()
+
+        self.local_hits = Counter()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    @property
+    def invalidator(self) -> LocalInvalidator:
+        """Subscribes to invalidator (`get_invalidator()` by default)
+        on first use"""
+        if not self._subscribed:
+            if self._invalidator is None:
+                self._invalidator = get_invalidator()
+            self._invalidator.subscribe(self._id, self._invalidate_local)
+            self._subscribed = True
+        return self._invalidator
+
+    def _invalidate_local(self, key: str):
+        if key == CLEAR_ALL:
+            self._local.clear()
+        else:
+            self._local.delete(key)
+
+    def _get_key_prefixes(self) -> list[tuple[str, str]]:
+        """Returns `(prefix, key_name)` of patterns, longer ones first"""
+        patterns = self.key_patterns
+        if isinstance(patterns, str):
+            patterns = {'default': patterns}
+
+        prefixes = [(pattern.split('{', 1)[0], name)
+                    for name, pattern in patterns.items()]
+        return sorted(prefixes, key=lambda item: len(item[0]), reverse=True)
+
+    def get_key_name(self, key: str) -> Optional[str]:
+        """Returns name of the pattern that `key` is formatted by"""
+        for prefix, name in self._key_prefixes:
+            if key.startswith(prefix):
+                return name
+
+    def _is_local(self, key_name) -> bool:
+        return self._local.max_size > 0 and key_name in self.local_key_names
+
+    def _set_local(self, key: str, value, timeout):
+        # Local items are only kept while invalidations are received
+        self.invalidator
+        local_timeout = self._local.timeout
+        if timeout is not None and timeout is not DEFAULT_TIMEOUT:
+            local_timeout = (timeout if local_timeout is None
+                             else min(timeout, local_timeout))
+        self._local.set(key, value, timeout=local_timeout)
+
+    def get_stats(self) -> dict[str, dict[str, int]]:
+        """Returns hits of local tier, hits of shared cache and
+        misses of every key name in current process"""
+        names = set(self.local_hits) | set(self.hits) | set(self.misses)
+        return {
+            name: {
+                'local_hits': self.local_hits[name],
+                'hits': self.hits[name],
+                'misses': self.misses[name],
+            }
+            for name in names
+        }
+
+    def reset_stats(self):
+        self.local_hits.clear()
+        self.hits.clear()
+        self.misses.clear()
 
     @property
     def _cache(self):
@@ -40,12 +145,94 @@ class Cache:
         return pattern.format(*format_args, **format_kwargs)
 
     def set(self, key: str, value, timeout: int = CACHE_TTL):
-        return cache.set(key, value, timeout=timeout)
+        result = cache.set(key, value, timeout=timeout)
+        if self._is_local(self.get_key_name(key)):
+            self._set_local(key, value, timeout)
+            self.invalidator.publish(key, self._id)
+        return result
 
     def get(self, key: str, default=None):
-        if key not in cache:
+        """Returns value of `key` (`None` can be stored too)
+        or `default` if not found, in a single round-trip"""
+        key_name = self.get_key_name(key)
+        is_local = self._is_local(key_name)
+        if is_local:
+            value = self._local.get(key, _missing)
+            if value is not _missing:
+                self.local_hits[key_name] += 1
+                return value
+
+        value = cache.get(key, _missing)
+        if value is _missing:
+            self.misses[key_name] += 1
             return default
-        return cache.get(key)
+
+        self.hits[key_name] += 1
+        if is_local:
+            self._set_local(key, value, None)
+        return value
+
+    def get_many(self, keys: Iterable[str]) -> dict:
+        """Returns a dict of found `keys` and their values, keys that
+        aren't in local tier are fetched in a single round-trip"""
+        result = {}
+        remote_keys = []
+        for key in keys:
+            key_name = self.get_key_name(key)
+            if self._is_local(key_name):
+                value = self._local.get(key, _missing)
+                if value is not _missing:
+                    self.local_hits[key_name] += 1
+                    result[key] = value
+                    continue
+            remote_keys.append(key)
+
+        if remote_keys:
+            values = cache.get_many(remote_keys)
+            for key in remote_keys:
+                key_name = self.get_key_name(key)
+                if key not in values:
+                    self.misses[key_name] += 1
+                    continue
+
+                self.hits[key_name] += 1
+                result[key] = values[key]
+                if self._is_local(key_name):
+                    self._set_local(key, values[key], None)
+        return result
+
+    def set_many(self, data: dict, timeout: int = CACHE_TTL) -> list:
+        """Sets all items of `data` in a single round-trip and
+        returns keys that failed to be set"""
+        failed_keys = cache.set_many(data, timeout=timeout)
+        for key, value in data.items():
+            if self._is_local(self.get_key_name(key)):
+                self._set_local(key, value, timeout)
+                self.invalidator.publish(key, self._id)
+        return failed_keys
+
+    def incr(self, key: str, delta: int = 1,
+             timeout: int = CACHE_TTL) -> int:
+        """
+        Atomically increases value of `key` by `delta` in shared cache
+        and returns the new value. Missing key is created with 0
+        and `timeout`, the timeout of existing key isn't changed.
+
+        Counters aren't kept in local tier because every process
+        changes them.
+        """
+        cache.add(key, 0, timeout=timeout)
+        try:
+            value = cache.incr(key, delta)
+        except ValueError:
+            # Key is expired between `add` and `incr`
+            cache.add(key, 0, timeout=timeout)
+            value = cache.incr(key, delta)
+
+        if self._is_local(self.get_key_name(key)):
+            self._local.delete(key)
+            self.invalidator.publish(key, self._id)
+        return value
 
     def get_or_set(self, key, default_value=None,
                    default_func: Callable = None,
@@ -54,17 +241,106 @@ class Cache:
         something like `get_or_create()` in django.
         if item not found, `default_func`'s return value or `default_value`
         will be set for `key`. else the cache's value will be returned
+
+        Only a single caller runs `default_func` for a missing key, other
+        threads and processes wait for its value instead of running
+        `default_func` too. If lock is released or expired without a value,
+        waiting callers try to take the lock again.
         """
-        if key in cache:
-            return self.get(key)
+        value = self.get(key, _missing)
+        if value is not _missing:
+            return value
 
-        if default_func:
-            default_value = default_func(**fkwargs)
-        self.set(key, default_value, timeout)
-        return default_value
+        if not default_func:
+            self.set(key, default_value, timeout)
+            return default_value
+
+        with self._local_flight(key):
+            # Value may be set by another thread while waiting for lock
+            value = self.get(key, _missing)
+            if value is not _missing:
+                return value
+
+            lock_key = f'{key}{self.lock_suffix}'
+            while not (token := self.acquire_lock(lock_key,
+                                                  CACHE_LOCK_TIMEOUT)):
+                value = self._wait_for_flight(key, lock_key)
+                if value is not _missing:
+                    return value
+
+            try:
+                value = default_func(**fkwargs)
+                self.set(key, value, timeout)
+            finally:
+                self.release_lock(lock_key, token)
+            return value
+
+    def acquire_lock(self, lock_key: str, timeout: float) -> Optional[str]:
+        """Add `lock_key` to shared cache for `timeout` seconds and return
+        its owner token, or `None` if it's held by another owner"""
+        token = f'{self._id}:{uuid4().hex}'
+        return token if cache.add(lock_key, token, timeout=timeout) else None
+
+    def extend_lock(self, lock_key: str, token: str, timeout: float) -> bool:
+        """Reset timeout of `lock_key` if it's still owned by `token`,
+        returns `False` if lock is lost"""
+        return cache.get(lock_key) == token and cache.touch(lock_key, timeout)
+
+    def release_lock(self, lock_key: str, token: str) -> None:
+        """Delete `lock_key` only if it's still owned by `token`, so a lock
+        that expired and is taken by another owner isn't deleted"""
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+    @contextmanager
+    def _local_flight(self, key):
+        """Lock of `key` that is shared between threads of process"""
+        with self._flights_lock:
+            flight = self._flights.setdefault(key, [Lock(), 0])
+            flight[1] += 1
+        try:
+            with flight[0]:
+                yield
+        finally:
+            with self._flights_lock:
+                flight[1] -= 1
+                if not flight[1]:
+                    del self._flights[key]
+
+    def _wait_for_flight(self, key, lock_key):
+        """Waits until value of `key` is set by lock owner, returns
+        `_missing` if lock is released or expired without a value"""
+        deadline = monotonic() + CACHE_LOCK_TIMEOUT
+        while monotonic() < deadline:
+            sleep(CACHE_LOCK_POLL_INTERVAL)
+            value = self.get(key, _missing)
+            if value is not _missing:
+                return value
+            if lock_key not in cache:
+                break
+        return _missing
 
     def delete(self, key):
-        return cache.delete(key)
+        result = cache.delete(key)
+        if self._is_local(self.get_key_name(key)):
+            self._local.delete(key)
+            self.invalidator.publish(key, self._id)
+        return result
+
+    def delete_many(self, keys: Iterable[str]):
+        keys = list(keys)
+        result = cache.delete_many(keys)
+        for key in keys:
+            if self._is_local(self.get_key_name(key)):
+                self._local.delete(key)
+                self.invalidator.publish(key, self._id)
+        return result
+
+    def clear(self):
+        """Clears shared cache and local tier of every process"""
+        cache.clear()
+        self._local.clear()
+        self.invalidator.publish(CLEAR_ALL, self._id)
 
     # def append(self, key, value, timeout: int = CACHE_TTL):
     #     items_list = self.get(key, [])
@@ -0,0 +1,101 @@
+from threading import Lock
+from typing import Callable, Optional
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+CACHE_INVALIDATION_CHANNEL = getattr(settings, 'CACHE_INVALIDATION_CHANNEL',
+                                     'cache_invalidation')
+
+CLEAR_ALL = '*'
+"""Published instead of a key when all keys should be invalidated"""
+
+
+class LocalInvalidator:
+    """
+    Delivers invalidated keys to subscribers of current process only.
+
+    It's used when shared cache isn't redis (e.g. in tests),
+    where there is no other process to be notified.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, Callable[[str], None]] = {}
+        self._lock = Lock()
+
+    def subscribe(self, subscriber_id: str,
+                  callback: Callable[[str], None]) -> None:
+        """`callback` is called by invalidated keys, except the
+        ones that published by `subscriber_id` itself"""
+        with self._lock:
+            self._subscribers[subscriber_id] = callback
+
+    def publish(self, key: str, origin: str) -> None:
+        self._deliver(key, origin)
+
+    def _deliver(self, key: str, origin: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+
+        for subscriber_id, callback in subscribers:
+            if subscriber_id != origin:
+                callback(key)
+
+
+class RedisInvalidator(LocalInvalidator):
+    """
+    Broadcasts invalidated keys to every process by redis pub/sub.
+
+    Messages that are lost (e.g. when connection is dropped) aren't
+    sent again, so local items are only stale until their TTL.
+    """
+    channel = CACHE_INVALIDATION_CHANNEL
+
+    def __init__(self, alias: str = 'default') -> None:
+        super().__init__()
+        self.alias = alias
+        self._thread = None
+
+    @property
+    def client(self):
+        from django_redis import get_redis_connection
+        return get_redis_connection(self.alias)
+
+    def subscribe(self, subscriber_id, callback) -> None:
+        super().subscribe(subscriber_id, callback)
+        with self._lock:
+            if self._thread is None:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self.channel: self._handle_message})
+                self._thread = pubsub.run_in_thread(sleep_time=1,
+                                                    daemon=True)
+
+    def publish(self, key, origin) -> None:
+        # Subscribers of current process receive it from channel too
+        self.client.publish(self.channel, f'{origin} {key}')
+
+    def _handle_message(self, message: dict) -> None:
+        data = message['data']
+        if isinstance(data, bytes):
+            data = data.decode()
+        origin, key = data.split(' ', 1)
+        self._deliver(key, origin)
+
+
+_invalidator: Optional[LocalInvalidator] = None
+
+
+def get_invalidator() -> LocalInvalidator:
+    """
+    Returns invalidator of `CACHE_INVALIDATOR` setting (dotted path),
+    or `RedisInvalidator` if default cache is redis, else `LocalInvalidator`.
+    """
+    global _invalidator
+    if _invalidator is None:
+        path = getattr(settings, 'CACHE_INVALIDATOR', None)
+        if path is None:
+            backend = settings.CACHES['default']['BACKEND']
+            path = ('cache_helper.invalidation.RedisInvalidator'
+                    if backend.startswith('django_redis')
+                    else 'cache_helper.invalidation.LocalInvalidator')
+        _invalidator = import_string(path)()
+    return _invalidator
@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Hashable, Optional
+
+_missing = object()
+
+
+class LocalCache:
+    """
+    Process-local LRU cache that is bounded by `max_size` items
+    and every item expires after `timeout` seconds.
+
+    It's thread-safe and keeps nothing outside of the process,
+    so it's only useful for values that can be re-validated or
+    are cheap to be stale for `timeout` seconds.
+    """
+
+    def __init__(self, max_size: int = 1024,
+                 timeout: Optional[float] = 60) -> None:
+        self.max_size = max_size
+        self.timeout = timeout
+        self._data: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _missing) is not _missing
+
+    def get(self, key: Hashable, default=None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _missing)
+            if item is _missing:
+                return default
+
+            value, expires_at = item
+            if expires_at is not None and expires_at <= monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value, timeout: Optional[float] = _missing) -> None:
+        """Set value for key. `timeout=None` means never expire"""
+        if self.max_size <= 0:
+            return
+
+        timeout = self.timeout if timeout is _missing else timeout
+        expires_at = None if timeout is None else monotonic() + timeout
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._data.pop(key, _missing) is not _missing
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
@@ -4,10 +4,13 @@ from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
+from django.db.models.manager import BaseManager
 from core.models.mixins import SoftDeleteMixin
+from core.models.queryset import SoftDeleteQuerySet
 
 from picturic.fields import PictureField
 from global_id.models.mixins import GUIDMixin
+from global_id.models.queryset import GUIDMixinQuerySet
 from .group_community import GroupCommunity
 from .mixins import NegativeUUIDMixin
 
@@ -19,7 +22,16 @@ def get_model_type(model: Type[models.Model]) -> str:
         return CommunityChat.TypeChoices.GROUP
 
 
+class CommunityChatQuerySet(SoftDeleteQuerySet, GUIDMixinQuerySet):
+    pass
+
+
+class CommunityChatManager(BaseManager.from_queryset(CommunityChatQuerySet)):
+    pass
+
+
 class CommunityChat(NegativeUUIDMixin, SoftDeleteMixin, GUIDMixin, models.Model):
+    objects = CommunityChatManager()
 
     class TypeChoices(models.TextChoices):
         GROUP = 'GP', _('Group')
@@ -1,11 +1,16 @@
 from typing import Optional
+from django.conf import settings
 from rest_framework import permissions, views
 
+from core.cache import cache
 from community.models import Member
 
+MEMBER_RANK_CACHE = getattr(settings, 'MEMBER_RANK_CACHE', True)
+"""Keep ranks of members in shared cache too,
+they're removed from cache when member saved or deleted"""
 
-def get_member(request, view) -> Optional[Member]:
-    user_id = request.user.pk
+
+def get_community_id(request, view):
     if isinstance(view, views.APIView):
         cid_lookup_url = getattr(
             view, 'nested_lookup_field',
@@ -13,15 +18,60 @@ def get_member(request, view) -> Optional[Member]:
             or
             getattr(view, 'lookup_field')
         )
-        community_id = view.kwargs.get(cid_lookup_url)
-    else:
-        # Probably the view is a Consumer object
-        community_lookup = getattr(view, 'community_query_lookup', 'chat_id')
-        community_id = request.query.get(community_lookup)
+        return view.kwargs.get(cid_lookup_url)
+
+    # Probably the view is a Consumer object
+    community_lookup = getattr(view, 'community_query_lookup', 'chat_id')
+    return request.query.get(community_lookup)
+
+
+def get_member_rank_cache_key(community_id, user_id) -> str:
+    return cache.format_key(key_name='member_rank',
+                            community_id=community_id, user_id=user_id)
+
 
+def _query_member_rank(community_id, user_id) -> Optional[int]:
     return Member.objects.filter(
         community_id=community_id, user_id=user_id
-    ).first()
+    ).values_list('rank', flat=True).first()
+
+
+def get_member_rank(request, view) -> Optional[int]:
+    """
+    Returns rank of user in community of `view`, or `None` if user
+    isn't a member.
+
+    Rank is resolved once per view (a request, or an action of consumer)
+    and shared between all rank permissions of it. views that keep
+    ranks of user as `member_ranks` (e.g. `MessengerConsumer`) are used
+    without any query.
+    """
+    try:
+        community_id = int(get_community_id(request, view))
+    except (TypeError, ValueError):
+        return None
+    user_id = request.user.pk
+
+    if (member_ranks := getattr(view, 'member_ranks', None)) is not None:
+        return member_ranks.get(community_id)
+
+    ranks = view.__dict__.setdefault('_member_ranks', {})
+    if (community_id, user_id) not in ranks:
+        if MEMBER_RANK_CACHE:
+            rank = cache.get_or_set(
+                get_member_rank_cache_key(community_id, user_id),
+                default_func=_query_member_rank,
+                community_id=community_id, user_id=user_id)
+        else:
+            rank = _query_member_rank(community_id, user_id)
+        ranks[(community_id, user_id)] = rank
+    return ranks[(community_id, user_id)]
+
+
+def clear_member_ranks(view):
+    """Clears ranks that are resolved for `view`, consumers clear them
+    before every action by `BaseGenericConsumer.check_action`"""
+    view.__dict__.pop('_member_ranks', None)
 
 
 class MemberRankPermissionMixin(permissions.IsAuthenticated):
@@ -29,8 +79,8 @@ class MemberRankPermissionMixin(permissions.IsAuthenticated):
 
     def has_permission(self, request, view):
         if super().has_permission(request, view):
-            member = get_member(request, view)
-            return member and self.check_rank(member.rank)
+            rank = get_member_rank(request, view)
+            return rank is not None and self.check_rank(rank)
 
 
 class IsCommunityOwnerMember(MemberRankPermissionMixin):
@@ -66,4 +116,5 @@ class IsNotCommunitySelfMember(permissions.IsAuthenticated):
 
 class HasHigherRankThanMember(permissions.IsAuthenticated):
     def has_object_permission(self, request, view, obj: Member):
-        return get_member(request, view).rank > obj.rank
+        rank = get_member_rank(request, view)
+        return rank is not None and rank > obj.rank
@@ -2,6 +2,7 @@ from rest_framework import serializers
 from generic_relations.relations import GenericRelatedField
 
 from core.utils import count_field
+from global_id.list_serializers import GUIDListSerializer
 from picturic.serializer_fields import PictureField
 from community.models import CommunityChat, GroupCommunity
 from user.serializers import UserInfoSerializer
@@ -18,6 +19,7 @@ class CommunityChatSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = CommunityChat
+        list_serializer_class = GUIDListSerializer
 
         read_only_fields = [
             'profile_image',
@@ -54,6 +56,7 @@ class CommunityChatInfoSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = CommunityChat
+        list_serializer_class = GUIDListSerializer
         fields = [
             'id',
             'type',
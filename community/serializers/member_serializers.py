@@ -2,6 +2,7 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from user.serializers import UserInfoSerializer
+from global_id.list_serializers import GUIDListSerializer
 from community.models import Member
 
 
@@ -16,6 +17,7 @@ class MemberInfoSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Member
+        list_serializer_class = GUIDListSerializer
         fields = common_fields
 
 
@@ -24,6 +26,7 @@ class MemberSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Member
+        list_serializer_class = GUIDListSerializer
         fields = common_fields+[
             "used_guid",
             "used_link",
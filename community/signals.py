@@ -2,9 +2,11 @@ from django.dispatch import receiver
 from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 
+from core.cache import cache
 from core.utils import delete_instance_on_error
 from core.signals import post_soft_delete
 from community.models import CommunityChat, Member
+from community.permissions import get_member_rank_cache_key
 from community.tasks import create_member, delete_community_members
 from conversation.tasks import create_conversation, delete_conversation
 
@@ -39,6 +41,14 @@ def create_member_conversation(sender, instance: Member,
         )
 
 
+@receiver([post_save, post_delete], sender=Member)
+def remove_member_rank_from_cache(sender, instance: Member, **kwargs):
+    key = get_member_rank_cache_key(instance.community_id, instance.user_id)
+    cache.delete(key)
+    # Old rank may be cached again by other requests until commit
+    transaction.on_commit(lambda: cache.delete(key))
+
+
 @transaction.atomic
 @receiver(post_delete, sender=Member)
 def delete_member_conversation(sender, instance: Member, **kwargs):
@@ -1,6 +1,15 @@
+from types import SimpleNamespace
+from dotmap import DotMap
 from django.test.testcases import TestCase
+from rest_framework.generics import GenericAPIView
 
+from core.tests.mixins import ClearCacheMixin
 from community.models import Member
+from community.permissions import (get_member_rank, clear_member_ranks,
+                                   IsCommunityMember)
+from generic_channels.consumers import GenericConsumer
+from generic_channels.exceptions import PermissionDenied
+from user.tests.utils import create_active_user
 from .utils import create_invite_link, create_member
 
 
@@ -22,3 +31,69 @@ class MemberModelTest(TestCase):
     def test_joined_by_none(self):
         member = create_member()
         self.assertIsNone(member.joined_by)
+
+
+class CommunityMemberConsumer(GenericConsumer):
+    permission_classes = [IsCommunityMember]
+
+    def action_ping(self, content, action, *args, **kwargs): pass
+
+
+class MemberRankTest(ClearCacheMixin, TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.member = create_member(rank=Member.RankChoices.ADMIN)
+        self.request = SimpleNamespace(user=self.member.user)
+
+    def get_view(self, community_id=None):
+        view = GenericAPIView()
+        view.nested_lookup_field = 'community_id'
+        view.kwargs = {'community_id': str(
+            community_id or self.member.community_id)}
+        return view
+
+    def test_rank_resolved_once_per_view(self):
+        view = self.get_view()
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                self.assertEqual(get_member_rank(self.request, view),
+                                 Member.RankChoices.ADMIN)
+
+        # Other requests use cached rank
+        with self.assertNumQueries(0):
+            get_member_rank(self.request, self.get_view())
+
+    def test_not_member(self):
+        request = SimpleNamespace(user=create_active_user())
+        self.assertIsNone(get_member_rank(request, self.get_view()))
+        self.assertIsNone(get_member_rank(self.request, self.get_view(-1)))
+
+    def test_rank_updated_after_save(self):
+        view = self.get_view()
+        get_member_rank(self.request, view)
+
+        self.member.rank = Member.RankChoices.BANNED
+        self.member.save()
+
+        clear_member_ranks(view)
+        self.assertEqual(get_member_rank(self.request, view),
+                         Member.RankChoices.BANNED)
+
+    def test_rank_removed_after_delete(self):
+        get_member_rank(self.request, self.get_view())
+        self.member.delete()
+        self.assertIsNone(get_member_rank(self.request, self.get_view()))
+
+    def test_rank_updated_between_consumer_actions(self):
+        consumer = CommunityMemberConsumer()
+        consumer.scope = {'user': self.member.user}
+        content = DotMap({'action': 'ping',
+                          'query': {'chat_id': self.member.community_id}})
+
+        consumer.check_action(content, 'ping', consumer.action_ping)
+
+        self.member.rank = Member.RankChoices.BANNED
+        self.member.save()
+
+        with self.assertRaises(PermissionDenied):
+            consumer.check_action(content, 'ping', consumer.action_ping)
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def set_last_read_ids(apps, schema_editor):
+    """Use last seen message of user in every chat as it's read watermark"""
+    Seen = apps.get_model('message', 'Seen')
+    Conversation = apps.get_model('conversation', 'Conversation')
+
+    watermarks = Seen.objects.filter(user__isnull=False).order_by()\
+        .values('user_id', 'message__chat_id')\
+        .annotate(last_read_id=Max('message_id'))
+    for watermark in watermarks.iterator():
+        Conversation.objects.filter(
+            user_id=watermark['user_id'],
+            chat_id=watermark['message__chat_id'],
+        ).update(last_read_id=watermark['last_read_id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conversation', '0005_alter_conversation_chat_id'),
+        ('message', '0009_message_seq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='last_read_id',
+            field=models.BigIntegerField(default=0, help_text='User has seen messages of chat until this id', verbose_name='Last read message'),
+        ),
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['chat_id', 'last_read_id'], name='conv_chat_last_read_idx'),
+        ),
+        migrations.RunPython(set_last_read_ids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def set_unread_counts(apps, schema_editor):
+    Conversation = apps.get_model('conversation', 'Conversation')
+    Message = apps.get_model('message', 'Message')
+    DeletedMessage = apps.get_model('message', 'DeletedMessage')
+
+    deleted_for_user = DeletedMessage.objects.filter(
+        user_id=OuterRef(OuterRef('user_id')), message_id=OuterRef('pk'))
+    unread_messages = Message.objects.filter(
+        ~Exists(deleted_for_user),
+        is_deleted=False,
+        chat_id=OuterRef('chat_id'),
+        id__gt=OuterRef('last_read_id'),
+    ).exclude(sender_id=OuterRef('user_id')).order_by()\
+        .values('chat_id').annotate(count=Count('pk')).values('count')
+
+    Conversation.objects.update(
+        unread_count=Coalesce(Subquery(unread_messages), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conversation', '0006_conversation_last_read_id'),
+        ('message', '0010_delete_seen'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='unread_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of messages after `last_read_id` that user can see', verbose_name='Unread messages'),
+        ),
+        migrations.RunPython(set_unread_counts, migrations.RunPython.noop),
+    ]
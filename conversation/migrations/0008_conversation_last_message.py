@@ -0,0 +1,44 @@
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def set_last_messages(apps, schema_editor):
+    Conversation = apps.get_model('conversation', 'Conversation')
+    Message = apps.get_model('message', 'Message')
+
+    last_message = Message.objects.filter(
+        chat_id=OuterRef('chat_id'), is_deleted=False).order_by('-id')
+    Conversation.objects.update(
+        last_message_id=Subquery(last_message.values('id')[:1]),
+        last_activity_at=Coalesce(
+            Subquery(last_message.values('sent_at')[:1]), F('created_at')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('message', '0010_delete_seen'),
+        ('conversation', '0007_conversation_unread_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Time of last message of chat', verbose_name='Last activity'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='message.message', verbose_name='Last message'),
+        ),
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['user', 'is_pinned', 'last_activity_at'], name='conv_user_inbox_idx'),
+        ),
+        migrations.RunPython(set_last_messages, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+from itertools import groupby
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.expressions
+
+
+def set_user_pairs(apps, schema_editor):
+    """Set user pair of chats, if there are duplicated chats for a pair,
+    only the first one gets it and others keep working by `users`"""
+    PrivateChat = apps.get_model('conversation', 'PrivateChat')
+    chat_users = PrivateChat.users.through.objects.order_by(
+        'privatechat_id', 'user_id').values_list('privatechat_id', 'user_id')
+
+    pairs = set()
+    chats = []
+    for chat_id, rows in groupby(chat_users.iterator(), key=lambda r: r[0]):
+        user_ids = [user_id for _, user_id in rows]
+        if len(user_ids) > 2:
+            continue
+        pair = (user_ids[0], user_ids[-1])
+        if pair in pairs:
+            continue
+        pairs.add(pair)
+        chats.append(PrivateChat(pk=chat_id, low_user_id=pair[0],
+                                 high_user_id=pair[1]))
+
+    PrivateChat.objects.bulk_update(chats, ['low_user_id', 'high_user_id'],
+                                    batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('conversation', '0008_conversation_last_message'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='privatechat',
+            name='high_user',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='privatechat',
+            name='low_user',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(set_user_pairs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='privatechat',
+            constraint=models.UniqueConstraint(fields=('low_user', 'high_user'), name='pvchat_user_pair_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='privatechat',
+            constraint=models.CheckConstraint(check=models.Q(('low_user__lte', django.db.models.expressions.F('high_user'))), name='pvchat_user_pair_ordered'),
+        ),
+    ]
@@ -3,6 +3,7 @@ from django.db import models
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.conf import settings
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from conversation.models import PrivateChat
@@ -39,6 +40,22 @@ class Conversation(models.Model):
     #                                  help_text=_("Is chat deleted or not"))
     created_at = models.DateTimeField(auto_now_add=True)
 
+    last_read_id = models.BigIntegerField(
+        _("Last read message"), default=0,
+        help_text=_("User has seen messages of chat until this id"))
+    unread_count = models.PositiveIntegerField(
+        _("Unread messages"), default=0,
+        help_text=_("Number of messages after `last_read_id` that "
+                    "user can see"))
+
+    last_message = models.ForeignKey(
+        to='message.Message', on_delete=models.SET_NULL,
+        null=True, blank=True, related_name='+',
+        verbose_name=_("Last message"))
+    last_activity_at = models.DateTimeField(
+        _("Last activity"), default=timezone.now,
+        help_text=_("Time of last message of chat"))
+
     chat_content_type: ContentType = models.ForeignKey(
         to=ContentType, on_delete=models.CASCADE)
     chat_id = models.BigIntegerField()
@@ -50,6 +67,16 @@ class Conversation(models.Model):
     user = models.ForeignKey(to=User, on_delete=models.CASCADE,
                              related_name='chats')
 
+    class Meta:
+        indexes = [
+            # Used for counting users that have seen a message
+            models.Index(fields=['chat_id', 'last_read_id'],
+                         name='conv_chat_last_read_idx'),
+            # Used for inbox ordering
+            models.Index(fields=['user', 'is_pinned', 'last_activity_at'],
+                         name='conv_user_inbox_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.type:
             model = self.chat_content_type.model_class()
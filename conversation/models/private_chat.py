@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F, Q
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 
@@ -19,11 +20,44 @@ class PrivateChat(models.Model):
     users = models.ManyToManyField(to=User,
                                    related_name="private_chats")
 
+    # Users of chat ordered by their id, so every pair has one key
+    low_user = models.ForeignKey(
+        to=User, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='+', editable=False)
+    high_user = models.ForeignKey(
+        to=User, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='+', editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['low_user', 'high_user'],
+                                    name='pvchat_user_pair_unique'),
+            models.CheckConstraint(check=Q(low_user__lte=F('high_user')),
+                                   name='pvchat_user_pair_ordered'),
+        ]
+
+    @staticmethod
+    def get_user_pair(user, another_user) -> dict:
+        """Returns `low_user_id` and `high_user_id` lookups
+        for users (or their ids)"""
+        low, high = sorted([getattr(user, 'pk', user),
+                            getattr(another_user, 'pk', another_user)],
+                           key=int)
+        return {'low_user_id': int(low), 'high_user_id': int(high)}
+
     def get_reciever_user(self, sender_user):
         """Returns reciever user"""
-        users = self.users.all()
-        if sender_user in users:
-            user = list(filter(
-                lambda item: item != sender_user, users
-            ))
-            return user[0] if user else sender_user
+        if None in (self.low_user_id, self.high_user_id):
+            # Chat has no user pair (e.g. one of it's users is deleted)
+            users = self.users.all()
+            if sender_user in users:
+                user = list(filter(
+                    lambda item: item != sender_user, users
+                ))
+                return user[0] if user else sender_user
+            return None
+
+        if sender_user.pk == self.low_user_id:
+            return self.high_user
+        if sender_user.pk == self.high_user_id:
+            return self.low_user
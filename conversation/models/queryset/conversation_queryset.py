@@ -1,9 +1,41 @@
 from django.db.models.query import prefetch_related_objects
 from django.db.models import QuerySet
 
+from global_id.models.queryset import prefetch_guids
 import conversation.models.conversation as conversation
 
 
+def prefetch_chats(conversations):
+    """Prefetch chats of `conversations` by their type"""
+    types = conversation.Conversation.TypeChoices
+
+    pvs = []
+    communities = []
+
+    for conv in conversations:
+        if conv.type == types.PRIVATE:
+            pvs.append(conv)
+        else:
+            communities.append(conv)
+
+    # Chats are fetched again for every lookup that passes through
+    # the generic FK, so nested lookups are prefetched on chats
+    prefetch_related_objects(pvs, 'chat')
+    pv_chats = [conv.chat for conv in pvs]
+    prefetch_related_objects(
+        pv_chats, 'creator', 'low_user', 'high_user'
+    )
+
+    prefetch_related_objects(
+        communities, 'chat__creator')
+
+    prefetch_guids(
+        [user for chat in pv_chats if chat
+         for user in (chat.creator, chat.low_user, chat.high_user)]
+        + [conv.chat.creator for conv in communities if conv.chat]
+    )
+
+
 class ConversationQuerySet(QuerySet):
     __prefetch_next = False
 
@@ -15,23 +47,7 @@ class ConversationQuerySet(QuerySet):
         return self
 
     def __prefetch_types(self, queryset):
-        types = conversation.Conversation.TypeChoices
-
-        pvs = []
-        communities = []
-
-        for conv in queryset:
-            if conv.type == types.PRIVATE:
-                pvs.append(conv)
-            else:
-                communities.append(conv)
-
-        prefetch_related_objects(
-            pvs, 'chat__users', 'chat__creator'
-        )
-
-        prefetch_related_objects(
-            communities, 'chat__creator')
+        prefetch_chats(queryset)
 
     def filter(self, *args, **kwargs):
         """if `.auto_prefetch_next` method was called before,
@@ -44,3 +60,25 @@ class ConversationQuerySet(QuerySet):
             self.__prefetch_types(queryset)
 
         return queryset
+
+    def read_until(self, user_id, chat_id, message_id,
+                   unread_count=0) -> bool:
+        """
+        Move read watermark of user's conversation forward to `message_id`
+        in a single update, so all messages until it are seen at once.
+        `unread_count` can be an expression that counts messages
+        after `message_id`.
+
+        Returns `False` if watermark was already at or after `message_id`.
+        """
+        return self.filter(
+            user_id=user_id, chat_id=chat_id,
+            last_read_id__lt=message_id,
+        ).update(last_read_id=message_id, unread_count=unread_count) > 0
+
+    def filter_seen(self, chat_id, message_id, sender_id):
+        """Conversations of users that have seen the message,
+        except it's sender. args can be `OuterRef` too"""
+        return self.filter(
+            chat_id=chat_id, last_read_id__gte=message_id,
+        ).exclude(user_id=sender_id)
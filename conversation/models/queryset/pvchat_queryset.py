@@ -1,3 +1,4 @@
+from django.db import IntegrityError, transaction
 from django.db.models import QuerySet
 
 
@@ -24,3 +25,36 @@ class PrivateChatQuerySet(QuerySet):
 
         qs = qs.filter(*args, **kwargs)
         return qs
+
+    def filter_users(self, user, another_user) -> QuerySet:
+        """Filter chat of users by their pair key (users or their ids)"""
+        return self.filter(
+            **self.model.get_user_pair(user, another_user))
+
+    def create_for_users(self, user, another_user, **kwargs):
+        """Create chat with it's pair key and `users`"""
+        pv = self.create(**self.model.get_user_pair(user, another_user),
+                         **kwargs)
+        pv.users.set([user, another_user])
+        return pv
+
+    def get_or_create_for_users(self, creator, receiver):
+        """
+        Return `(chat, created)` of users (or their ids),
+        `creator` will be chat's creator if it's created.
+
+        if same chat is created concurrently, unique pair key fails
+        one of them and the other one's chat will be returned.
+        """
+        try:
+            return self.filter_users(creator, receiver).get(), False
+        except self.model.DoesNotExist:
+            pass
+
+        try:
+            with transaction.atomic():
+                return self.create_for_users(
+                    creator, receiver,
+                    creator_id=getattr(creator, 'pk', creator)), True
+        except IntegrityError:
+            return self.filter_users(creator, receiver).get(), False
@@ -0,0 +1,6 @@
+from core.paginations import KeysetCursorPagination
+
+
+class InboxPagination(KeysetCursorPagination):
+    """Pinned conversations first, then by their last activity"""
+    ordering = ('-is_pinned', '-last_activity_at', '-id')
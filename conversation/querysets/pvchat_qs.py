@@ -1,18 +1,15 @@
 from typing import Optional
-from django.db import transaction
+from django.contrib.auth import get_user_model
 
 from conversation.models import PrivateChat
 
 
 def get_or_create_pvchat(creator, receiver) -> Optional[PrivateChat]:
     """Return PrivateChat if receiver was a valid choice"""
-    users = [creator, receiver]
-    pv = PrivateChat.objects.filter(users=users).first()
+    pv = PrivateChat.objects.filter_users(creator, receiver).first()
     if not pv:
-        try:
-            with transaction.atomic():
-                pv = PrivateChat.objects.create(creator_id=creator)
-                pv.users.set(users)
-        except Exception as e:
+        if not get_user_model().objects.filter(pk=receiver).exists():
             return None
+        pv, _ = PrivateChat.objects.get_or_create_for_users(
+            creator, receiver)
     return pv
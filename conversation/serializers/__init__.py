@@ -2,4 +2,4 @@ from .pvchat_serializers import PrivateChatSerializer
 from .conversation_serializers import (
     ConversationSerializer, ConversationPinSerializer,
     ConversationAliasSerializer, ConversationArchiveSerializer,
-    ConversationUpdateSerializer)
+    ConversationUpdateSerializer, InboxConversationSerializer)
@@ -1,3 +1,4 @@
+from typing import Optional
 from rest_framework import serializers
 from generic_relations.relations import GenericRelatedField
 
@@ -21,14 +22,46 @@ class ConversationSerializer(serializers.ModelSerializer):
             "alias",
             "is_pinned",
             "is_archived",
+            "last_read_id",
+            "unread_count",
             "chat",
         ]
+        read_only_fields = [
+            "last_read_id",
+            "unread_count",
+        ]
 
         extra_kwargs = {
             'chat': {"read_only": True}
         }
 
 
+class InboxConversationSerializer(ConversationSerializer):
+    last_message = serializers.SerializerMethodField()
+
+    class Meta(ConversationSerializer.Meta):
+        fields = ConversationSerializer.Meta.fields + [
+            "last_message",
+            "last_activity_at",
+        ]
+        read_only_fields = ConversationSerializer.Meta.read_only_fields + [
+            "last_activity_at",
+        ]
+
+    def get_last_message(self, instance: Conversation) -> Optional[dict]:
+        # message serializers depend on this module
+        from message.serializers import MessageInfoSerializer
+
+        message = instance.last_message
+        if message is None or getattr(instance, 'last_message_deleted', False):
+            return None
+
+        seen_count = getattr(instance, 'last_message_seen_count', None)
+        if seen_count is not None:
+            message.seen_users_count = seen_count
+        return MessageInfoSerializer(message, context=self.context).data
+
+
 class ConversationPinSerializer(serializers.ModelSerializer):
     class Meta:
         model = Conversation
@@ -20,4 +20,4 @@ class PrivateChatSerializer(serializers.ModelSerializer):
         if (request := self.context.get('request')):
             self_user = request.user
             if (another := pv.get_reciever_user(self_user)):
-                return UserInfoSerializer(another).data
+                return UserInfoSerializer(another, context=self.context).data
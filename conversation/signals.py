@@ -1,8 +1,8 @@
 from django.dispatch import receiver
-from django.db.models.signals import m2m_changed
+from django.db.models.signals import m2m_changed, post_save, post_delete
 from core.utils import delete_instance_on_error
-from conversation.tasks import create_conversations
-from conversation.models import PrivateChat
+from conversation.tasks import create_conversations, remove_chat_users_from_cache
+from conversation.models import Conversation, PrivateChat
 
 
 @receiver(m2m_changed, sender=PrivateChat.users.through)
@@ -14,3 +14,16 @@ def create_member_conversation(sender, instance: PrivateChat,
             chat=instance,
             user_ids=kwargs['pk_set']
         )
+
+
+@receiver(post_save, sender=Conversation)
+def remove_new_chat_user_from_cache(sender, instance: Conversation,
+                                    created, **kwargs):
+    if created:
+        remove_chat_users_from_cache(instance.chat_id)
+
+
+@receiver(post_delete, sender=Conversation)
+def remove_deleted_chat_user_from_cache(sender, instance: Conversation,
+                                        **kwargs):
+    remove_chat_users_from_cache(instance.chat_id)
@@ -1,13 +1,19 @@
 from typing import Union
 from celery import shared_task as task
+from django.db import transaction
 
+from core.cache import cache
 from conversation.models import Conversation
+from message import queryset as message_queryset
 
 
 @task
 def create_conversation(chat, user_id):
+    last_message_id = message_queryset.get_last_message_id(chat.pk)
     Conversation.objects.create(
-        chat=chat, user_id=user_id
+        chat=chat, user_id=user_id,
+        last_message_id=last_message_id,
+        last_read_id=last_message_id or 0,
     )
 
 
@@ -17,13 +23,26 @@ def create_conversations(chat, user_ids: list):
     users_have_conv = Conversation.objects.only('id').filter(
         chat_id=chat.pk, user_id__in=user_ids
     ).values_list('id', flat=True)
+    last_message_id = message_queryset.get_last_message_id(chat.pk)
     convs = [
-        Conversation(chat=chat, user_id=user_id)
+        Conversation(chat=chat, user_id=user_id,
+                     last_message_id=last_message_id,
+                     last_read_id=last_message_id or 0)
         for user_id in user_ids
         if int(user_id) not in users_have_conv
     ]
     if convs:
         Conversation.objects.bulk_create(convs)
+        remove_chat_users_from_cache(chat.pk)
+
+
+def remove_chat_users_from_cache(chat_id):
+    """Removes cached user ids of chat, that are used by
+    user-centric fan-out of channel events"""
+    key = cache.format_key(chat_id, key_name='chat_users')
+    cache.delete(key)
+    # Old users may be cached again by other processes until commit
+    transaction.on_commit(lambda: cache.delete(key))
 
 
 @task
@@ -36,3 +55,8 @@ def delete_conversation(chat_id, user_id: Union[str, int, list]):
     Conversation.objects.filter(
         chat_id=chat_id, **filter_kwarg
     ).delete()
+
+
+@task
+def reconcile_unread_counts():
+    return message_queryset.reconcile_unread_counts()
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test.testcases import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
 
@@ -8,6 +10,8 @@ from core.tests.utils import assert_items_are_same_as_data
 from core.utils import get_list_of_dict_values
 from user.tests.utils import create_active_user
 from auth_app.tests.utils import create_access
+from message.queryset import get_inbox_conversations
+from message.tests.utils import create_message, create_deleted_msg
 from .utils import create_conversation, create_private_chat
 
 
@@ -140,3 +144,92 @@ class ConversationViewTest(APITestCase):
 
     def test_delete_conv(self):
         self.caller.destroy__delete(self.access, user=self.user)
+
+
+class InboxViewTest(APITestCase):
+    caller: ConversationViewCaller
+
+    def setUp(self):
+        self.caller = ConversationViewCaller(self.client)
+        self.user = create_active_user()
+        self.access = create_access(user=self.user
+                                    ).encrypted_token
+        self.pvs = [create_private_chat(creator=self.user)
+                    for _ in range(4)]
+
+    def get_conv_id(self, pv) -> int:
+        return Conversation.objects.get(user=self.user, chat_id=pv.pk).pk
+
+    def get_inbox_ids(self, res) -> list:
+        return get_list_of_dict_values(res.data['results'], 'id')
+
+    def test_ordered_by_last_activity(self):
+        create_message(self.user, self.pvs[1])
+        create_message(self.user, self.pvs[3])
+        Conversation.objects.filter(pk=self.get_conv_id(self.pvs[0]))\
+            .update(is_pinned=True)
+
+        res = self.caller.inbox__get(self.access)
+        self.assertEqual(self.get_inbox_ids(res), [
+            self.get_conv_id(pv) for pv in
+            [self.pvs[0], self.pvs[3], self.pvs[1], self.pvs[2]]
+        ])
+
+    def test_last_message(self):
+        msg1 = create_message(self.pvs[0].users.last(), self.pvs[0])
+        msg2 = create_message(self.user, self.pvs[0])
+
+        res = self.caller.inbox__get(self.access)
+        conv = res.data['results'][0]
+        self.assertEqual(conv['last_message']['id'], msg2.pk)
+        self.assertEqual(conv['last_message']['seen_count'], 0)
+        self.assertEqual(conv['unread_count'], 1)
+
+        msg2.soft_delete()
+        res = self.caller.inbox__get(self.access)
+        self.assertEqual(res.data['results'][0]['last_message']['id'],
+                         msg1.pk)
+
+        create_deleted_msg(msg1, self.user)
+        res = self.caller.inbox__get(self.access)
+        self.assertIsNone(res.data['results'][0]['last_message'])
+
+    def test_keyset_pages(self):
+        for pv in self.pvs:
+            create_message(self.user, pv)
+
+        res = self.caller.inbox__get(self.access, page_size=3)
+        ids = self.get_inbox_ids(res)
+        self.assertEqual(len(ids), 3)
+
+        res = self.client.get(res.data['next'],
+                              **self.caller.get_auth_header(self.access))
+        ids += self.get_inbox_ids(res)
+        self.assertIsNone(res.data['next'])
+        self.assertEqual(ids, [self.get_conv_id(pv)
+                               for pv in reversed(self.pvs)])
+
+    def test_queries_not_grow(self):
+        for pv in self.pvs[:2]:
+            create_message(self.user, pv)
+        self.caller.inbox__get(self.access)
+        with CaptureQueriesContext(connection) as two_chats:
+            self.caller.inbox__get(self.access)
+
+        for pv in self.pvs[2:]:
+            create_message(self.user, pv)
+        self.caller.inbox__get(self.access)
+        with CaptureQueriesContext(connection) as four_chats:
+            self.caller.inbox__get(self.access)
+
+        self.assertEqual(len(two_chats), len(four_chats))
+
+    def test_bad_cursor(self):
+        self.caller.inbox__get(self.access, cursor='bad',
+                               allowed_status=status.HTTP_404_NOT_FOUND)
+
+    def test_inbox_uses_index(self):
+        plan = get_inbox_conversations(self.user.pk).order_by(
+            '-is_pinned', '-last_activity_at', '-id')[:15].explain()
+        self.assertIn('conv_user_inbox_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan.upper())
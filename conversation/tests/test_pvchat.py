@@ -1,6 +1,8 @@
+from django.db import IntegrityError, transaction
 from django.test.testcases import TestCase
 
 from conversation.models import PrivateChat
+from conversation.querysets import get_or_create_pvchat
 from user.tests.utils import create_active_user
 from .utils import create_private_chat
 
@@ -55,3 +57,43 @@ class PrivateChatModelTest(TestCase):
             found_pv.exists(),
             "unexpected pvchat found"
         )
+
+    def test_user_pair_key(self):
+        pv = create_private_chat(self.user2, self.user)
+
+        self.assertEqual(pv.low_user_id, self.user.pk)
+        self.assertEqual(pv.high_user_id, self.user2.pk)
+        self.assertEqual(
+            PrivateChat.objects.filter_users(self.user2.pk, self.user.pk)
+            .get(), pv)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            PrivateChat.objects.create_for_users(self.user, self.user2)
+
+    def test_get_or_create_for_users(self):
+        pv, created = PrivateChat.objects.get_or_create_for_users(
+            self.user, self.user2.pk)
+        self.assertTrue(created)
+        self.assertEqual(pv.creator_id, self.user.pk)
+        self.assertEqual(set(pv.users.values_list('id', flat=True)),
+                         {self.user.pk, self.user2.pk})
+
+        found_pv, created = PrivateChat.objects.get_or_create_for_users(
+            self.user2.pk, self.user.pk)
+        self.assertFalse(created)
+        self.assertEqual(found_pv, pv)
+
+    def test_get_or_create_pvchat(self):
+        pv = get_or_create_pvchat(self.user.pk, self.user2.pk)
+        self.assertEqual(get_or_create_pvchat(self.user2.pk, self.user.pk),
+                         pv)
+        self.assertIsNone(get_or_create_pvchat(self.user.pk, 0))
+
+    def test_reciever_user_without_users(self):
+        create_private_chat(self.user, self.user2)
+        pv = PrivateChat.objects.select_related('low_user', 'high_user')\
+            .filter_users(self.user, self.user2).get()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(pv.get_reciever_user(self.user), self.user2)
+            self.assertEqual(pv.get_reciever_user(self.user2), self.user)
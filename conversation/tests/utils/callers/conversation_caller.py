@@ -7,6 +7,7 @@ from core.tests.utils import BaseCaller
 from ..creators import create_conversation
 
 CONV_LIST_URL = reverse_lazy(f"{app_name}:conversation-list")
+CONV_INBOX_URL = reverse_lazy(f"{app_name}:conversation-inbox")
 
 
 def conv_detail_url(pk):
@@ -42,6 +43,15 @@ class ConversationViewCaller(BaseCaller):
             **self.get_auth_header(access_token)
         )
 
+    def inbox__get(self, access_token, allowed_status=status.HTTP_200_OK,
+                   **params):
+        """Calls conversation-inbox view with GET method"""
+        return self.assert_status_code(
+            allowed_status, self.client.get,
+            CONV_INBOX_URL, data=params,
+            **self.get_auth_header(access_token)
+        )
+
     def retrieve__get(self, access_token, pk=None, user=None,
                       allowed_status=status.HTTP_200_OK):
         """Calls conversation-retrieve view with GET method"""
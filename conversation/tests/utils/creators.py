@@ -7,11 +7,8 @@ def create_private_chat(creator=None, receiver=None, **kwargs
     creator = creator if creator else create_active_user()
     receiver = receiver if receiver else create_active_user()
 
-    pv = PrivateChat.objects.create(creator=creator,
-                                    **kwargs)
-    pv.users.set([creator, receiver])
-
-    return pv
+    return PrivateChat.objects.create_for_users(
+        creator, receiver, creator=creator, **kwargs)
 
 
 def create_conversation(chat=None, user=None, **kwargs) -> Conversation:
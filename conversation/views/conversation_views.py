@@ -4,10 +4,13 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from conversation.models import Conversation
+from conversation.models.queryset.conversation_queryset import prefetch_chats
+from conversation.paginations import InboxPagination
+from message.queryset import get_inbox_conversations
 from conversation.serializers import (
     ConversationSerializer, ConversationPinSerializer,
     ConversationArchiveSerializer, ConversationAliasSerializer,
-    ConversationUpdateSerializer)
+    ConversationUpdateSerializer, InboxConversationSerializer)
 
 
 class ConversationViewSet(mixins.ListModelMixin,
@@ -23,6 +26,8 @@ class ConversationViewSet(mixins.ListModelMixin,
 
         if self.action in ['retrieve', 'list']:
             qs = qs.auto_prefetch_next()
+        elif self.action == 'inbox':
+            return get_inbox_conversations(self.request.user.pk)
 
         return qs.filter(
             user=self.request.user
@@ -37,6 +42,8 @@ class ConversationViewSet(mixins.ListModelMixin,
             return ConversationUpdateSerializer
         if self.action == 'alias':
             return ConversationAliasSerializer
+        if self.action == 'inbox':
+            return InboxConversationSerializer
 
         return super().get_serializer_class()
 
@@ -102,3 +109,15 @@ class ConversationViewSet(mixins.ListModelMixin,
         serializer.save()
 
         return Response(data=serializer.data)
+
+    @action(['get'], detail=False, pagination_class=InboxPagination)
+    def inbox(self, request, *args, **kwargs):
+        """
+        List conversations with their last message,
+        pinned ones first and then by last activity.
+        """
+        page = self.paginate_queryset(self.get_queryset())
+        prefetch_chats(page)
+
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
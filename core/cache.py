@@ -3,11 +3,22 @@ from cache_helper.cache import Cache
 
 class AppCache(Cache):
     key_patterns = {
-        "deleted_message": "deleted_{msg_id}_{user_id}",
+        "deleted_messages": "deleted_msgs_{chat_id}_{user_id}",
         "pv_id": "pv_{}_{}",
         "user_pvs": "pvs_{}",
         "guid": "guid_{}",
+        "access_info": "access_info_{}",
+        "access_info_slot": "access_info_slot_{}",
+        "access_info_count": "access_info_count",
+        "access_info_flushed": "access_info_flushed",
+        "access_info_unwritten": "access_info_unwritten",
+        "access_info_lock": "access_info_lock",
+        "outbox_lock": "outbox_lock",
+        "outbox_pruned_id": "outbox_pruned_id",
+        "member_rank": "member_rank_{community_id}_{user_id}",
+        "chat_users": "chat_users_{}",
     }
+    local_key_names = {"deleted_messages", "pv_id", "user_pvs", "guid"}
 
 
 cache = AppCache()
@@ -0,0 +1,76 @@
+import json
+from typing import Any, Callable, Optional, Union
+from django.conf import settings
+from rest_framework.utils.json import strict_constant
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_CODEC = getattr(settings, 'JSON_CODEC', None)
+"""Name of codec that is used, `None` to use orjson if it's installed"""
+
+
+class StdlibJSONCodec:
+    """Encodes and decodes JSON by python's `json` module"""
+    name = 'json'
+
+    def dumps(self, obj, default: Optional[Callable] = None) -> str:
+        """Return compact JSON of `obj`, unsupported objects are
+        passed to `default`"""
+        return json.dumps(obj, default=default, ensure_ascii=False,
+                          separators=(',', ':'))
+
+    def dumps_bytes(self, obj, default: Optional[Callable] = None) -> bytes:
+        """Return `dumps` of `obj` encoded as utf-8"""
+        return self.dumps(obj, default).encode()
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """Decode JSON of `data`, raises `ValueError` for invalid JSON.
+        `NaN` and `Infinity` are rejected like DRF's parser and orjson"""
+        return json.loads(data, parse_constant=strict_constant)
+
+
+class OrjsonCodec(StdlibJSONCodec):
+    """
+    Encodes and decodes JSON by `orjson`.
+
+    Output is the same as `StdlibJSONCodec`: keys that aren't string are
+    converted and datetimes are passed to `default` instead of being
+    formatted by orjson.
+    """
+    name = 'orjson'
+    options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+               if orjson else 0)
+
+    def dumps(self, obj, default=None) -> str:
+        return self.dumps_bytes(obj, default).decode()
+
+    def dumps_bytes(self, obj, default=None) -> bytes:
+        # orjson.JSONEncodeError is a TypeError, like errors of json.dumps
+        return orjson.dumps(obj, default=default, option=self.options)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+CODECS = {
+    StdlibJSONCodec.name: StdlibJSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+}
+
+
+def get_codec(name: Optional[str] = None) -> StdlibJSONCodec:
+    """
+    Return codec of `name`, or of `JSON_CODEC` setting if it's not set.
+    orjson is used by default if it's installed, else stdlib's `json`.
+    """
+    name = name or JSON_CODEC or (OrjsonCodec.name if orjson
+                                  else StdlibJSONCodec.name)
+    if name == OrjsonCodec.name and orjson is None:
+        raise ImportError("orjson codec is set but orjson isn't installed")
+    return CODECS[name]()
+
+
+codec = get_codec()
@@ -0,0 +1,77 @@
+from time import perf_counter
+from typing import Callable
+from django.core.management.base import BaseCommand
+
+from core.json_codec import CODECS, orjson
+
+
+def get_user(pk: int) -> dict:
+    return {
+        'id': pk, 'first_name': f'user {pk}', 'last_name': None,
+        'bio': 'Hello there', 'full_name': f'user {pk}',
+        'guid': f'U{pk:011d}', 'profile_image': None,
+        'last_seen': '2022-01-02T03:04:05.123456+03:30',
+        'is_contact': False, 'is_online': True, 'is_staff': False,
+        'is_scam': False, 'type': 'U',
+    }
+
+
+def get_message(pk: int) -> dict:
+    return {
+        'id': pk, 'seq': pk, 'content_type': 'text',
+        'content': {'text': 'سلام، این یک پیام آزمایشی است ' * 3},
+        'chat': {'user': get_user(2), 'creator': get_user(1)},
+        'sender': get_user(1), 'seen_count': 1, 'forwarded_from': None,
+        'sent_at': '2022-01-02T03:04:05.123456+03:30', 'is_edited': False,
+    }
+
+
+def get_conversations(count: int) -> dict:
+    return {
+        'next': None, 'previous': None,
+        'results': [{
+            'chat': {'user': get_user(pk), 'creator': get_user(1)},
+            'last_message': get_message(pk), 'unread_count': pk % 5,
+            'last_read_id': pk, 'is_muted': False, 'is_pinned': False,
+        } for pk in range(count)],
+    }
+
+
+class Command(BaseCommand):
+    help = ('Measures encoding and decoding of a message event and a '
+            'conversations list by every available JSON codec')
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('-n', '--number', type=int, default=2000,
+                            help='number of times every payload is coded')
+        parser.add_argument('-c', '--conversations', type=int, default=50,
+                            help='number of conversations in the list')
+
+    def measure(self, func: Callable, data, count: int) -> float:
+        """Call `func` by `data` for `count` times and
+        return microseconds per call"""
+        start = perf_counter()
+        for _ in range(count):
+            func(data)
+        return (perf_counter() - start) / count * 10 ** 6
+
+    def handle(self, *args, **options):
+        count = options['number']
+        payloads = {
+            'message': {'event': 'receive_message', 'event_id': 1,
+                        'message': get_message(1)},
+            'conversations': get_conversations(options['conversations']),
+        }
+        codecs = [codec_class() for codec_class in CODECS.values()
+                  if codec_class.name != 'orjson' or orjson]
+
+        self.stdout.write(f"{'payload':>14} {'codec':>7} {'bytes':>8} "
+                          f"{'dumps us':>10} {'loads us':>10}")
+        for name, data in payloads.items():
+            for codec in codecs:
+                text = codec.dumps(data)
+                dumps = self.measure(codec.dumps, data, count)
+                loads = self.measure(codec.loads, text, count)
+                self.stdout.write(f"{name:>14} {codec.name:>7} "
+                                  f"{len(text.encode()):>8} "
+                                  f"{dumps:>10.1f} {loads:>10.1f}")
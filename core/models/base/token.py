@@ -1,10 +1,11 @@
 from typing import Optional
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
-from django.contrib.auth.hashers import BasePasswordHasher, PBKDF2PasswordHasher
+from django.contrib.auth.hashers import BasePasswordHasher
 from django.db import models
 
 from ..manager.encrypted_token import EncryptedTokenManager
+from ..utils.hashers import HMACTokenHasher
 from ..utils.token import encrypt_token_and_value, generate_token
 
 
@@ -21,7 +22,7 @@ class BaseToken(models.Model):
     _original_token = None
     """original token (unhashed token)"""
 
-    _hasher: BasePasswordHasher = PBKDF2PasswordHasher()
+    _hasher: BasePasswordHasher = HMACTokenHasher()
     """hasher for hashing token"""
 
     _encrypt_key = settings.SECRET_KEY
@@ -4,7 +4,8 @@ from django.db.models.base import Model
 from django.db.models.manager import Manager
 from django.contrib.auth.hashers import check_password
 
-from ..utils.token import decrypt_token_and_value
+from ..utils.token import decrypt_token_and_value, get_token_digest, hash_token
+from ..utils.verified_token import verified_tokens
 
 
 class EncryptedTokenManager(Manager):
@@ -13,6 +14,12 @@ class EncryptedTokenManager(Manager):
         """Find object by encrypted token that contains
         pk and unencrypted token
 
+        Tokens that verified once are kept in `verified_tokens` cache,
+        so next calls only query the instance and compare it's hashed token.
+
+        Tokens that were hashed by another hasher than model's `_hasher`
+        (e.g. PBKDF2) are rehashed by `_hasher` when they're found.
+
         Parameters
         ----------
         `select`: a list of strings that used for `.select_related()`
@@ -29,16 +36,49 @@ class EncryptedTokenManager(Manager):
         key = getattr(self.model, '_encrypt_key', None)
         assert key is not None, "You must set `_encrypt_key` attr in your model"
 
+        digest = get_token_digest(key, encrypted_token)
+        if (verified := verified_tokens.get(self.model, digest)):
+            instance_id, hashed_token = verified
+            instance = self.__get_instance(instance_id, select, prefetch)
+            if instance is None:
+                return None
+            if instance.token == hashed_token:
+                return instance
+
         if value := decrypt_token_and_value(key, encrypted_token):
             instance_id, token = value
-            instance = self.filter(pk=instance_id)\
-                .select_related(*select)\
-                .prefetch_related(*prefetch).first()
+            instance = self.__get_instance(instance_id, select, prefetch)
             if instance:
-                if self.check_token(token, instance.token):
+                if self.check_token(token, instance.token,
+                                    setter=lambda t: self.rehash_token(instance, t)):
+                    verified_tokens.add(instance, digest)
                     return instance
 
-    @classmethod
-    def check_token(cls, token: str, hashed_token: str) -> bool:
-        """Return `True` if raw `token` is same as `hashed_token`"""
-        return check_password(token, hashed_token)
+    def __get_instance(self, pk, select: Iterable[str],
+                       prefetch: Iterable[str]) -> Optional[Model]:
+        return self.filter(pk=pk)\
+            .select_related(*select)\
+            .prefetch_related(*prefetch).first()
+
+    def check_token(self, token: str, hashed_token: str, setter=None) -> bool:
+        """Return `True` if raw `token` is same as `hashed_token`.
+
+        `hashed_token` is verified by model's `_hasher` if it was hashed by it,
+        otherwise by `PASSWORD_HASHERS` and `setter(token)` will be called
+        if it was correct, so token can be rehashed."""
+        hasher = getattr(self.model, '_hasher', None)
+        if hasher is None:
+            return check_password(token, hashed_token)
+
+        if hashed_token.startswith(f"{hasher.algorithm}$"):
+            return hasher.verify(token, hashed_token)
+
+        is_correct = check_password(token, hashed_token)
+        if is_correct and setter:
+            setter(token)
+        return is_correct
+
+    def rehash_token(self, instance: Model, token: str):
+        """Hash `token` by model's `_hasher` and save it for `instance`"""
+        instance.token = hash_token(token, self.model._hasher)
+        self.filter(pk=instance.pk).update(token=instance.token)
@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.contrib.auth.hashers import BasePasswordHasher, mask_hash
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.translation import gettext_noop as _
+
+
+class HMACTokenHasher(BasePasswordHasher):
+    """
+    Hashes tokens with HMAC-SHA256 and a server secret.
+
+    Auto-generated tokens are long random strings, so the key stretching
+    of password hashers like PBKDF2 doesn't add any security to them and
+    only makes every token check slow.
+
+    `secret` is read from `TOKEN_HASHER_KEY` setting (default is `SECRET_KEY`)
+    when it's not passed.
+    """
+    algorithm = "hmac_sha256"
+    key_salt = "core.models.utils.hashers.HMACTokenHasher"
+
+    def __init__(self, secret: str = None) -> None:
+        self._secret = secret
+
+    @property
+    def secret(self) -> str:
+        if self._secret is not None:
+            return self._secret
+        return getattr(settings, 'TOKEN_HASHER_KEY', settings.SECRET_KEY)
+
+    def encode(self, password, salt):
+        assert password is not None
+        assert salt and '$' not in salt
+        hash = salted_hmac(self.key_salt, salt + password,
+                           secret=self.secret, algorithm='sha256').hexdigest()
+        return "%s$%s$%s" % (self.algorithm, salt, hash)
+
+    def decode(self, encoded):
+        algorithm, salt, hash = encoded.split('$', 2)
+        assert algorithm == self.algorithm
+        return {
+            'algorithm': algorithm,
+            'hash': hash,
+            'salt': salt,
+        }
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        encoded_2 = self.encode(password, decoded['salt'])
+        return constant_time_compare(encoded, encoded_2)
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return {
+            _('algorithm'): decoded['algorithm'],
+            _('salt'): mask_hash(decoded['salt'], show=2),
+            _('hash'): mask_hash(decoded['hash']),
+        }
+
+    def must_update(self, encoded):
+        return False
+
+    def harden_runtime(self, password, encoded):
+        pass
@@ -1,6 +1,6 @@
 from typing import Optional
 from cryptography.fernet import InvalidToken
-from django.utils.crypto import get_random_string
+from django.utils.crypto import get_random_string, salted_hmac
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.hashers import BasePasswordHasher, make_password
 from encrypt_decrypt_fields import Crypto
@@ -33,6 +33,13 @@ def decrypt_token_and_value(encrypt_key, encrypted_text: str
         return splitted_value
 
 
+def get_token_digest(key, encrypted_token: str) -> str:
+    """Return keyed digest of `encrypted_token` that can be
+    used instead of the token itself, e.g. as a cache key"""
+    return salted_hmac('token_digest', encrypted_token,
+                       secret=key, algorithm='sha256').hexdigest()
+
+
 def generate_token(instance=None, length=24, hasher: BasePasswordHasher = None):
     """Return auto-generated hashed token and set `_original_token` 
     to unhashed token in instance if `instance` is passed.
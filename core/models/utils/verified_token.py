@@ -0,0 +1,61 @@
+from typing import Optional
+from django.conf import settings
+from django.db.models import Model
+
+from cache_helper.local import LocalCache
+
+VERIFIED_TOKEN_CACHE_SIZE = getattr(settings, 'VERIFIED_TOKEN_CACHE_SIZE', 10000)
+VERIFIED_TOKEN_CACHE_TTL = getattr(settings, 'VERIFIED_TOKEN_CACHE_TTL', 60 * 5)
+
+
+class VerifiedTokenCache:
+    """
+    Remembers tokens that were verified by `EncryptedTokenManager.find_token`,
+    so decrypting and checking the hash won't be repeated on every request.
+
+    Items are keyed by a keyed digest of the token that user sent and
+    contain `(pk, hashed_token)` of instance. the hashed token is compared
+    with the instance's current `token` field on every hit, so a changed
+    token never matches an old item.
+    """
+
+    def __init__(self, max_size: int = VERIFIED_TOKEN_CACHE_SIZE,
+                 timeout: int = VERIFIED_TOKEN_CACHE_TTL) -> None:
+        self._cache = LocalCache(max_size=max_size, timeout=timeout)
+
+    @staticmethod
+    def _digest_key(model, digest: str) -> tuple:
+        return ('digest', model._meta.label, digest)
+
+    @staticmethod
+    def _instance_key(model, pk) -> tuple:
+        return ('instance', model._meta.label, str(pk))
+
+    def get(self, model, digest: str) -> Optional[tuple]:
+        """Return `(pk, hashed_token)` if `digest` was verified before"""
+        return self._cache.get(self._digest_key(model, digest))
+
+    def add(self, instance: Model, digest: str) -> None:
+        """Save `digest` as a verified token of `instance`"""
+        model = instance.__class__
+        self._cache.set(self._digest_key(model, digest),
+                        (instance.pk, instance.token))
+
+        instance_key = self._instance_key(model, instance.pk)
+        digests = self._cache.get(instance_key, set())
+        digests.add(digest)
+        self._cache.set(instance_key, digests)
+
+    def invalidate(self, instance: Model) -> None:
+        """Remove all verified tokens of `instance`"""
+        model = instance.__class__
+        digests = self._cache.get(self._instance_key(model, instance.pk), set())
+        for digest in digests:
+            self._cache.delete(self._digest_key(model, digest))
+        self._cache.delete(self._instance_key(model, instance.pk))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+verified_tokens = VerifiedTokenCache()
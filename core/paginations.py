@@ -1,4 +1,16 @@
-from rest_framework.pagination import LimitOffsetPagination, PageNumberPagination
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import (CursorPagination, LimitOffsetPagination,
+                                       PageNumberPagination)
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class DefaultLimitOffsetPagination(LimitOffsetPagination):
@@ -7,3 +19,225 @@ class DefaultLimitOffsetPagination(LimitOffsetPagination):
 
 class DefaultPageNumberPagination(PageNumberPagination):
     page_size = 15
+
+
+class KeysetLimitOffsetPagination(DefaultLimitOffsetPagination):
+    """
+    Limit-offset pagination that switches to keyset mode when
+    `before_id` or `after_id` is in query params.
+
+    In keyset mode, items are filtered by `keyset_field` instead of using
+    `OFFSET`, and total count isn't calculated, so every page costs the same
+    no matter how far it is from the first one. an empty value
+    (e.g. `?before_id=`) returns the first page in keyset mode.
+
+    Items are fetched by `keyset_field` and then sorted as queryset's
+    ordering says, so ordering fields must have the same order as
+    `keyset_field` (e.g. an `auto_now_add` field for `id`).
+    """
+    keyset_field = 'id'
+    before_query_param = 'before_id'
+    before_query_description = 'Return items that their id is lower than this.'
+    after_query_param = 'after_id'
+    after_query_description = 'Return items that their id is greater than this.'
+
+    keyset_mode = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_mode = (self.before_query_param in request.query_params
+                            or self.after_query_param in request.query_params)
+        if not self.keyset_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.before = self.get_anchor(request, self.before_query_param)
+        self.after = self.get_anchor(request, self.after_query_param)
+        self.descending = self.is_descending(queryset)
+
+        field = self.keyset_field
+        if self.before is not None:
+            queryset = queryset.filter(**{f'{field}__lt': self.before})
+        if self.after is not None:
+            queryset = queryset.filter(**{f'{field}__gt': self.after})
+
+        # Fetch the nearest items to anchor
+        if self.before is not None:
+            self.fetch_descending = True
+        elif self.after is not None:
+            self.fetch_descending = False
+        else:
+            self.fetch_descending = self.descending
+
+        ordering = f'-{field}' if self.fetch_descending else field
+        page = list(queryset.order_by(ordering)[:self.limit + 1])
+        self.has_more = len(page) > self.limit
+        page = page[:self.limit]
+
+        if self.fetch_descending != self.descending:
+            page.reverse()
+        self.page = page
+        return page
+
+    def get_anchor(self, request, query_param) -> Optional[int]:
+        value = request.query_params.get(query_param)
+        if value in (None, ''):
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValidationError(
+                {query_param: ['A valid integer is required.']})
+
+    def is_descending(self, queryset) -> bool:
+        ordering = (queryset.query.order_by
+                    or queryset.model._meta.ordering)
+        return bool(ordering) and str(ordering[0]).startswith('-')
+
+    def get_paginated_response(self, data):
+        if not self.keyset_mode:
+            return super().get_paginated_response(data)
+
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def __get_anchor_link(self, last: bool) -> Optional[str]:
+        """Return link of page after last item
+        (or before first item if `last` is `False`)"""
+        item = self.page[-1 if last else 0]
+        value = getattr(item, self.keyset_field)
+
+        # `before_id` follows the items that have lower ids
+        use_before = (self.descending == last)
+        param = self.before_query_param if use_before else self.after_query_param
+        other = self.after_query_param if use_before else self.before_query_param
+
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, other)
+        url = remove_query_param(url, self.offset_query_param)
+        return replace_query_param(url, param, value)
+
+    def get_next_link(self):
+        if not self.keyset_mode:
+            return super().get_next_link()
+        if not self.page:
+            return None
+        if self.fetch_descending == self.descending and not self.has_more:
+            return None
+        return self.__get_anchor_link(last=True)
+
+    def get_previous_link(self):
+        if not self.keyset_mode:
+            return super().get_previous_link()
+        if not self.page:
+            return None
+        if self.fetch_descending == self.descending:
+            if self.before is None and self.after is None:
+                return None
+        elif not self.has_more:
+            return None
+        return self.__get_anchor_link(last=False)
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.before_query_param,
+                'required': False,
+                'in': 'query',
+                'description': self.before_query_description,
+                'schema': {
+                    'type': 'integer',
+                },
+            },
+            {
+                'name': self.after_query_param,
+                'required': False,
+                'in': 'query',
+                'description': self.after_query_description,
+                'schema': {
+                    'type': 'integer',
+                },
+            },
+        ]
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination that compares all of `ordering` fields with the last
+    item of previous page (e.g. `(is_pinned, last_activity_at, id)`),
+    instead of only the first field and an offset, so pages can be read
+    from an index on these fields.
+
+    Last field of `ordering` should be unique and fields shouldn't be null.
+    Only the next page link is returned.
+    """
+    page_size = 15
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-id',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        if (values := self.decode_keyset(request, queryset)) is not None:
+            queryset = queryset.filter(self.get_keyset_filter(values))
+
+        page = list(queryset.order_by(*self.ordering)[:self.page_size + 1])
+        self.has_next = len(page) > self.page_size
+        self.page = page[:self.page_size]
+        return self.page
+
+    def get_keyset_filter(self, values) -> Q:
+        """Returns filter of items that are after `values` in ordering"""
+        keyset_filter = Q()
+        equals = {}
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            keyset_filter |= Q(**equals, **{f'{name}__{lookup}': value})
+            equals[name] = value
+        return keyset_filter
+
+    def decode_keyset(self, request, queryset) -> Optional[list]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            values = json.loads(b64decode(encoded.encode('ascii')))
+            if len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                queryset.model._meta.get_field(field.lstrip('-'))
+                .to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_keyset(self, item) -> str:
+        values = []
+        for field in self.ordering:
+            value = getattr(item, field.lstrip('-'))
+            if isinstance(value, datetime):
+                # Keeps microseconds unlike `DjangoJSONEncoder`
+                value = value.isoformat()
+            values.append(value)
+        return b64encode(json.dumps(values).encode('ascii')).decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param,
+                                   self.encode_keyset(self.page[-1]))
+
+    def get_previous_link(self):
+        return None
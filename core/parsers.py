@@ -0,0 +1,23 @@
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from .json_codec import codec
+from .renderers import JSONRenderer
+
+
+class JSONParser(parsers.JSONParser):
+    """Parses JSON request bodies by `core.json_codec`"""
+    renderer_class = JSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        try:
+            data = stream.read()
+            if encoding.lower().replace('-', '') != 'utf8':
+                data = data.decode(encoding)
+            return codec.loads(data)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
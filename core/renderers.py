@@ -0,0 +1,21 @@
+from rest_framework import renderers
+
+from .json_codec import codec
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """
+    Renders compact responses by `core.json_codec`, indented (e.g. in
+    browsable API) or ascii-only responses are rendered by DRF itself.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (data is None or not self.compact or self.ensure_ascii or
+                self.get_indent(accepted_media_type,
+                                renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = codec.dumps_bytes(data, default=self.encoder_class().default)
+        # Escaped like DRF does, they aren't valid in javascript strings
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028')\
+            .replace(b'\xe2\x80\xa9', b'\\u2029')
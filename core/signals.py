@@ -1,4 +1,20 @@
-from django.dispatch import Signal
+from django.dispatch import Signal, receiver
+from django.db.models.signals import post_save, post_delete
+
+from core.models.base import BaseToken
+from core.models.utils.verified_token import verified_tokens
 
 pre_soft_delete = Signal(providing_args=['instance'])
 post_soft_delete = Signal(providing_args=['instance'])
+
+
+@receiver(post_save)
+def invalidate_expired_verified_token(sender, instance, **kwargs):
+    if isinstance(instance, BaseToken) and instance.is_token_expired:
+        verified_tokens.invalidate(instance)
+
+
+@receiver(post_delete)
+def invalidate_deleted_verified_token(sender, instance, **kwargs):
+    if isinstance(instance, BaseToken):
+        verified_tokens.invalidate(instance)
@@ -1,4 +1,4 @@
-from django.core.cache import cache
+from core.cache import cache
 
 
 class ClearCacheMixin:
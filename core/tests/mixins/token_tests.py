@@ -2,6 +2,12 @@ from unittest.mock import patch
 from django.db.models.base import Model
 from abc import ABC, abstractmethod
 
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+from core.models.manager import EncryptedTokenManager
+from core.models.utils.token import get_token_digest, hash_token
+from core.models.utils.verified_token import verified_tokens
+
 
 class TokenTest(ABC):
     """Tests for BaseToken class"""
@@ -42,3 +48,67 @@ class TokenTest(ABC):
             instance_2 = self.__create_instance()
             self.assertNotEqual(instance_2,
                                 self.__model.objects.find_token(instance.encrypted_token))
+
+    def __get_verified(self, instance):
+        digest = get_token_digest(self.__model._encrypt_key,
+                                  instance.encrypted_token)
+        return verified_tokens.get(self.__model, digest)
+
+    def test_find_token_cached(self):
+        with patch.object(self.__model, 'should_generate_token',
+                          return_value=True):
+            instance = self.__create_instance()
+        token = instance.encrypted_token
+
+        self.assertEqual(instance, self.__model.objects.find_token(token))
+        self.assertIsNotNone(self.__get_verified(instance))
+
+        with patch.object(EncryptedTokenManager, 'check_token') as check:
+            self.assertEqual(instance, self.__model.objects.find_token(token))
+            check.assert_not_called()
+
+    def test_verified_token_invalidated_on_expire(self):
+        with patch.object(self.__model, 'should_generate_token',
+                          return_value=True):
+            instance = self.__create_instance()
+        self.__model.objects.find_token(instance.encrypted_token)
+
+        instance.is_token_expired = True
+        instance.save()
+        self.assertIsNone(self.__get_verified(instance))
+
+    def test_verified_token_invalidated_on_delete(self):
+        with patch.object(self.__model, 'should_generate_token',
+                          return_value=True):
+            instance = self.__create_instance()
+        token = instance.encrypted_token
+        self.__model.objects.find_token(token)
+
+        instance.delete()
+        self.assertIsNone(self.__get_verified(instance))
+        self.assertIsNone(self.__model.objects.find_token(token))
+
+    def test_token_hashed_by_hasher(self):
+        with patch.object(self.__model, 'should_generate_token',
+                          return_value=True):
+            instance = self.__create_instance()
+        self.assertTrue(instance.token.startswith(
+            f"{self.__model._hasher.algorithm}$"))
+
+    def test_find_legacy_token_rehashed(self):
+        with patch.object(self.__model, 'should_generate_token',
+                          return_value=True):
+            instance = self.__create_instance()
+        legacy_token = hash_token(instance._original_token,
+                                  PBKDF2PasswordHasher())
+        self.__model.objects.filter(pk=instance.pk).update(token=legacy_token)
+
+        found = self.__model.objects.find_token(instance.encrypted_token)
+        self.assertEqual(instance, found)
+        self.assertTrue(found.token.startswith(
+            f"{self.__model._hasher.algorithm}$"))
+
+        instance.refresh_from_db()
+        self.assertEqual(instance.token, found.token)
+        self.assertEqual(instance, self.__model.objects.find_token(
+            instance.encrypted_token))
@@ -0,0 +1,174 @@
+from threading import Barrier, Thread, Timer
+from time import sleep
+from unittest.mock import patch
+from django.core.cache import cache as backend_cache
+from django.test.testcases import SimpleTestCase
+
+from cache_helper.invalidation import LocalInvalidator
+from core.cache import AppCache
+from core.tests.mixins import ClearCacheMixin
+
+
+class AppCacheTest(ClearCacheMixin, SimpleTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.invalidator = LocalInvalidator()
+        self.cache = AppCache(local_size=10, local_timeout=60,
+                              invalidator=self.invalidator)
+        self.key = self.cache.format_key(1, 2, key_name='pv_id')
+
+    def test_key_name(self):
+        self.assertEqual(self.cache.get_key_name(self.key), 'pv_id')
+        self.assertEqual(self.cache.get_key_name('pvs_1'), 'user_pvs')
+        self.assertEqual(self.cache.get_key_name('access_info_slot_3'),
+                         'access_info_slot')
+        self.assertEqual(self.cache.get_key_name('access_info_count'),
+                         'access_info_count')
+
+    def test_local_hit(self):
+        self.cache.set(self.key, 5)
+        backend_cache.delete(self.key)
+
+        self.assertEqual(self.cache.get(self.key), 5)
+        self.assertEqual(self.cache.get_stats()['pv_id']['local_hits'], 1)
+
+    def test_backend_hit_is_kept_locally(self):
+        backend_cache.set(self.key, 5)
+        self.assertEqual(self.cache.get(self.key), 5)
+        backend_cache.delete(self.key)
+        self.assertEqual(self.cache.get(self.key), 5)
+
+        self.assertEqual(self.cache.get_stats()['pv_id'],
+                         {'local_hits': 1, 'hits': 1, 'misses': 0})
+
+    def test_not_local_key(self):
+        key = self.cache.format_key(1, key_name='access_info')
+        self.cache.set(key, 5)
+        backend_cache.delete(key)
+
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(self.cache.get_stats()['access_info']['misses'], 1)
+
+    def test_delete(self):
+        self.cache.set(self.key, 5)
+        self.cache.delete(self.key)
+        self.assertIsNone(self.cache.get(self.key))
+
+    def test_local_timeout(self):
+        self.cache.set(self.key, 5, timeout=0.01)
+        backend_cache.delete(self.key)
+        sleep(0.02)
+        self.assertIsNone(self.cache.get(self.key))
+
+    def test_invalidate_other_caches(self):
+        other = AppCache(local_size=10, local_timeout=60,
+                         invalidator=self.invalidator)
+        other.set(self.key, 5)
+        self.assertEqual(other.get(self.key), 5)
+
+        self.cache.set(self.key, 6)
+        self.assertEqual(other.get(self.key), 6)
+
+        self.cache.delete(self.key)
+        self.assertIsNone(other.get(self.key))
+
+    def test_clear_other_caches(self):
+        other = AppCache(local_size=10, local_timeout=60,
+                         invalidator=self.invalidator)
+        other.set(self.key, 5)
+
+        self.cache.clear()
+        self.assertIsNone(other.get(self.key))
+
+    def test_disabled_local_tier(self):
+        cache = AppCache(local_size=0, invalidator=self.invalidator)
+        cache.set(self.key, 5)
+        backend_cache.delete(self.key)
+        self.assertIsNone(cache.get(self.key))
+
+    def test_get_stored_none(self):
+        key = self.cache.format_key(1, key_name='access_info')
+        self.cache.set(key, None)
+        self.assertIsNone(self.cache.get(key, 'missing'))
+        self.assertEqual(self.cache.get_stats()['access_info']['hits'], 1)
+
+    def test_get_set_delete_many(self):
+        local_key = self.key
+        key = self.cache.format_key(1, key_name='access_info')
+        self.cache.set_many({local_key: 1, key: 2})
+        backend_cache.delete(local_key)
+
+        self.assertEqual(self.cache.get_many([local_key, key, 'pvs_1']),
+                         {local_key: 1, key: 2})
+        self.assertEqual(self.cache.get_stats()['user_pvs']['misses'], 1)
+
+        self.cache.delete_many([local_key, key])
+        self.assertEqual(self.cache.get_many([local_key, key]), {})
+
+    def test_incr(self):
+        key = self.cache.format_key(key_name='access_info_count')
+        self.assertEqual(self.cache.incr(key), 1)
+        self.assertEqual(self.cache.incr(key, 2), 3)
+        self.assertEqual(self.cache.get(key), 3)
+
+    def test_get_or_set_single_flight(self):
+        calls = []
+        barrier = Barrier(5)
+
+        def compute():
+            calls.append(1)
+            sleep(0.1)
+            return {1, 2}
+
+        def get():
+            barrier.wait()
+            results.append(self.cache.get_or_set(
+                'pvs_1', default_func=compute))
+
+        results = []
+        threads = [Thread(target=get) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{1, 2}] * 5)
+
+    def test_get_or_set_waits_for_other_process(self):
+        backend_cache.add(f'pvs_1{self.cache.lock_suffix}', 'other')
+        Timer(0.1, backend_cache.set, ['pvs_1', {3}]).start()
+
+        value = self.cache.get_or_set(
+            'pvs_1', default_func=lambda: self.fail('called'))
+        self.assertEqual(value, {3})
+
+    def test_get_or_set_after_released_lock(self):
+        lock_key = f'pvs_1{self.cache.lock_suffix}'
+        backend_cache.add(lock_key, 'other')
+        Timer(0.1, backend_cache.delete, [lock_key]).start()
+
+        self.assertEqual(
+            self.cache.get_or_set('pvs_1', default_func=lambda: {4}), {4})
+        self.assertNotIn(lock_key, backend_cache)
+
+    @patch('cache_helper.cache.CACHE_LOCK_TIMEOUT', 0.1)
+    def test_get_or_set_keeps_waiting_for_lock_owner(self):
+        lock_key = f'pvs_1{self.cache.lock_suffix}'
+        backend_cache.add(lock_key, 'other')
+        Timer(0.3, backend_cache.set, ['pvs_1', {5}]).start()
+
+        value = self.cache.get_or_set(
+            'pvs_1', default_func=lambda: self.fail('called'))
+        self.assertEqual(value, {5})
+        self.assertEqual(backend_cache.get(lock_key), 'other')
+
+    def test_release_lock_of_other_owner(self):
+        token = self.cache.acquire_lock('test:lock', 10)
+        self.assertIsNone(self.cache.acquire_lock('test:lock', 10))
+        self.assertTrue(self.cache.extend_lock('test:lock', token, 10))
+
+        backend_cache.set('test:lock', 'other')
+        self.assertFalse(self.cache.extend_lock('test:lock', token, 10))
+        self.cache.release_lock('test:lock', token)
+        self.assertEqual(backend_cache.get('test:lock'), 'other')
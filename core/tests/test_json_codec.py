@@ -0,0 +1,86 @@
+from datetime import datetime
+from io import BytesIO
+from unittest import skipIf
+from unittest.mock import patch
+from django.test.testcases import SimpleTestCase
+from rest_framework.exceptions import ParseError
+
+from core.json_codec import StdlibJSONCodec, OrjsonCodec, get_codec, orjson
+from core.parsers import JSONParser
+from core.renderers import JSONRenderer
+
+
+class JSONCodecMixin:
+    codec_class = StdlibJSONCodec
+
+    def setUp(self) -> None:
+        self.codec = self.codec_class()
+        self.data = {'id': 1, 'text': 'سلام', 'tags': ['a', None],
+                     'ranks': {2: 'A'}, 'ok': True}
+
+    def test_dumps(self):
+        self.assertEqual(
+            self.codec.dumps(self.data),
+            '{"id":1,"text":"سلام","tags":["a",null],'
+            '"ranks":{"2":"A"},"ok":true}')
+        self.assertEqual(self.codec.dumps_bytes(self.data),
+                         self.codec.dumps(self.data).encode())
+
+    def test_loads(self):
+        text = self.codec.dumps(self.data)
+        self.assertEqual(self.codec.loads(text),
+                         {**self.data, 'ranks': {'2': 'A'}})
+        self.assertEqual(self.codec.loads(text.encode()),
+                         self.codec.loads(text))
+        with self.assertRaises(ValueError):
+            self.codec.loads('{"id": ')
+
+    def test_loads_non_finite(self):
+        for constant in ('NaN', 'Infinity', '-Infinity'):
+            with self.assertRaises(ValueError):
+                self.codec.loads(f'{{"id": {constant}}}')
+
+    def test_default(self):
+        date = datetime(2022, 1, 2)
+        with self.assertRaises(TypeError):
+            self.codec.dumps({'date': date})
+        self.assertEqual(self.codec.dumps([date], default=str),
+                         '["2022-01-02 00:00:00"]')
+
+
+class StdlibJSONCodecTest(JSONCodecMixin, SimpleTestCase):
+    pass
+
+
+@skipIf(orjson is None, "orjson isn't installed")
+class OrjsonCodecTest(JSONCodecMixin, SimpleTestCase):
+    codec_class = OrjsonCodec
+
+
+class RestJSONTest(SimpleTestCase):
+    def test_get_codec(self):
+        self.assertIsInstance(get_codec('json'), StdlibJSONCodec)
+
+    def test_render(self):
+        data = {'text': 'a\u2028b', 'date': datetime(2022, 1, 2, 3, 4, 5)}
+        self.assertEqual(
+            JSONRenderer().render(data),
+            b'{"text":"a\\u2028b","date":"2022-01-02T03:04:05"}')
+        self.assertEqual(JSONRenderer().render(None), b'')
+
+    def test_render_indented(self):
+        self.assertEqual(
+            JSONRenderer().render({'id': 1}, 'application/json; indent=2'),
+            b'{\n  "id": 1\n}')
+
+    def test_parse(self):
+        parse = JSONParser().parse
+        self.assertEqual(parse(BytesIO('{"text": "سلام"}'.encode())),
+                         {'text': 'سلام'})
+        with self.assertRaises(ParseError):
+            parse(BytesIO(b'{"text": '))
+
+    def test_parse_non_finite(self):
+        with patch('core.parsers.codec', StdlibJSONCodec()):
+            with self.assertRaises(ParseError):
+                JSONParser().parse(BytesIO(b'{"number": NaN}'))
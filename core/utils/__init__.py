@@ -2,6 +2,6 @@ from .generators import generate_email
 from .tasks_helper import check_task_failed
 from .func_helper import delete_instance_on_error
 from .general import get_list_of_dict_values
-from .model_helper import get_field, get_field_attr, count_field
+from .model_helper import get_field, get_field_attr, count_field, SubqueryCount
 from .instance_helper import get_chat_content_type
 from .serializer_helper import get_context_user
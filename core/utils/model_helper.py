@@ -1,5 +1,5 @@
 from typing import Any, Optional, Type
-from django.db.models import Model, Field
+from django.db.models import Model, Field, Count, IntegerField, QuerySet, Subquery
 
 
 def get_field(model: Type[Model], field_name: str
@@ -27,3 +27,21 @@ def count_field(instance: Type[Model], field: str) -> int:
     if count is None:
         count = getattr(instance, field).count()
     return count
+
+
+class SubqueryCount(Subquery):
+    """
+    Count rows of `queryset` in a correlated subquery, e.g.
+    `SubqueryCount(DeletedMessage.objects.filter(message=OuterRef('pk')), 'message')`.
+    `field` is the field that `queryset` is filtered by.
+
+    Unlike `Count()` it doesn't join and group the whole related table,
+    and is only evaluated for rows that are returned.
+    """
+    template = "COALESCE((%(subquery)s), 0)"
+    output_field = IntegerField()
+
+    def __init__(self, queryset: QuerySet, field: str, **kwargs):
+        queryset = queryset.order_by().values(field)\
+            .annotate(_count=Count('pk')).values('_count')
+        super().__init__(queryset, **kwargs)
@@ -1 +1,2 @@
 from .generic_consumer import GenericConsumer
+from .async_generic_consumer import AsyncGenericConsumer
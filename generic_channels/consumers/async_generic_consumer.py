@@ -0,0 +1,142 @@
+import logging
+from typing import Awaitable, Callable, Optional, Union
+from dotmap import DotMap
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from channels.exceptions import DenyConnection
+from rest_framework.exceptions import APIException
+
+from core.json_codec import codec
+from generic_channels.serializers import ConsumerContentSerializer
+from ..exceptions import ConsumerException
+from ..frames import pack, unpack
+from ..mixins import AsyncChannelGroupsMixin, AsyncDefaultEventsMixin
+from .base_consumer import BaseGenericConsumer
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncGenericConsumer(BaseGenericConsumer, AsyncChannelGroupsMixin,
+                           AsyncDefaultEventsMixin, AsyncJsonWebsocketConsumer):
+    '''
+    Async version of `GenericConsumer` with the same actions,
+    permissions and `@options` contract.
+
+    Action methods should be coroutines. query params validation and
+    permission checks of an action run together in one
+    `database_sync_to_async` call, and action methods should do their
+    ORM work in one `database_sync_to_async` call too, e.g.:
+    ```
+    async def action_chat_send(self, content, action, *args, **kwargs):
+        data = await database_sync_to_async(self.create_chat)(content)
+        await self.success(content, data)
+    ```
+    '''
+
+    async def error(self, detail: Union[str, dict] = None):
+        """Send error message to client"""
+        await self.send_json({
+            "status": "error",
+            "detail": detail or self.default_error_messages.get('unexpected', '')
+        })
+
+    async def success(self, content, detail: Union[str, dict] = None):
+        """Send success message to client"""
+
+        await self.send_json({
+            'action': content.get("action"),
+            "status": "success",
+            "detail": detail or None
+        })
+
+    async def __handle_exception(self, func: Callable[..., Awaitable],
+                                 *fargs, **fkwargs) -> bool:
+        """
+        Await function and handle some exceptions.
+        returns True if no exceptions raised
+        """
+        try:
+            await func(*fargs, **fkwargs)
+            return True
+        except (APIException, ConsumerException) as e:
+            await self.error(e.detail)
+        except Exception as e:
+            logger.exception("Unexpected error in %s",
+                             self.__class__.__name__)
+            await self.error(self.default_error_messages.get("unexpected"))
+            raise e
+
+    async def connect(self):
+        await self.accept(self.select_subprotocol())
+        if not await self.__handle_exception(
+            database_sync_to_async(self.has_permissions),
+            self.GlobalActions.CONNECT, {}
+        ):
+            await self.close(1008)
+            raise DenyConnection()
+
+    async def close(self, code=None):
+        return await super().close(code)
+
+    async def validate_received_content(self, content) -> Optional[dict]:
+        """Validate json content with serializer"""
+        serializer = ConsumerContentSerializer(data=content)
+        if not serializer.is_valid():
+            return await self.error(serializer.errors)
+        return serializer.validated_data
+
+    @classmethod
+    async def decode_json(cls, text_data):
+        return codec.loads(text_data)
+
+    @classmethod
+    async def encode_json(cls, content):
+        return codec.dumps(content)
+
+    async def send_json(self, content, close=False):
+        """Encode `content` in frame format of connection and send it"""
+        if self.binary_frames:
+            await self.send(bytes_data=pack(content), close=close)
+        else:
+            await super().send_json(content, close)
+
+    async def receive(self, text_data=None, bytes_data=None, **kwargs):
+        """
+        Validates text data, or MessagePack data if connection's frames
+        are binary, and calls `self.receive_json` with validated data
+        """
+        if text_data:
+            content = await self.decode_json(text_data)
+        elif bytes_data and self.binary_frames:
+            try:
+                content = unpack(bytes_data)
+            except ValueError:
+                return await self.error(
+                    self.default_error_messages.get('invalid_frame'))
+        else:
+            raise ValueError("No text section for incoming WebSocket frame!")
+
+        content = await self.validate_received_content(content)
+        if content:
+            content = DotMap(content)
+            await self.receive_json(content, **kwargs)
+
+    async def receive_json(self, content: dict, **kwargs):
+        """
+        Receives validated json data from client
+        and calls the action method
+        """
+        await self.__handle_exception(
+            self.call_action_method, content
+        )
+
+    async def call_action_method(self, content: dict):
+        """Await action method with `content` as first argument
+        if action found else send not found message to client"""
+
+        method, action = self.get_action_method(content)
+        if method is None:
+            self.fail('action_404')
+        await database_sync_to_async(self.check_action)(
+            content, action, method)
+        await method(content, action=action)
@@ -0,0 +1,259 @@
+import re
+from typing import Callable, Optional
+from dotmap import DotMap
+from django.utils.translation import gettext as _
+
+from ..exceptions import PermissionDenied, ValidationError
+from ..frames import (CHANNELS_MSGPACK_FRAMES, JSON_SUBPROTOCOL,
+                      MSGPACK_SUBPROTOCOL)
+
+
+class BaseGenericConsumer:
+    '''
+    Shared logic of `GenericConsumer` and `AsyncGenericConsumer`.
+    Nothing in this class sends data to client or calls channel layer,
+    so it can be used in both sync and async consumers.
+    '''
+    class GlobalActions:
+        CONNECT = '__connect__'
+        EVENT = '__event__'
+    __default_error_messages = {
+        'unexpected': _("An unexpected error occured"),
+        "action_404": _("Action not found"),
+        "404": "{item} Not found",
+        "invalid_frame": _("Invalid MessagePack frame"),
+    }
+    default_error_messages = {}
+    permission_classes = []
+    serializer_class = None
+    filter_query_lookup = 'pk'
+    subprotocols = ((MSGPACK_SUBPROTOCOL, JSON_SUBPROTOCOL)
+                    if CHANNELS_MSGPACK_FRAMES else (JSON_SUBPROTOCOL,))
+    """Frame formats that client can choose by websocket subprotocols"""
+    binary_frames = False
+    action_memo_attrs = ('_member_ranks',)
+    """Attributes that permissions memoize values of an action in,
+    they're cleared before every action"""
+
+    __scope = None
+
+    @property
+    def scope(self):
+        return self.__scope
+
+    @scope.setter
+    def scope(self, value):
+        self.__scope = DotMap(value)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_error_messages = (
+            self.__default_error_messages
+            | self.default_error_messages
+        )
+
+    def select_subprotocol(self) -> Optional[str]:
+        """
+        Return first subprotocol of client that is in `subprotocols`
+        and set `binary_frames` if it's MessagePack
+        """
+        for subprotocol in self.scope.get('subprotocols') or ():
+            if subprotocol in self.subprotocols:
+                self.binary_frames = subprotocol == MSGPACK_SUBPROTOCOL
+                return subprotocol
+        return None
+
+    def fail(self, detail_key: str = None,
+             detail: str = None, action=None, *fargs, **fkwargs):
+        """
+        Raise `ValidationError` with either `detail_key` that found in
+        `default_error_messages` or `detail` string
+        """
+        _kwargs = [detail, detail_key]
+        assert not all(_kwargs) and any(_kwargs), (
+            "You should set only one of `detail` or `detail_key` kwargs "
+            f"in `{self.__class__.__name__}`"
+        )
+        if detail_key:
+            detail = self.default_error_messages.get(detail_key, None)
+            assert detail is not None, (
+                f"detail_key of `{detail_key}` not found in "
+                f"`default_error_messages` of `{self.__class__.__name__}`"
+            )
+            detail = detail.format(*fargs, **fkwargs)
+        raise ValidationError(detail=detail, action=action)
+
+    def get_action(self, content: dict) -> Optional[str]:
+        """Return the validated action of content
+
+        e.g.: ChaT.message -> chat_message"""
+
+        return content.get('action', '')\
+            .replace('.', '_').lower()
+
+    def get_action_method(self, content: dict) -> tuple[Optional[Callable], Optional[str]]:
+        """Return action method if found. if action was `chat_send`, then
+        `action_chat_send` will be called.
+
+        Returns tuple of `(method:callable|None, action:str|None)`
+        """
+        method = None
+        action = self.get_action(content)
+        if action:
+            action_method_name = f"action_{action}"
+            method = getattr(self, action_method_name, None)
+        return (method, action)
+
+    def check_action(self, content: dict, action: str,
+                     action_method: Callable):
+        """Validate query params of action and check permissions"""
+        self.clear_action_memos()
+        self.validate_action_query_params(content, action, action_method)
+        self.has_permissions(action, content)
+
+    def clear_action_memos(self):
+        """Remove values that are memoized for previous action"""
+        for attr in self.action_memo_attrs:
+            self.__dict__.pop(attr, None)
+
+    def validate_action_query_params(self, content, action, action_method: Callable):
+        """
+        Validate query params that exist in content's query key
+        by `query_params` that set in `@options` decorator
+        """
+        q_params = getattr(action_method, 'query_params', None)
+        if not q_params:
+            return
+        errors = {}
+        depends = {}
+        q_content = content.query
+        for k, v in q_params.items():
+            if k not in q_content:
+                errors[k] = f'should be in query data'
+                continue
+
+            if (kregex := v.get("regex")):
+                if not re.match(kregex, str(q_content[k])):
+                    errors[k] = f'isn\'t a valid value'
+                    continue
+
+            if (ktype := v.get('type')):
+                try:
+                    val = ktype(q_content[k])
+                    q_content[k] = val
+                except ValueError:
+                    errors[k] = f'isn\'t a valid value'
+                    continue
+
+            if (kvalidator := v.get('validator')):
+                stats, val = kvalidator(q_content[k], self)
+                if not stats:
+                    errors[k] = val
+                    continue
+                q_content[k] = val
+
+            if (queryset := v.get('queryset')):
+                lookup = v.get('lookup') or self.filter_query_lookup
+                qs = queryset.filter(**{lookup: q_content[k]})
+                if (v_depends := v.get('depends')):
+                    depends[k] = {'qs': qs, 'depends': v_depends}
+                else:
+                    if not self.__validate_queryset_q_content(
+                            action, content, q_content, errors, qs, k
+                    ):
+                        continue
+        if not errors and depends:
+            for k, v in depends.items():
+
+                qs = v["qs"]
+                for lookup in v['depends']:
+                    qs = qs.filter(**{lookup: q_content.get(lookup)})
+
+                if not self.__validate_queryset_q_content(
+                    action, content, q_content, errors, qs, k
+                ):
+                    continue
+
+        if errors:
+            self.fail(detail=errors, action=action)
+
+    def __validate_queryset_q_content(self, action, content, q_content, errors,
+                                      queryset, key) -> bool:
+        if not queryset.exists():
+            errors[key] = f'not found'
+            return False
+
+        obj = queryset.first()
+        self.has_object_permissions(action, content, obj)
+
+        q_content[f"{key}_queryset"] = queryset
+        q_content[f"{key}_object"] = obj
+        return True
+
+    def permission_denied(self, detail=None, action=None):
+        """Raise `PermissionDenied` exception"""
+        raise PermissionDenied(detail=detail, action=action)
+
+    def get_permissions(self, action: str, content: dict) -> list:
+        """Return list of permissions"""
+        return [permission() for permission in self.permission_classes]
+
+    def has_permissions(self, action: str, content: dict):
+        """Check for all permissions are allowed"""
+        perms = self.get_permissions(action, content)
+        if perms:
+            for perm in perms:
+                if not perm.has_permission((content | self.scope), self):
+                    self.permission_denied(action=action)
+
+    def has_object_permissions(self, action: str, content: dict, obj):
+        """Check for all object permissions are allowed"""
+        perms = self.get_permissions(action, content)
+        if perms:
+            for perm in perms:
+                if not perm.has_object_permission((content | self.scope), self, obj):
+                    self.permission_denied(action=action)
+
+    def get_serializer_context(self, action, content):
+        """Return serializer's context"""
+
+        return {
+            'user': self.scope.user,
+            'scope': self.scope,
+            'consumer': self,
+
+            # Added for compability with drf view serializers
+            'request': self.scope,
+            'view': self,
+        }
+
+    def get_serializer(self, action, content, *serializer_args,
+                       **serializer_kwargs):
+        """Call & return serializer"""
+
+        serializer = self.get_serializer_class(action, content)
+        if serializer:
+            serializer_kwargs.setdefault(
+                "context", self.get_serializer_context(action, content)
+            )
+            return serializer(*serializer_args, **serializer_kwargs)
+
+    def get_serializer_class(self, action, content):
+        """Return serializer class"""
+
+        serializer = self.serializer_class
+        assert serializer is not None, (
+            "You have to set `serializer_class` attr or "
+            "override `get_serializer` method in `%s` class"
+            % self.__class__.__name__
+        )
+
+        return serializer
+
+    def validate_serializer(self, serializer, action=None):
+        """
+        Calls `.is_valid` method of serializer
+        and raises exception if serializer isn't valid
+        """
+        if not serializer.is_valid():
+            raise ValidationError(serializer.errors, action=action)
@@ -1,19 +1,22 @@
-import re
-from traceback import print_tb
+import logging
 from typing import Callable, Optional, Union
 from dotmap import DotMap
-from django.utils.translation import gettext as _
 from channels.generic.websocket import JsonWebsocketConsumer
 from channels.exceptions import DenyConnection
 from rest_framework.exceptions import APIException
 
+from core.json_codec import codec
 from generic_channels.serializers import ConsumerContentSerializer
-from ..exceptions import ConsumerException, PermissionDenied, ValidationError
+from ..exceptions import ConsumerException
+from ..frames import pack, unpack
 from ..mixins import ChannelGroupsMixin, DefaultEventsMixin
+from .base_consumer import BaseGenericConsumer
 
+logger = logging.getLogger(__name__)
 
-class GenericConsumer(ChannelGroupsMixin, DefaultEventsMixin,
-                      JsonWebsocketConsumer):
+
+class GenericConsumer(BaseGenericConsumer, ChannelGroupsMixin,
+                      DefaultEventsMixin, JsonWebsocketConsumer):
     '''
     Sent data by user should look like this example:
     ```
@@ -24,35 +27,6 @@ class GenericConsumer(ChannelGroupsMixin, DefaultEventsMixin,
     }
     ```
     '''
-    class GlobalActions:
-        CONNECT = '__connect__'
-        EVENT = '__event__'
-    __default_error_messages = {
-        'unexpected': _("An unexpected error occured"),
-        "action_404": _("Action not found"),
-        "404": "{item} Not found",
-    }
-    default_error_messages = {}
-    permission_classes = []
-    serializer_class = None
-    filter_query_lookup = 'pk'
-
-    __scope = None
-
-    @property
-    def scope(self):
-        return self.__scope
-
-    @scope.setter
-    def scope(self, value):
-        self.__scope = DotMap(value)
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.default_error_messages = (
-            self.__default_error_messages
-            | self.default_error_messages
-        )
 
     def error(self, detail: Union[str, dict] = None):
         """Send error message to client"""
@@ -61,26 +35,6 @@ class GenericConsumer(ChannelGroupsMixin, DefaultEventsMixin,
             "detail": detail or self.default_error_messages.get('unexpected', '')
         })
 
-    def fail(self, detail_key: str = None,
-             detail: str = None, action=None, *fargs, **fkwargs):
-        """
-        Call `.error()` method with either `detail_key` that found in 
-        `default_error_messages` or `detail` string and raises exception
-        """
-        _kwargs = [detail, detail_key]
-        assert not all(_kwargs) and any(_kwargs), (
-            "You should set only one of `detail` or `detail_key` kwargs "
-            f"in `{self.__class__.__name__}`"
-        )
-        if detail_key:
-            detail = self.default_error_messages.get(detail_key, None)
-            assert detail is not None, (
-                f"detail_key of `{detail_key}` not found in "
-                f"`default_error_messages` of `{self.__class__.__name__}`"
-            )
-            detail = detail.format(*fargs, **fkwargs)
-        raise ValidationError(detail=detail, action=action)
-
     def success(self, content, detail: Union[str, dict] = None):
         """Send success message to client"""
 
@@ -101,13 +55,13 @@ class GenericConsumer(ChannelGroupsMixin, DefaultEventsMixin,
         except (APIException, ConsumerException) as e:
             self.error(e.detail)
         except Exception as e:
-            print_tb(e.__traceback__)
-            print(e)
+            logger.exception("Unexpected error in %s",
+                             self.__class__.__name__)
             self.error(self.default_error_messages.get("unexpected"))
             raise e
 
     def connect(self):
-        super().connect()
+        self.accept(self.select_subprotocol())
         if not self.__handle_exception(
             self.has_permissions,
             self.GlobalActions.CONNECT, {}
@@ -125,21 +79,42 @@ class GenericConsumer(ChannelGroupsMixin, DefaultEventsMixin,
             return self.error(serializer.errors)
         return serializer.validated_data
 
+    @classmethod
+    def decode_json(cls, text_data):
+        return codec.loads(text_data)
+
+    @classmethod
+    def encode_json(cls, content):
+        return codec.dumps(content)
+
+    def send_json(self, content, close=False):
+        """Encode `content` in frame format of connection and send it"""
+        if self.binary_frames:
+            self.send(bytes_data=pack(content), close=close)
+        else:
+            super().send_json(content, close)
+
     def receive(self, text_data=None, bytes_data=None, **kwargs):
         """
-        Validates text data and calls 
-        `self.receive_json` with validated data
+        Validates text data, or MessagePack data if connection's frames
+        are binary, and calls `self.receive_json` with validated data
         """
         if text_data:
-            content = self.validate_received_content(
-                self.decode_json(text_data)
-            )
-            if content:
-                content = DotMap(content)
-                self.receive_json(content, **kwargs)
+            content = self.decode_json(text_data)
+        elif bytes_data and self.binary_frames:
+            try:
+                content = unpack(bytes_data)
+            except ValueError:
+                return self.error(
+                    self.default_error_messages.get('invalid_frame'))
         else:
             raise ValueError("No text section for incoming WebSocket frame!")
 
+        content = self.validate_received_content(content)
+        if content:
+            content = DotMap(content)
+            self.receive_json(content, **kwargs)
+
     def receive_json(self, content: dict, **kwargs):
         """
         Receives validated json data from client
@@ -149,27 +124,6 @@ class GenericConsumer(ChannelGroupsMixin, DefaultEventsMixin,
             self.call_action_method, content
         )
 
-    def get_action(self, content: dict) -> Optional[str]:
-        """Return the validated action of content
-
-        e.g.: ChaT.message -> chat_message"""
-
-        return content.get('action', '')\
-            .replace('.', '_').lower()
-
-    def get_action_method(self, content: dict) -> tuple[Optional[Callable], Optional[str]]:
-        """Return action method if found. if action was `chat_send`, then 
-        `action_chat_send` will be called.
-
-        Returns tuple of `(method:callable|None, action:str|None)`
-        """
-        method = None
-        action = self.get_action(content)
-        if action:
-            action_method_name = f"action_{action}"
-            method = getattr(self, action_method_name, None)
-        return (method, action)
-
     def call_action_method(self, content: dict):
         """Call action method with `content` as first argument
         if action found else send not found message to client"""
@@ -177,148 +131,5 @@ class GenericConsumer(ChannelGroupsMixin, DefaultEventsMixin,
         method, action = self.get_action_method(content)
         if method is None:
             self.fail('action_404')
-        self.validate_action_query_params(content, action, method)
-        self.has_permissions(action, content)
+        self.check_action(content, action, method)
         method(content, action=action)
-
-    def validate_action_query_params(self, content, action, action_method: Callable):
-        """
-        Validate query params that exist in content's query key 
-        by `query_params` that set in `@options` decorator
-        """
-        q_params = getattr(action_method, 'query_params', None)
-        if not q_params:
-            return
-        errors = {}
-        depends = {}
-        q_content = content.query
-        for k, v in q_params.items():
-            if k not in q_content:
-                errors[k] = f'should be in query data'
-                continue
-
-            if (kregex := v.get("regex")):
-                if not re.match(kregex, str(q_content[k])):
-                    errors[k] = f'isn\'t a valid value'
-                    continue
-
-            if (ktype := v.get('type')):
-                try:
-                    val = ktype(q_content[k])
-                    q_content[k] = val
-                except ValueError:
-                    errors[k] = f'isn\'t a valid value'
-                    continue
-
-            if (kvalidator := v.get('validator')):
-                stats, val = kvalidator(q_content[k], self)
-                if not stats:
-                    errors[k] = val
-                    continue
-                q_content[k] = val
-
-            if (queryset := v.get('queryset')):
-                lookup = v.get('lookup') or self.filter_query_lookup
-                qs = queryset.filter(**{lookup: q_content[k]})
-                if (v_depends := v.get('depends')):
-                    depends[k] = {'qs': qs, 'depends': v_depends}
-                else:
-                    if not self.__validate_queryset_q_content(
-                            action, content, q_content, errors, qs, k
-                    ):
-                        continue
-        if not errors and depends:
-            for k, v in depends.items():
-
-                qs = v["qs"]
-                for lookup in v['depends']:
-                    qs = qs.filter(**{lookup: q_content.get(lookup)})
-
-                if not self.__validate_queryset_q_content(
-                    action, content, q_content, errors, qs, k
-                ):
-                    continue
-
-        if errors:
-            self.fail(detail=errors, action=action)
-
-    def __validate_queryset_q_content(self, action, content, q_content, errors,
-                                      queryset, key) -> bool:
-        if not queryset.exists():
-            errors[key] = f'not found'
-            return False
-
-        obj = queryset.first()
-        self.has_object_permissions(action, content, obj)
-
-        q_content[f"{key}_queryset"] = queryset
-        q_content[f"{key}_object"] = obj
-        return True
-
-    def permission_denied(self, detail=None, action=None):
-        """Raise `PermissionDenied` exception"""
-        raise PermissionDenied(detail=detail, action=action)
-
-    def get_permissions(self, action: str, content: dict) -> list:
-        """Return list of permissions"""
-        return [permission() for permission in self.permission_classes]
-
-    def has_permissions(self, action: str, content: dict):
-        """Check for all permissions are allowed"""
-        perms = self.get_permissions(action, content)
-        if perms:
-            for perm in perms:
-                if not perm.has_permission((content | self.scope), self):
-                    self.permission_denied(action=action)
-
-    def has_object_permissions(self, action: str, content: dict, obj):
-        """Check for all object permissions are allowed"""
-        perms = self.get_permissions(action, content)
-        if perms:
-            for perm in perms:
-                if not perm.has_object_permission((content | self.scope), self, obj):
-                    self.permission_denied(action=action)
-
-    def get_serializer_context(self, action, content):
-        """Return serializer's context"""
-
-        return {
-            'user': self.scope.user,
-            'scope': self.scope,
-            'consumer': self,
-
-            # Added for compability with drf view serializers
-            'request': self.scope,
-            'view': self,
-        }
-
-    def get_serializer(self, action, content, *serializer_args,
-                       **serializer_kwargs):
-        """Call & return serializer"""
-
-        serializer = self.get_serializer_class(action, content)
-        if serializer:
-            serializer_kwargs.setdefault(
-                "context", self.get_serializer_context(action, content)
-            )
-            return serializer(*serializer_args, **serializer_kwargs)
-
-    def get_serializer_class(self, action, content):
-        """Return serializer class"""
-
-        serializer = self.serializer_class
-        assert serializer is not None, (
-            "You have to set `serializer_class` attr or "
-            "override `get_serializer` method in `%s` class"
-            % self.__class__.__name__
-        )
-
-        return serializer
-
-    def validate_serializer(self, serializer, action=None):
-        """
-        Calls `.is_valid` method of serializer
-        and raises exception if serializer isn't valid
-        """
-        if not serializer.is_valid():
-            raise ValidationError(serializer.errors, action=action)
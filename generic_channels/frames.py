@@ -0,0 +1,59 @@
+import msgpack
+from django.conf import settings
+
+from core.json_codec import codec
+
+JSON_SUBPROTOCOL = 'json'
+MSGPACK_SUBPROTOCOL = 'msgpack'
+"""Frames of connection are binary MessagePack if client chose it"""
+
+CHANNELS_MSGPACK_FRAMES = getattr(settings, 'CHANNELS_MSGPACK_FRAMES', False)
+"""Clients can choose MessagePack frames only if it's enabled"""
+
+
+def pack(content) -> bytes:
+    """Encode `content` as a MessagePack frame"""
+    return msgpack.packb(content)
+
+
+def unpack(data: bytes):
+    """Decode MessagePack frame, raises `ValueError` for invalid data"""
+    return msgpack.unpackb(data)
+
+
+def splice_json(text: str, **fields) -> str:
+    """Add `fields` to end of encoded JSON object `text`
+    without decoding it"""
+    extra = codec.dumps(fields)[1:-1]
+    if text == '{}':
+        return f'{{{extra}}}'
+    return f'{text[:-1]},{extra}}}'
+
+
+def _read_map_header(data: bytes) -> tuple[int, int]:
+    """Return size of MessagePack map and length of its header"""
+    first = data[0]
+    if first & 0xf0 == 0x80:
+        return first & 0x0f, 1
+    if first == 0xde:
+        return int.from_bytes(data[1:3], 'big'), 3
+    if first == 0xdf:
+        return int.from_bytes(data[1:5], 'big'), 5
+    raise ValueError("Data isn't a MessagePack map")
+
+
+def splice_msgpack(data: bytes, **fields) -> bytes:
+    """Add `fields` to end of encoded MessagePack map `data`
+    without decoding it, only its header is rewritten"""
+    size, header_size = _read_map_header(data)
+    extra = pack(fields)
+    size += len(fields)
+
+    if size < 0x10:
+        header = bytes((0x80 | size,))
+    elif size < 0x10000:
+        header = b'\xde' + size.to_bytes(2, 'big')
+    else:
+        header = b'\xdf' + size.to_bytes(4, 'big')
+    return b''.join((header, data[header_size:],
+                     extra[_read_map_header(extra)[1]:]))
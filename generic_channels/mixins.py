@@ -1,9 +1,41 @@
+import asyncio
 from typing import Callable, Iterable
 from asgiref.sync import async_to_sync
 from channels.exceptions import InvalidChannelLayerError
 
+from core.json_codec import codec
+from .frames import splice_json, splice_msgpack
 
-class ChannelGroupsMixin:
+
+async def _add_groups(consumer, group_names: list[str],
+                      batch_size: int):
+    """Add channel to `group_names` by concurrent `group_add` calls,
+    at most `batch_size` calls at a time"""
+    layer = consumer.channel_layer
+    for i in range(0, len(group_names), batch_size):
+        await asyncio.gather(*(
+            layer.group_add(name, consumer.channel_name)
+            for name in group_names[i:i + batch_size]
+        ))
+
+
+class GroupsSetMixin:
+    """Keeps joined groups of consumer in a set"""
+    groups_join_batch_size = 100
+    """Max number of concurrent `group_add` calls of `groups_join`"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.groups = set(self.groups or ())
+
+    def _get_new_groups(self, group_names: Iterable[str]) -> list[str]:
+        """Return names of groups that channel hasn't joined, without
+        duplicates"""
+        return [name for name in dict.fromkeys(map(str, group_names))
+                if name not in self.groups]
+
+
+class ChannelGroupsMixin(GroupsSetMixin):
     def __call_layer(self, func: Callable, *fargs, **fkwargs):
         """
         Call channel_layer methods in synchronous mode
@@ -23,7 +55,7 @@ class ChannelGroupsMixin:
             return
         self.__call_layer(self.channel_layer.group_add,
                           group_name, self.channel_name)
-        self.groups.append(group_name)
+        self.groups.add(group_name)
 
     def group_leave(self, group_name: str):
         """Remove channel from a group"""
@@ -32,12 +64,16 @@ class ChannelGroupsMixin:
             return
         self.__call_layer(self.channel_layer.group_discard,
                           group_name, self.channel_name)
-        self.groups.remove(group_name)
+        self.groups.discard(group_name)
 
     def groups_join(self, group_names: Iterable[str]):
-        """Join channel to list of groups"""
-        for group in group_names:
-            self.group_join(group)
+        """Join channel to list of groups, `group_add` calls are
+        sent concurrently instead of one round-trip per group"""
+        group_names = self._get_new_groups(group_names)
+        if group_names:
+            self.__call_layer(_add_groups, self, group_names,
+                              self.groups_join_batch_size)
+            self.groups.update(group_names)
 
 
 class DefaultEventsMixin:
@@ -50,8 +86,22 @@ class DefaultEventsMixin:
         # BIG LESSON: Never remove "type" key from event!
         # event.pop("type", None)
 
-        event['action'] = self.GlobalActions.EVENT
-        self.send_json({k: v for k, v in event.items() if k != 'type'})
+        # Pre-encoded by sender, only 'action' is added
+        action = self.GlobalActions.EVENT
+        if self.binary_frames and 'bytes' in event:
+            self.send(bytes_data=splice_msgpack(event['bytes'],
+                                                action=action))
+        elif 'text' in event:
+            if self.binary_frames:
+                # Sender didn't encode it as MessagePack
+                self.send_json({**codec.loads(event['text']),
+                                'action': action})
+            else:
+                self.send(text_data=splice_json(event['text'],
+                                                action=action))
+        else:
+            event['action'] = action
+            self.send_json({k: v for k, v in event.items() if k != 'type'})
 
     def event_group_join(self, event):
         """Add consumer to given group"""
@@ -64,3 +114,81 @@ class DefaultEventsMixin:
 
         if(name := event.get('group_name')):
             self.group_leave(name)
+
+
+class AsyncChannelGroupsMixin(GroupsSetMixin):
+    async def __call_layer(self, func: Callable, *fargs, **fkwargs):
+        """
+        Await channel_layer methods and check for errors
+        """
+        try:
+            return await func(*fargs, **fkwargs)
+        except AttributeError:
+            raise InvalidChannelLayerError(
+                "BACKEND is unconfigured or doesn't support groups"
+            )
+
+    async def group_join(self, group_name: str):
+        """Join channel to a group"""
+        group_name = str(group_name)
+        if group_name in self.groups:
+            return
+        await self.__call_layer(self.channel_layer.group_add,
+                                group_name, self.channel_name)
+        self.groups.add(group_name)
+
+    async def group_leave(self, group_name: str):
+        """Remove channel from a group"""
+        group_name = str(group_name)
+        if group_name not in self.groups:
+            return
+        await self.__call_layer(self.channel_layer.group_discard,
+                                group_name, self.channel_name)
+        self.groups.discard(group_name)
+
+    async def groups_join(self, group_names: Iterable[str]):
+        """Join channel to list of groups, `group_add` calls are
+        sent concurrently instead of one round-trip per group"""
+        group_names = self._get_new_groups(group_names)
+        if group_names:
+            await self.__call_layer(_add_groups, self, group_names,
+                                    self.groups_join_batch_size)
+            self.groups.update(group_names)
+
+
+class AsyncDefaultEventsMixin:
+
+    async def event_send_message(self, event):
+        """
+        Set 'action' key to `GlobalActions.EVENT` and
+        send event without 'type' key to client
+        """
+        # Pre-encoded by sender, only 'action' is added
+        action = self.GlobalActions.EVENT
+        if self.binary_frames and 'bytes' in event:
+            await self.send(bytes_data=splice_msgpack(event['bytes'],
+                                                      action=action))
+        elif 'text' in event:
+            if self.binary_frames:
+                # Sender didn't encode it as MessagePack
+                await self.send_json({**codec.loads(event['text']),
+                                      'action': action})
+            else:
+                await self.send(text_data=splice_json(event['text'],
+                                                      action=action))
+        else:
+            event['action'] = action
+            await self.send_json({k: v for k, v in event.items()
+                                  if k != 'type'})
+
+    async def event_group_join(self, event):
+        """Add consumer to given group"""
+
+        if(name := event.get('group_name')):
+            await self.group_join(name)
+
+    async def event_group_leave(self, event):
+        """Remove consumer from given group"""
+
+        if(name := event.get('group_name')):
+            await self.group_leave(name)
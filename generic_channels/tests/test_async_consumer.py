@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.test.testcases import SimpleTestCase
+
+from generic_channels.consumers import AsyncGenericConsumer
+from generic_channels.decorators import options
+from generic_channels.permissions import IsAuthenticated
+
+
+class EchoConsumer(AsyncGenericConsumer):
+    permission_classes = [IsAuthenticated]
+
+    async def action_echo(self, content, action, *args, **kwargs):
+        await self.success(content, content.body.toDict())
+
+    @options(query_params={'number': {'type': int, 'regex': r'^\d+$'}})
+    async def action_number(self, content, action, *args, **kwargs):
+        await self.success(content, content.query.number * 2)
+
+    async def action_crash(self, content, action, *args, **kwargs):
+        raise RuntimeError('crashed')
+
+
+class AsyncGenericConsumerTest(SimpleTestCase):
+    def get_communicator(self, is_authenticated=True):
+        communicator = WebsocketCommunicator(EchoConsumer.as_asgi(), '/ws/')
+        communicator.scope['user'] = SimpleNamespace(
+            is_authenticated=is_authenticated)
+        return communicator
+
+    def run_client(self, func, **kwargs):
+        """Run `func` by a connected communicator"""
+        async def run():
+            communicator = self.get_communicator(**kwargs)
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            try:
+                await func(communicator)
+            finally:
+                await communicator.disconnect()
+        async_to_sync(run)()
+
+    def test_connect_denied(self):
+        async def run():
+            communicator = self.get_communicator(is_authenticated=False)
+            await communicator.connect()
+            response = await communicator.receive_json_from()
+            self.assertEqual(response['status'], 'error')
+            self.assertEqual((await communicator.receive_output())['type'],
+                             'websocket.close')
+        async_to_sync(run)()
+
+    def test_action(self):
+        async def run(communicator):
+            await communicator.send_json_to(
+                {'action': 'echo', 'body': {'text': 'hi'}})
+            self.assertEqual(await communicator.receive_json_from(), {
+                'action': 'echo', 'status': 'success',
+                'detail': {'text': 'hi'}})
+        self.run_client(run)
+
+    def test_query_params(self):
+        async def run(communicator):
+            await communicator.send_json_to(
+                {'action': 'number', 'query': {'number': '21'}})
+            response = await communicator.receive_json_from()
+            self.assertEqual(response['detail'], 42)
+
+            await communicator.send_json_to(
+                {'action': 'number', 'query': {'number': 'a'}})
+            response = await communicator.receive_json_from()
+            self.assertEqual(response['status'], 'error')
+        self.run_client(run)
+
+    def test_action_not_found(self):
+        async def run(communicator):
+            await communicator.send_json_to({'action': 'nothing'})
+            response = await communicator.receive_json_from()
+            self.assertEqual(response['status'], 'error')
+            self.assertEqual(response['detail']['info'], ['Action not found'])
+        self.run_client(run)
+
+    def test_unexpected_error(self):
+        async def run():
+            communicator = self.get_communicator()
+            await communicator.connect()
+            await communicator.send_json_to({'action': 'crash'})
+            with self.assertLogs('generic_channels', 'ERROR') as logs:
+                response = await communicator.receive_json_from()
+            self.assertEqual(response, {
+                'status': 'error', 'detail': 'An unexpected error occured'})
+            self.assertIn('RuntimeError: crashed', logs.output[0])
+
+            # Error is raised again, so the socket is closed
+            with self.assertRaises(RuntimeError):
+                await communicator.wait()
+        async_to_sync(run)()
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.test.testcases import SimpleTestCase
+
+from generic_channels.consumers import GenericConsumer
+from generic_channels.frames import unpack
+from generic_channels.permissions import IsAuthenticated
+
+
+class EchoConsumer(GenericConsumer):
+    permission_classes = [IsAuthenticated]
+
+    def action_echo(self, content, action, *args, **kwargs):
+        self.success(content, content.body.toDict())
+
+    def action_crash(self, content, action, *args, **kwargs):
+        raise RuntimeError('crashed')
+
+
+class GenericConsumerTest(SimpleTestCase):
+    def get_communicator(self) -> WebsocketCommunicator:
+        communicator = WebsocketCommunicator(EchoConsumer.as_asgi(), '/ws/')
+        communicator.scope['user'] = SimpleNamespace(is_authenticated=True)
+        return communicator
+
+    def test_action(self):
+        async def run():
+            communicator = self.get_communicator()
+            await communicator.connect()
+            await communicator.send_json_to(
+                {'action': 'echo', 'body': {'text': 'hi'}})
+            self.assertEqual(await communicator.receive_json_from(), {
+                'action': 'echo', 'status': 'success',
+                'detail': {'text': 'hi'}})
+            await communicator.disconnect()
+        async_to_sync(run)()
+
+    def test_unexpected_error(self):
+        async def run():
+            communicator = self.get_communicator()
+            await communicator.connect()
+            await communicator.send_json_to({'action': 'crash'})
+            with self.assertLogs('generic_channels', 'ERROR') as logs:
+                response = await communicator.receive_json_from()
+            self.assertEqual(response, {
+                'status': 'error', 'detail': 'An unexpected error occured'})
+            self.assertIn('RuntimeError: crashed', logs.output[0])
+
+            # Error is raised again, so the socket is closed
+            with self.assertRaises(RuntimeError):
+                await communicator.wait()
+        async_to_sync(run)()
+
+    def test_receive_invalid_frame(self):
+        sent = []
+        consumer = EchoConsumer()
+        consumer.binary_frames = True
+        consumer.send = lambda bytes_data=None, **kwargs: sent.append(
+            unpack(bytes_data))
+
+        consumer.receive(bytes_data=b'\xc1')
+        self.assertEqual(sent, [{'status': 'error',
+                                 'detail': 'Invalid MessagePack frame'}])
@@ -0,0 +1,38 @@
+from django.db.models import Manager
+from rest_framework import serializers
+
+from global_id.models.mixins import GUIDMixin
+from global_id.models.queryset import prefetch_guids
+
+
+def get_guid_instances(instances: list, serializer) -> list:
+    """
+    Returns `GUIDMixin` objects of `instances` and objects of
+    nested serializers of `serializer` (e.g. `sender` of messages).
+    """
+    found = [obj for obj in instances if isinstance(obj, GUIDMixin)]
+
+    for field in serializer.fields.values():
+        if (not isinstance(field, serializers.Serializer)
+                or field.source == '*' or '.' in field.source):
+            continue
+
+        related = [getattr(obj, field.source, None) for obj in instances]
+        related = [obj for obj in related if obj is not None]
+        if related:
+            found += get_guid_instances(related, field)
+
+    return found
+
+
+class GUIDListSerializer(serializers.ListSerializer):
+    """
+    Resolves `guid` of all items (and nested ones) by `prefetch_guids`
+    before serializing, instead of a cache lookup for every item.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, Manager) else data
+        instances = list(iterable)
+        prefetch_guids(get_guid_instances(instances, self.child))
+        return super().to_representation(instances)
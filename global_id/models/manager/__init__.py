@@ -0,0 +1 @@
+from .guid_manager import GUIDMixinManager
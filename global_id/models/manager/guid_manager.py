@@ -0,0 +1,7 @@
+from django.db.models.manager import BaseManager
+
+from ..queryset import GUIDMixinQuerySet
+
+
+class GUIDMixinManager(BaseManager.from_queryset(GUIDMixinQuerySet)):
+    pass
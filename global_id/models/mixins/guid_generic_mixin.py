@@ -18,11 +18,21 @@ class GUIDMixin(models.Model):
         content_type_field="chat_content_type",
     )
 
-    __cache_key = None
+    @property
+    def __cache_key(self) -> str:
+        return cache.format_key(self.pk, key_name='guid')
+
+    def has_prefetched_guid(self) -> bool:
+        return '_prefetched_guid' in self.__dict__
 
-    def __init__(self, *args, **kwargs) -> None:
-        super().__init__(*args, **kwargs)
-        self.__cache_key = cache.format_key(self.pk, key_name='guid')
+    def set_prefetched_guid(self, guid: Optional[str]):
+        """Keep `guid` that is resolved for a batch of objects,
+        so `guid` property doesn't look it up again"""
+        self._prefetched_guid = guid
+
+    def refresh_from_db(self, *args, **kwargs):
+        self.__dict__.pop('_prefetched_guid', None)
+        return super().refresh_from_db(*args, **kwargs)
 
     def __clean_guid_attrs(self):
         """set new&update guid attrs to None 
@@ -34,6 +44,9 @@ class GUIDMixin(models.Model):
     @property
     def guid(self) -> Optional[str]:
         """Return guid text if exists else None"""
+        if self.has_prefetched_guid():
+            return self._prefetched_guid
+
         g_id = cache.get(self.__cache_key, False)
         if g_id == False:
             g_id = None
@@ -62,9 +75,11 @@ class GUIDMixin(models.Model):
             self.__update_guid = g_id
 
         self.__new_guid_text = new_id
+        self.__dict__.pop('_prefetched_guid', None)
 
     @guid.deleter
     def guid(self):
+        self.__dict__.pop('_prefetched_guid', None)
         cache.delete(self.__cache_key)
         self._guid.all().delete()
 
@@ -0,0 +1 @@
+from .guid_queryset import GUIDMixinQuerySet, prefetch_guids
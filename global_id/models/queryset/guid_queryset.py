@@ -0,0 +1,77 @@
+from collections import defaultdict
+from typing import Iterable
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q, QuerySet
+
+from core.cache import cache
+from global_id.models import GUID
+
+
+def prefetch_guids(instances: Iterable) -> None:
+    """
+    Resolves `guid` of all `instances` (models with `GUIDMixin`) by a
+    single cache `get_many`, and a single query for the ones that
+    aren't cached. Resolved guids are kept on instances.
+    """
+    keys = defaultdict(list)
+    for instance in instances:
+        if (instance is not None and instance.pk is not None
+                and not instance.has_prefetched_guid()):
+            keys[cache.format_key(instance.pk, key_name='guid')]\
+                .append(instance)
+    if not keys:
+        return
+
+    cached = cache.get_many(keys)
+    missing = defaultdict(dict)
+    for key, key_instances in keys.items():
+        for instance in key_instances:
+            if key in cached:
+                instance.set_prefetched_guid(cached[key])
+            else:
+                missing[instance.__class__][instance.pk] = key
+    if not missing:
+        return
+
+    content_types = ContentType.objects.get_for_models(*missing)
+    query = Q()
+    for model, pks in missing.items():
+        query |= Q(chat_content_type=content_types[model], chat_id__in=pks)
+
+    guids = {
+        (ct_id, chat_id): guid for ct_id, chat_id, guid in
+        GUID.objects.filter(query).values_list(
+            'chat_content_type_id', 'chat_id', 'guid')
+    }
+
+    found = {}
+    for model, pks in missing.items():
+        ct_id = content_types[model].pk
+        for pk, key in pks.items():
+            found[key] = guids.get((ct_id, pk))
+            for instance in keys[key]:
+                instance.set_prefetched_guid(found[key])
+    cache.set_many(found)
+
+
+class GUIDMixinQuerySet(QuerySet):
+    _with_guids = False
+
+    def with_guids(self) -> QuerySet:
+        """Resolves `guid` of all fetched objects at once,
+        see `prefetch_guids`"""
+        clone = self._chain()
+        clone._with_guids = True
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._with_guids = self._with_guids
+        return clone
+
+    def _fetch_all(self):
+        fetched = self._result_cache is not None
+        super()._fetch_all()
+        if self._with_guids and not fetched:
+            prefetch_guids(obj for obj in self._result_cache
+                           if hasattr(obj, 'set_prefetched_guid'))
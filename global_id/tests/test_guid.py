@@ -1,11 +1,16 @@
 from django.test.testcases import TestCase
 from django.core.exceptions import ValidationError
-from django.core.cache import cache
+from core.cache import cache
 from rest_framework.test import APITestCase
 from rest_framework import status
 
 from core.tests.mixins import ClearCacheMixin
 from auth_app.tests.utils import create_access
+from conversation.models import Conversation
+from message.serializers import SeenInfoSerializer
+from user.models import User
+from user.serializers import UserInfoSerializer
+from user.tests.utils import create_user
 from .models import FakeChat
 from .utils import (create_guid, GUIDViewCaller,
                     FakeChatViewCaller, create_fake_chat)
@@ -161,3 +166,48 @@ class GUIDCRUDMixinTest(ClearCacheMixin, APITestCase):
         cache.clear()
         fc.refresh_from_db()
         self.assertIsNone(fc.guid)
+
+
+class GUIDPrefetchTest(ClearCacheMixin, TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.users = [create_user() for _ in range(3)]
+        self.guids = [create_guid(obj=user).guid for user in self.users[:2]]
+        self.guids.append(None)
+        cache.clear()
+
+    def get_users(self):
+        return User.objects.filter(pk__in=[u.pk for u in self.users])\
+            .order_by('pk')
+
+    def test_with_guids(self):
+        with self.assertNumQueries(2):
+            users = list(self.get_users().with_guids())
+            self.assertEqual([u.guid for u in users], self.guids)
+
+        # Resolved guids are cached for next lookups
+        with self.assertNumQueries(1):
+            users = list(self.get_users().with_guids())
+            self.assertEqual([u.guid for u in users], self.guids)
+
+    def test_prefetched_guid_is_updated(self):
+        user = self.get_users().with_guids()[0]
+        user.guid = 'updatedguid'
+        user.save()
+        self.assertEqual(user.guid, 'updatedguid')
+
+        del user.guid
+        self.assertIsNone(user.guid)
+
+    def test_list_serializer(self):
+        users = list(self.get_users())
+        with self.assertNumQueries(1):
+            data = UserInfoSerializer(users, many=True).data
+        self.assertEqual([u['guid'] for u in data], self.guids)
+
+    def test_list_serializer_nested(self):
+        seens = [Conversation(user=user, chat_id=1, last_read_id=1)
+                 for user in self.users]
+        with self.assertNumQueries(1):
+            data = SeenInfoSerializer(seens, many=True).data
+        self.assertEqual([s['user']['guid'] for s in data], self.guids)
@@ -10,4 +10,5 @@ class MessageFilter(FilterSet):
             'content_type': ['iexact', 'in'],
             'sender_id': ['exact', 'in'],
             'sent_at': ['gte', 'lte', 'date', 'date__gte', 'date__lte'],
+            'seq': ['exact', 'gt', 'gte', 'lt', 'lte'],
         }
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-18 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('message', '0007_message_forwarded_from'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='deletedmessage',
+            index=models.Index(fields=['user', 'message'], name='deletedmsg_user_message_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['chat_id', 'id', 'is_deleted'], name='message_chat_id_deleted_idx'),
+        ),
+    ]
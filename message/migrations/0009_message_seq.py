@@ -0,0 +1,48 @@
+from django.db import migrations, models
+
+
+def set_message_seqs(apps, schema_editor):
+    Message = apps.get_model('message', 'Message')
+    ChatSequence = apps.get_model('message', 'ChatSequence')
+
+    chat_ids = Message.objects.order_by().values_list(
+        'chat_id', flat=True).distinct()
+    for chat_id in chat_ids.iterator():
+        messages = list(Message.objects.filter(chat_id=chat_id)
+                        .order_by('id').only('id'))
+        for seq, message in enumerate(messages, start=1):
+            message.seq = seq
+        Message.objects.bulk_update(messages, ['seq'], batch_size=1000)
+        ChatSequence.objects.create(chat_id=chat_id, last_seq=len(messages))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('message', '0008_message_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChatSequence',
+            fields=[
+                ('chat_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('last_seq', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='message',
+            name='seq',
+            field=models.PositiveBigIntegerField(editable=False, null=True, help_text='Message number in chat, starts from 1', verbose_name='Sequence'),
+        ),
+        migrations.RunPython(set_message_seqs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='message',
+            name='seq',
+            field=models.PositiveBigIntegerField(editable=False, help_text='Message number in chat, starts from 1', verbose_name='Sequence'),
+        ),
+        migrations.AddConstraint(
+            model_name='message',
+            constraint=models.UniqueConstraint(fields=('chat_id', 'seq'), name='message_chat_seq_unique'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('message', '0009_message_seq'),
+        # Seen messages are moved to conversations read watermark
+        ('conversation', '0006_conversation_last_read_id'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='Seen',
+        ),
+    ]
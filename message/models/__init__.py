@@ -1,4 +1,4 @@
 from .message import Message
 from .text_content import TextContent
 from .deleted_message import DeletedMessage
-from .seen import Seen
+from .chat_sequence import ChatSequence
@@ -0,0 +1,29 @@
+from django.db import models, transaction
+from django.db.models import F
+
+
+class ChatSequenceManager(models.Manager):
+    def allocate(self, chat_id) -> int:
+        """
+        Return next sequence number of `chat_id`.
+
+        Counter row stays locked until current transaction ends, so
+        call it in the transaction that saves the message.
+        """
+        with transaction.atomic():
+            if not self.filter(chat_id=chat_id)\
+                    .update(last_seq=F('last_seq') + 1):
+                self.get_or_create(chat_id=chat_id)
+                self.filter(chat_id=chat_id)\
+                    .update(last_seq=F('last_seq') + 1)
+
+            return self.filter(chat_id=chat_id)\
+                .values_list('last_seq', flat=True).get()
+
+
+class ChatSequence(models.Model):
+    """Last allocated message sequence number of every chat"""
+    objects = ChatSequenceManager()
+
+    chat_id = models.BigIntegerField(primary_key=True)
+    last_seq = models.PositiveBigIntegerField(default=0)
@@ -11,3 +11,9 @@ class DeletedMessage(models.Model):
                              on_delete=models.CASCADE,
                              related_name='deleted_messages')
     deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'message'],
+                         name='deletedmsg_user_message_idx'),
+        ]
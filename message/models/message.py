@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
@@ -7,6 +7,8 @@ from django.contrib.contenttypes.fields import GenericForeignKey
 
 from core.models.mixins import SoftDeleteMixin
 from core.utils import get_chat_content_type
+from conversation.models import Conversation
+from .chat_sequence import ChatSequence
 
 
 class Message(SoftDeleteMixin, models.Model):
@@ -40,6 +42,10 @@ class Message(SoftDeleteMixin, models.Model):
         fk_field="content_id"
     )
 
+    seq = models.PositiveBigIntegerField(
+        _("Sequence"), editable=False,
+        help_text=_("Message number in chat, starts from 1"))
+
     forwarded_from = models.ForeignKey(to='self', on_delete=models.SET_NULL, null=True,
                                        related_name="forwarded_messages")
 
@@ -48,35 +54,40 @@ class Message(SoftDeleteMixin, models.Model):
     edited_at = models.DateTimeField(_("Edited at"), null=True, blank=True,
                                      auto_created=True)
 
+    @property
+    def seen_users(self):
+        """Conversations of users that their read watermark
+        is at or after this message"""
+        return Conversation.objects.filter_seen(
+            self.chat_id, self.pk, self.sender_id)
+
     def save(self, *args, **kwargs):
         if not (self.pk and self.chat_content_type):
             self.chat_content_type = get_chat_content_type(self.chat_id)
 
         if self.is_edited and not self.edited_at:
             self.edited_at = timezone.now()
-        return super().save(*args, **kwargs)
-
-    class Meta:
-        ordering = ['-id']
-
-    # Custom message id for every chat idea :
-    # message_id = models.PositiveBigIntegerField(
-    #     _("Message id"), editable=False,
-    #     auto_created=True, db_index=True)
 
-    # def __set_message_id(self):
-    #     last_msg = self.__class__.objects\
-    #         .only("message_id").filter(
-    #             chat_id=self.chat_id
-    #         ).first()
-    #     self.message_id = (last_msg.message_id+1
-    #                        if last_msg else 1)
+        if self.seq is not None:
+            return super().save(*args, **kwargs)
 
-    # def save(self, *args, **kwargs):
-    #     if not self.message_id:
-    #         self.__set_message_id()
-    #     return super().save(*args, **kwargs)
+        try:
+            with transaction.atomic():
+                self.seq = ChatSequence.objects.allocate(self.chat_id)
+                return super().save(*args, **kwargs)
+        except Exception:
+            self.seq = None
+            raise
 
-    # class Meta:
-    #     unique_together = ["message_id", "chat_id"]
-    #     ordering = ['-message_id']
+    class Meta:
+        ordering = ['-id']
+        constraints = [
+            models.UniqueConstraint(fields=['chat_id', 'seq'],
+                                    name='message_chat_seq_unique'),
+        ]
+        indexes = [
+            # `is_deleted` is after `id`, so messages are read in order
+            # and it's checked from index
+            models.Index(fields=['chat_id', 'id', 'is_deleted'],
+                         name='message_chat_id_deleted_idx'),
+        ]
@@ -1,28 +1,65 @@
-from django.db.models import Q, QuerySet, Count
+from array import array
+from bisect import bisect_left
+from typing import Optional
+from django.conf import settings
+from django.db.models import Case, Exists, F, OuterRef, QuerySet, Value, When
 
 from core.cache import cache
+from core.utils import SubqueryCount
+from conversation.models import Conversation
 from .models import Message, DeletedMessage
 
+UNREAD_RECONCILE_BATCH_SIZE = getattr(settings,
+                                      'UNREAD_RECONCILE_BATCH_SIZE', 1000)
+"""Number of conversations that are recounted in every query"""
+
 
 def get_chat_messages(chat_id, user_id) -> QuerySet:
     """
     returns a queryset of messages that
     isn't deleted by user or others
+
+    Messages that deleted by user are excluded by an anti-join on
+    `(user, message)` index and `seen_users_count` is counted only
+    for returned messages, so cost doesn't grow with chat's history.
+
+    A message is seen by every member that it's read watermark is at or
+    after message, so it's counted from `(chat_id, last_read_id)` index.
     """
 
-    deleted_msgs = DeletedMessage.objects.filter(
-        message__chat_id=chat_id, user_id=user_id
-    ).only('message_id').values_list('message_id')
+    deleted_for_user = DeletedMessage.objects.filter(
+        user_id=user_id, message_id=OuterRef('pk'))
+    seen_users = Conversation.objects.filter_seen(
+        OuterRef('chat_id'), OuterRef('pk'), OuterRef('sender_id'))
 
     return Message.objects.select_related('sender', 'forwarded_from__sender')\
         .prefetch_related('chat', 'content')\
-        .annotate(seen_users_count=Count("seen_users"))\
+        .annotate(seen_users_count=SubqueryCount(seen_users, 'chat_id'))\
         .filter_not_deleted(
-        ~Q(id__in=deleted_msgs),
+        ~Exists(deleted_for_user),
         chat_id=chat_id,
     ).order_by('-id')
 
 
+def get_inbox_conversations(user_id) -> QuerySet:
+    """
+    Returns conversations of user with their last message,
+    `last_message_seen_count` and `last_message_deleted` in one query.
+    """
+    seen_users = Conversation.objects.filter_seen(
+        OuterRef('chat_id'), OuterRef('last_message_id'),
+        OuterRef('last_message__sender_id'))
+    deleted_for_user = DeletedMessage.objects.filter(
+        user_id=user_id, message_id=OuterRef('last_message_id'))
+
+    return Conversation.objects.select_related(
+        'last_message__sender', 'last_message__forwarded_from__sender'
+    ).prefetch_related('last_message__content').annotate(
+        last_message_seen_count=SubqueryCount(seen_users, 'chat_id'),
+        last_message_deleted=Exists(deleted_for_user),
+    ).filter(user_id=user_id)
+
+
 def delete_message(msg_id, user_id) -> tuple[DeletedMessage, bool]:
     """
     Deletes a message for specified user if not deleted already 
@@ -33,15 +70,145 @@ def delete_message(msg_id, user_id) -> tuple[DeletedMessage, bool]:
     )
 
 
-def is_message_deleted(msg_id, user_id) -> bool:
-    """Checks that the `msg_id` is deleted for `user_id`"""
-    cache_key = cache.format_key(key_name='deleted_message',
-                                 msg_id=msg_id,
+def seen_until(message: Message, user_id) -> bool:
+    """
+    Marks all messages of chat until `message` as seen for user,
+    returns `False` if they were seen already.
+
+    `unread_count` of conversation is recounted in the same update,
+    only for messages that are after `message`.
+    """
+    unread_messages = get_unread_messages(
+        message.chat_id, user_id, message.pk)
+    return Conversation.objects.read_until(
+        user_id, message.chat_id, message.pk,
+        unread_count=SubqueryCount(unread_messages, 'chat_id'))
+
+
+def get_unread_messages(chat_id, user_id, last_read_id) -> QuerySet:
+    """
+    Returns messages of chat after `last_read_id` that user didn't send
+    and didn't delete. args can be `OuterRef` to a conversation too.
+    """
+    deleted_for_user = DeletedMessage.objects.filter(
+        user_id=(OuterRef(user_id) if isinstance(user_id, OuterRef)
+                 else user_id),
+        message_id=OuterRef('pk'))
+
+    return Message.objects.filter_not_deleted(
+        ~Exists(deleted_for_user),
+        chat_id=chat_id, id__gt=last_read_id,
+    ).exclude(sender_id=user_id)
+
+
+def get_last_message_id(chat_id) -> Optional[int]:
+    """Returns id of last message of chat that isn't deleted"""
+    return Message.objects.filter_not_deleted(chat_id=chat_id)\
+        .order_by('-id').values_list('id', flat=True).first()
+
+
+def add_chat_message(message: Message):
+    """
+    Sets `message` as last message of chat's conversations and increases
+    `unread_count` of members except sender, in a single update.
+    """
+    def keep_if_newer(field, value):
+        # A newer message may be committed sooner
+        return Case(When(last_message_id__gt=message.pk, then=F(field)),
+                    default=Value(value))
+
+    Conversation.objects.filter(chat_id=message.chat_id).update(
+        last_message_id=keep_if_newer('last_message_id', message.pk),
+        last_activity_at=keep_if_newer('last_activity_at', message.sent_at),
+        unread_count=Case(
+            When(user_id=message.sender_id, then=F('unread_count')),
+            default=F('unread_count') + 1),
+    )
+
+
+def remove_last_message(message: Message):
+    """Sets previous message of chat as last message of conversations
+    that `message` was their last message"""
+    previous_id = Message.objects.filter_not_deleted(
+        chat_id=message.chat_id, id__lt=message.pk,
+    ).order_by('-id').values_list('id', flat=True).first()
+
+    Conversation.objects.filter(last_message_id=message.pk)\
+        .update(last_message_id=previous_id)
+
+
+def remove_unread_message(message: Message, user_id=None):
+    """
+    Decreases `unread_count` of members that haven't seen the message yet,
+    or only for `user_id` if it's set.
+    """
+    conversations = Conversation.objects.filter(
+        chat_id=message.chat_id,
+        last_read_id__lt=message.pk,
+        unread_count__gt=0,
+    ).exclude(user_id=message.sender_id)
+
+    if user_id is not None:
+        conversations = conversations.filter(user_id=user_id)
+    else:
+        # Members that deleted it before, don't count it already
+        conversations = conversations.exclude(Exists(
+            DeletedMessage.objects.filter(message_id=message.pk,
+                                          user_id=OuterRef('user_id'))
+        ))
+    conversations.update(unread_count=F('unread_count') - 1)
+
+
+def reconcile_unread_counts(batch_size: Optional[int] = None) -> int:
+    """
+    Recounts `unread_count` of all conversations to fix drifts of
+    incremental updates and returns number of fixed conversations.
+
+    Conversations are updated in batches of `batch_size`
+    and only the drifted ones are written.
+    """
+    batch_size = batch_size or UNREAD_RECONCILE_BATCH_SIZE
+    unread_count = SubqueryCount(get_unread_messages(
+        OuterRef('chat_id'), OuterRef('user_id'), OuterRef('last_read_id')
+    ), 'chat_id')
+
+    fixed = last_id = 0
+    while True:
+        ids = list(Conversation.objects.filter(pk__gt=last_id)
+                   .order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            break
+        fixed += Conversation.objects.filter(pk__in=ids)\
+            .exclude(unread_count=unread_count)\
+            .update(unread_count=unread_count)
+        last_id = ids[-1]
+
+    return fixed
+
+
+def get_deleted_message_ids(chat_id, user_id) -> array:
+    """
+    Returns a sorted array of ids of messages in `chat_id`
+    that deleted by `user_id`.
+
+    The array is kept in cache as a single key per user and chat,
+    and removed from cache whenever user deletes a message in chat.
+    """
+    cache_key = cache.format_key(key_name='deleted_messages',
+                                 chat_id=chat_id,
                                  user_id=user_id)
-    is_deleted = cache.get(cache_key)
-    if is_deleted is None:
-        is_deleted = DeletedMessage.objects.only('id').filter(
-            message_id=msg_id, user_id=user_id).exists()
-        cache.set(cache_key, is_deleted)
+    ids = cache.get(cache_key)
+    if ids is None:
+        ids = array('q', DeletedMessage.objects.filter(
+            user_id=user_id, message__chat_id=chat_id
+        ).order_by('message_id').values_list('message_id', flat=True))
+        cache.set(cache_key, ids)
 
-    return is_deleted
+    return ids
+
+
+def is_message_deleted(msg_id, user_id, chat_id) -> bool:
+    """Checks that the `msg_id` is deleted for `user_id`"""
+    ids = get_deleted_message_ids(chat_id, user_id)
+    index = bisect_left(ids, msg_id)
+    return index < len(ids) and ids[index] == msg_id
@@ -26,6 +26,7 @@ class HardDeletedMessageSerializer(serializers.ModelSerializer):
         fields = [
             'chat_id',
             'message_id',
+            'seq',
         ]
 
         extra_kwargs = {
@@ -5,6 +5,7 @@ from generic_relations.relations import GenericRelatedField
 
 from message.models import Message
 from core.utils import count_field
+from global_id.list_serializers import GUIDListSerializer
 from user.serializers import UserInfoSerializer
 from .utils import (MESSAGE_CHAT_GENERICS, MESSAGE_CONTENT_GENERICS,
                     get_content_serializer)
@@ -32,6 +33,7 @@ class MessageSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Message
+        list_serializer_class = GUIDListSerializer
         read_only_fields = [
             'sent_at',
             'is_edited',
@@ -39,6 +41,7 @@ class MessageSerializer(serializers.ModelSerializer):
         ]
         fields = [
             'id',
+            'seq',
             'content_type',
             'content',
             'chat',
@@ -79,9 +82,11 @@ class MessageInfoSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Message
+        list_serializer_class = GUIDListSerializer
         fields = [
             'id',
             'chat_id',
+            'seq',
             'content_type',
             'content',
             'sent_at',
@@ -1,33 +1,16 @@
 from rest_framework import serializers
 
-from message.models import Seen
+from global_id.list_serializers import GUIDListSerializer
 from user.serializers import UserInfoSerializer
 
 
-class SeenUserSerializer(serializers.ModelSerializer):
+class SeenInfoSerializer(serializers.Serializer):
+    """Serializes read watermark of user's conversation,
+    every message of chat until `message_id` is seen by user"""
     user = UserInfoSerializer(read_only=True)
+    chat_id = serializers.IntegerField(read_only=True)
+    message_id = serializers.IntegerField(source='last_read_id',
+                                          read_only=True)
 
     class Meta:
-        model = Seen
-        fields = [
-            'user',
-            'message_id',
-            'seen_at'
-        ]
-
-
-class SeenInfoSerializer(serializers.ModelSerializer):
-    user = UserInfoSerializer(read_only=True)
-    chat_id = serializers.SerializerMethodField()
-
-    class Meta:
-        model = Seen
-        fields = [
-            'user',
-            'chat_id',
-            'message_id',
-            'seen_at'
-        ]
-
-    def get_chat_id(self, instance: Seen) -> int:
-        return instance.message.chat_id
+        list_serializer_class = GUIDListSerializer
@@ -0,0 +1,36 @@
+from django.dispatch import receiver
+from django.db.models.signals import post_save, pre_delete
+
+from core.signals import post_soft_delete
+from message.models import Message, DeletedMessage
+from message.queryset import (add_chat_message, remove_unread_message,
+                              remove_last_message)
+
+
+@receiver(post_save, sender=Message)
+def add_message_to_conversations(sender, instance: Message,
+                                 created, **_):
+    if created:
+        add_chat_message(instance)
+
+
+@receiver(post_soft_delete, sender=Message)
+def remove_soft_deleted_message(sender, instance: Message, **_):
+    remove_unread_message(instance)
+    remove_last_message(instance)
+
+
+@receiver(pre_delete, sender=Message)
+def remove_deleted_message(sender, instance: Message, **_):
+    # Soft deleted messages are removed already
+    if not instance.is_deleted:
+        remove_unread_message(instance)
+        remove_last_message(instance)
+
+
+@receiver(post_save, sender=DeletedMessage)
+def uncount_message_deleted_for_user(sender, instance: DeletedMessage,
+                                     created, **_):
+    message = instance.message
+    if created and not message.is_deleted:
+        remove_unread_message(message, user_id=instance.user_id)
@@ -1,10 +1,19 @@
 from django.test.testcases import TestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
 
+from auth_app.tests.utils import create_access
 from user.tests.utils import create_active_user
 from conversation.tests.utils import create_private_chat
 from message.models import Message
-from message.queryset import get_chat_messages
+from conversation.models import Conversation
+from conversation.tasks import create_conversations
+from message.queryset import (get_chat_messages, get_deleted_message_ids,
+                              is_message_deleted, seen_until,
+                              reconcile_unread_counts)
+from core.tests.mixins import ClearCacheMixin
 from .utils import create_deleted_msg, create_message
+from .utils.callers import MessageViewCaller
 from core.tests.utils import assert_items_are_same_as_data
 
 
@@ -52,3 +61,229 @@ class MessageModelTest(TestCase):
             data=get_chat_messages(self.pv.pk, self.user2.pk).values(),
             data_key='id'
         )
+
+
+class MessageSeenTest(TestCase):
+    def setUp(self) -> None:
+        self.user1 = create_active_user()
+        self.user2 = create_active_user()
+        self.pv = create_private_chat(self.user1, self.user2)
+        self.msgs = [create_message(self.user1, self.pv) for _ in range(3)]
+
+    def get_seen_counts(self, user) -> dict:
+        return dict(get_chat_messages(self.pv.pk, user.pk)
+                    .values_list('id', 'seen_users_count'))
+
+    def test_seen_until_marks_range(self):
+        self.assertTrue(seen_until(self.msgs[1], self.user2.pk))
+
+        counts = self.get_seen_counts(self.user2)
+        self.assertEqual(counts[self.msgs[0].pk], 1)
+        self.assertEqual(counts[self.msgs[1].pk], 1)
+        self.assertEqual(counts[self.msgs[2].pk], 0)
+        self.assertEqual(self.msgs[0].seen_users.count(), 1)
+        self.assertEqual(self.msgs[2].seen_users.count(), 0)
+
+    def test_seen_until_not_moves_back(self):
+        seen_until(self.msgs[2], self.user2.pk)
+        self.assertFalse(seen_until(self.msgs[0], self.user2.pk))
+        self.assertFalse(seen_until(self.msgs[2], self.user2.pk))
+        self.assertEqual(self.msgs[2].seen_users.count(), 1)
+
+    def test_sender_not_counted(self):
+        seen_until(self.msgs[2], self.user1.pk)
+        self.assertEqual(set(self.get_seen_counts(self.user1).values()), {0})
+
+        msg = create_message(self.user2, self.pv)
+        seen_until(msg, self.user1.pk)
+        self.assertEqual(self.get_seen_counts(self.user1)[msg.pk], 1)
+
+
+class UnreadCountTest(TestCase):
+    def setUp(self) -> None:
+        self.user1 = create_active_user()
+        self.user2 = create_active_user()
+        self.pv = create_private_chat(self.user1, self.user2)
+        self.msgs = [create_message(self.user1, self.pv) for _ in range(3)]
+
+    def get_conv(self, user) -> Conversation:
+        return Conversation.objects.get(chat_id=self.pv.pk, user=user)
+
+    def test_send_counts_for_receivers(self):
+        self.assertEqual(self.get_conv(self.user2).unread_count, 3)
+        self.assertEqual(self.get_conv(self.user1).unread_count, 0)
+
+    def test_seen_until_recounts(self):
+        seen_until(self.msgs[0], self.user2.pk)
+        conv = self.get_conv(self.user2)
+        self.assertEqual(conv.unread_count, 2)
+        self.assertEqual(conv.last_read_id, self.msgs[0].pk)
+
+        seen_until(self.msgs[2], self.user2.pk)
+        self.assertEqual(self.get_conv(self.user2).unread_count, 0)
+
+    def test_delete_for_user(self):
+        create_deleted_msg(self.msgs[1], self.user2)
+        self.assertEqual(self.get_conv(self.user2).unread_count, 2)
+
+        # Hard delete doesn't uncount it again
+        self.msgs[1].soft_delete()
+        self.assertEqual(self.get_conv(self.user2).unread_count, 2)
+
+        self.msgs[2].soft_delete()
+        self.assertEqual(self.get_conv(self.user2).unread_count, 1)
+
+    def test_seen_message_not_uncounted(self):
+        seen_until(self.msgs[1], self.user2.pk)
+        self.msgs[0].delete()
+        create_deleted_msg(self.msgs[1], self.user2)
+        self.assertEqual(self.get_conv(self.user2).unread_count, 1)
+
+    def test_reconcile(self):
+        Conversation.objects.update(unread_count=10)
+        seen_until(self.msgs[0], self.user1.pk)
+
+        self.assertEqual(reconcile_unread_counts(batch_size=1), 1)
+        self.assertEqual(self.get_conv(self.user1).unread_count, 0)
+        self.assertEqual(self.get_conv(self.user2).unread_count, 3)
+        self.assertEqual(reconcile_unread_counts(), 0)
+
+    def test_new_conversation_has_no_unread(self):
+        Conversation.objects.filter(user=self.user2).delete()
+        create_conversations(self.pv, [self.user2.pk])
+
+        conv = self.get_conv(self.user2)
+        self.assertEqual(conv.last_read_id, self.msgs[-1].pk)
+        self.assertEqual(reconcile_unread_counts(), 0)
+
+
+class MessageSequenceTest(TestCase):
+    def test_seq_per_chat(self):
+        user1 = create_active_user()
+        pv1 = create_private_chat(user1)
+        pv2 = create_private_chat(user1)
+
+        self.assertEqual([create_message(user1, pv1).seq for _ in range(3)],
+                         [1, 2, 3])
+        self.assertEqual(create_message(user1, pv2).seq, 1)
+        self.assertEqual(create_message(user1, pv1).seq, 4)
+
+    def test_seq_not_changed_on_update(self):
+        msg = create_message()
+        msg.is_edited = True
+        msg.save()
+        msg.refresh_from_db()
+        self.assertEqual(msg.seq, 1)
+
+
+class DeletedMessageIdsTest(ClearCacheMixin, TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.user1 = create_active_user()
+        self.user2 = create_active_user()
+        self.pv = create_private_chat(self.user1, self.user2)
+
+    def test_deleted_ids(self):
+        msg1 = create_message(self.user1, self.pv)
+        msg2 = create_message(self.user1, self.pv)
+        create_deleted_msg(msg2, self.user1)
+        create_deleted_msg(create_message(self.user1), self.user1)
+
+        self.assertEqual(list(get_deleted_message_ids(
+            self.pv.pk, self.user1.pk)), [msg2.pk])
+        self.assertTrue(is_message_deleted(msg2.pk, self.user1.pk, self.pv.pk))
+        self.assertFalse(is_message_deleted(msg1.pk, self.user1.pk, self.pv.pk))
+        self.assertFalse(is_message_deleted(msg2.pk, self.user2.pk, self.pv.pk))
+
+    def test_deleted_ids_cached(self):
+        msg = create_message(self.user1, self.pv)
+        get_deleted_message_ids(self.pv.pk, self.user1.pk)
+        with self.assertNumQueries(0):
+            self.assertFalse(is_message_deleted(
+                msg.pk, self.user1.pk, self.pv.pk))
+
+        create_deleted_msg(msg, self.user1)
+        self.assertTrue(is_message_deleted(msg.pk, self.user1.pk, self.pv.pk))
+
+
+class MessageViewTest(APITestCase):
+    caller: MessageViewCaller
+
+    def setUp(self):
+        self.caller = MessageViewCaller(self.client)
+        self.user1 = create_active_user()
+        self.user2 = create_active_user()
+        self.access = create_access(user=self.user1).encrypted_token
+        self.pv = create_private_chat(self.user1, self.user2)
+        self.msgs = [create_message(self.user1 if i % 2 else self.user2,
+                                    self.pv).pk
+                     for i in range(7)]
+
+    def __list(self, **params):
+        return self.caller.list__get(self.access, self.pv.pk, **params).data
+
+    def __ids(self, data):
+        return [msg['id'] for msg in data['results']]
+
+    def test_limit_offset(self):
+        data = self.__list(limit=3, offset=3)
+        self.assertEqual(data['count'], 7)
+        self.assertEqual(self.__ids(data), self.msgs[::-1][3:6])
+
+    def test_keyset_first_page(self):
+        data = self.__list(limit=3, before_id='')
+        self.assertNotIn('count', data)
+        self.assertEqual(self.__ids(data), self.msgs[::-1][:3])
+        self.assertIsNone(data['previous'])
+        self.assertIn(f'before_id={self.msgs[4]}', data['next'])
+
+    def test_keyset_before_id(self):
+        data = self.__list(limit=3, before_id=self.msgs[2])
+        self.assertEqual(self.__ids(data), self.msgs[1::-1])
+        self.assertIsNone(data['next'])
+        self.assertIn(f'after_id={self.msgs[1]}', data['previous'])
+
+    def test_keyset_after_id(self):
+        data = self.__list(limit=3, after_id=self.msgs[1])
+        self.assertEqual(self.__ids(data), self.msgs[4:1:-1])
+        self.assertIn(f'before_id={self.msgs[2]}', data['next'])
+        self.assertIn(f'after_id={self.msgs[4]}', data['previous'])
+
+    def test_keyset_ordering(self):
+        data = self.__list(limit=3, ordering='sent_at', before_id='')
+        self.assertEqual(self.__ids(data), self.msgs[:3])
+        self.assertIn(f'after_id={self.msgs[2]}', data['next'])
+
+        data = self.__list(limit=3, ordering='sent_at', after_id=self.msgs[5])
+        self.assertEqual(self.__ids(data), self.msgs[6:])
+        self.assertIsNone(data['next'])
+
+    def test_keyset_with_filter(self):
+        user1_msgs = self.msgs[1::2]
+        data = self.__list(limit=2, sender_id=self.user1.pk,
+                           before_id=user1_msgs[-1])
+        self.assertEqual(self.__ids(data), user1_msgs[-2::-1][:2])
+
+    def test_seq_range(self):
+        data = self.__list(seq__gt=2, seq__lt=6)
+        self.assertEqual(self.__ids(data), self.msgs[4:1:-1])
+        self.assertEqual([msg['seq'] for msg in data['results']], [5, 4, 3])
+
+    def test_keyset_bad_anchor(self):
+        self.caller.list__get(self.access, self.pv.pk, before_id='bad',
+                              allowed_status=status.HTTP_400_BAD_REQUEST)
+
+
+class MessageQueryPlanTest(TestCase):
+    def setUp(self) -> None:
+        self.user1 = create_active_user()
+        self.user2 = create_active_user()
+        self.pv = create_private_chat(self.user1, self.user2)
+        create_deleted_msg(create_message(self.user2, self.pv), self.user1)
+
+    def test_chat_messages_use_indexes(self):
+        plan = get_chat_messages(self.pv.pk, self.user1.pk)[:15].explain()
+        self.assertIn('message_chat_id_deleted_idx', plan)
+        self.assertIn('deletedmsg_user_message_idx', plan)
+        self.assertIn('conv_chat_last_read_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan.upper())
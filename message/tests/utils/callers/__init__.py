@@ -0,0 +1 @@
+from .message_caller import MessageViewCaller
@@ -0,0 +1,19 @@
+from django.urls.base import reverse
+from rest_framework import status
+
+from core.tests.utils import BaseCaller
+
+
+def msg_list_url(chat_id):
+    return reverse("message-list", kwargs={'chat_id': chat_id})
+
+
+class MessageViewCaller(BaseCaller):
+    def list__get(self, access_token, chat_id,
+                  allowed_status=status.HTTP_200_OK, **params):
+        """Calls message-list view with GET method"""
+        return self.assert_status_code(
+            allowed_status, self.client.get,
+            msg_list_url(chat_id), data=params,
+            **self.get_auth_header(access_token)
+        )
@@ -2,7 +2,7 @@ from rest_framework import viewsets, mixins
 
 from django_filters.rest_framework.backends import DjangoFilterBackend
 
-from core.paginations import DefaultLimitOffsetPagination
+from core.paginations import KeysetLimitOffsetPagination
 from core.filters import OrderingFilterWithSchema
 
 from .queryset import get_chat_messages
@@ -18,7 +18,7 @@ class MessageViewSet(mixins.ListModelMixin,
 
     filter_backends = [DjangoFilterBackend, OrderingFilterWithSchema]
     filterset_class = MessageFilter
-    pagination_class = DefaultLimitOffsetPagination
+    pagination_class = KeysetLimitOffsetPagination
     ordering_fields = ['sent_at', '-sent_at']
 
     def get_queryset(self):
@@ -77,7 +77,19 @@ REST_FRAMEWORK = {
         'user': '50/minute',
     },
     'DEFAULT_SCHEMA_CLASS': "drf_spectacular.openapi.AutoSchema",
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
+# Codec of REST and websocket JSON: 'orjson' or 'json'.
+# orjson is an optional dependency, it's used by default if it's installed
+JSON_CODEC = config('JSON_CODEC', default=None)
 
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Messenger API',
@@ -103,6 +115,29 @@ GLOBAL_ID_CHAT_SERIALIZERS = {
 
 UPDATE_AUTH_TOKEN_INFO_INTERVAL = timedelta(seconds=60)
 
+# Buffered `last_used` and `ip` of accesses are saved every
+# `ACCESS_INFO_FLUSH_INTERVAL` or when buffer has `ACCESS_INFO_BUFFER_SIZE` items
+ACCESS_INFO_FLUSH_INTERVAL = timedelta(seconds=30)
+ACCESS_INFO_BUFFER_SIZE = 1000
+# Buffered items that aren't flushed in this time (seconds) are dropped
+ACCESS_INFO_SLOT_TIMEOUT = 60 * 60 * 24
+
+# Process-local cache of verified tokens, set size to 0 for disabling it
+VERIFIED_TOKEN_CACHE_SIZE = 10000
+VERIFIED_TOKEN_CACHE_TTL = 60 * 5  # 5 Minutes
+
+# Channel events are saved in outbox and sent by `dispatch_outbox_events`
+# task after transaction committed, it also runs every `OUTBOX_DISPATCH_INTERVAL`
+# for events that their task failed
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_DISPATCH_INTERVAL = timedelta(seconds=10)
+# Sent events are kept for clients that missed them (`sync_since` action)
+OUTBOX_RETENTION = timedelta(days=1)
+
+# `unread_count` of conversations is updated on every change and recounted
+# by `reconcile_unread_counts` task daily, for fixing drifts
+UNREAD_RECONCILE_BATCH_SIZE = 1000
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -214,7 +249,23 @@ CELERYBEAT_SCHEDULE = {
     'delete_inactive_users': {
         'task': 'user.tasks.delete_inactive_users',
         'schedule': crontab(minute=0, hour='*/1')
-    }
+    },
+    'flush_token_information': {
+        'task': 'auth_app.tasks.flush_token_information',
+        'schedule': ACCESS_INFO_FLUSH_INTERVAL,
+    },
+    'dispatch_outbox_events': {
+        'task': 'messenger_channels.tasks.dispatch_outbox_events',
+        'schedule': OUTBOX_DISPATCH_INTERVAL,
+    },
+    'prune_outbox_events': {
+        'task': 'messenger_channels.tasks.prune_outbox_events',
+        'schedule': crontab(minute=30, hour='*/1')
+    },
+    'reconcile_unread_counts': {
+        'task': 'conversation.tasks.reconcile_unread_counts',
+        'schedule': crontab(minute=0, hour=4)
+    },
 }
 
 # Channels
@@ -232,6 +283,14 @@ CHANNEL_LAYERS = {
         }
     }
 }
+# 'chat': every socket joins a group per chat of user.
+# 'user': sockets only join `user_{id}` group and chat events are fanned out
+# to groups of chat's users, for users that are in many chats
+CHANNELS_FANOUT_MODE = config('CHANNELS_FANOUT_MODE', default='chat')
+# Clients can choose MessagePack frames by 'msgpack' websocket subprotocol,
+# events are encoded as MessagePack too only if it's enabled
+CHANNELS_MSGPACK_FRAMES = config('CHANNELS_MSGPACK_FRAMES', default=False,
+                                 cast=bool)
 
 
 # CACHE
@@ -245,6 +304,15 @@ CACHES = {
     }
 }
 CACHE_TTL = 60 * 15  # 15 Minutes
+# Process-local tier of `core.cache` for keys that are read frequently,
+# set size to 0 for disabling it. local items are invalidated by redis pub/sub
+CACHE_LOCAL_SIZE = 10000
+CACHE_LOCAL_TTL = 5  # Seconds
+# Max seconds that concurrent `get_or_set` calls of a missing key wait for
+# the single caller that computes it
+CACHE_LOCK_TIMEOUT = 10
+# Keep ranks of community members in cache for permission checks
+MEMBER_RANK_CACHE = True
 # Test
 
 if 'test' in sys.argv:
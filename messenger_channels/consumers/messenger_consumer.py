@@ -1,18 +1,27 @@
-from generic_channels.consumers import GenericConsumer
+from typing import Optional
+from django.conf import settings
+from channels.db import database_sync_to_async
+
+from generic_channels.consumers import AsyncGenericConsumer
 from generic_channels.decorators import options
 from generic_channels.permissions import IsAuthenticated
 
 from core.utils import get_chat_content_type
 from core.permissions import IsOwnerOfItem
 from community.permissions import IsCommunityAdminMember
-from message.models import Message, Seen
+from conversation.models import Conversation
+from message.models import Message
 from message.serializers import MessageSerializer, DeletedMessageSerializer
 from message.serializers.utils import CONTENT_UPDATE_SERIALIZERS
-from message.queryset import delete_message, is_message_deleted
+from message.queryset import (delete_message, get_deleted_message_ids,
+                              seen_until)
 from message.tasks import forward_message
-from ..querysets import get_chat_ids
+from ..fanout import CHANNELS_FANOUT_MODE, FANOUT_CHAT, get_user_group_name
+from ..outbox import get_events_since, EventsExpired
+from ..querysets import get_chat_ids, get_member_ranks
 from ..validators import validate_chat_id
-from ..signals import pre_update_message, post_update_message
+from ..signals import (pre_update_message, post_update_message,
+                       post_seen_message)
 
 CHATID_OPTIONS = {
     'type': int, 'regex': '^-?\d+$',
@@ -25,20 +34,58 @@ MSGID_OPTIONS = {
 CHATID_PARAM = {
     'chat_id': CHATID_OPTIONS,
 }
+SEEN_PARAMS = {
+    "message_id": {
+        'queryset': Message.objects.filter_not_deleted(),
+        **MSGID_OPTIONS
+    },
+    **CHATID_PARAM
+}
+SYNC_EVENTS_BATCH_SIZE = getattr(settings, 'SYNC_EVENTS_BATCH_SIZE', 100)
 
 
-class MessengerConsumer(GenericConsumer):
+class MessengerConsumer(AsyncGenericConsumer):
     default_error_messages = {
         'cant_update': "can't update this message",
         'seen_already': "You've seen this message already",
         'seen_self': "You can't seen your message",
+        'sync_expired': "Events are expired, chats should be reloaded",
     }
     permission_classes = [IsAuthenticated]
 
-    def connect(self):
-        super().connect()
-        self.groups_join(get_chat_ids(self.scope.user))
-        self.group_join(f'user_{self.scope.user.pk}')
+    deleted_messages: dict[int, set[int]]
+    """Ids of messages that user deleted in every chat, that
+    loaded when first event of chat received"""
+
+    chat_ids: set[str]
+    """Ids of chats that user is in, in `FANOUT_CHAT` mode socket
+    joins a group for each of them too"""
+
+    member_ranks: dict[int, int]
+    """Ranks of user in communities by their id, that loaded at connect
+    and updated by `member_rank` events. Community permissions use it
+    instead of querying members"""
+
+    async def connect(self):
+        self.deleted_messages = {}
+        self.member_ranks = {}
+        self.chat_ids = set()
+        await super().connect()
+        # Joined before loading ranks, so changes that happen
+        # meanwhile are received after them
+        await self.group_join(get_user_group_name(self.scope.user.pk))
+        self.member_ranks = await database_sync_to_async(
+            get_member_ranks)(self.scope.user.pk)
+        await self.chats_join(
+            await database_sync_to_async(get_chat_ids)(self.scope.user)
+        )
+
+    async def chats_join(self, chat_ids):
+        """Add chats to user's chats, and join their groups
+        if fan-out mode is `FANOUT_CHAT`"""
+        self.chat_ids.update(map(str, chat_ids))
+        if CHANNELS_FANOUT_MODE == FANOUT_CHAT:
+            await self.groups_join(chat_ids)
 
     def get_serializer_class(self, action, content):
         if action == 'send_message':
@@ -65,7 +112,7 @@ class MessengerConsumer(GenericConsumer):
         return super().get_permissions(action, content)
 
     @options(query_params=CHATID_PARAM)
-    def action_send_message(self, content, action, *args, **kwargs):
+    async def action_send_message(self, content, action, *args, **kwargs):
         """
         Create message for chat.
 
@@ -73,6 +120,11 @@ class MessengerConsumer(GenericConsumer):
         - first message for new privatechats won't send because
           the chat_id isn't still in groups list.
         """
+        data = await database_sync_to_async(
+            self.perform_send_message)(content, action)
+        await self.success(content, data)
+
+    def perform_send_message(self, content, action) -> dict:
         chat_id = content.query.chat_id
 
         serializer = self.get_serializer(
@@ -84,8 +136,7 @@ class MessengerConsumer(GenericConsumer):
             chat_content_type=get_chat_content_type(chat_id),
             sender=self.scope.user,
         )
-
-        self.success(content, serializer.data)
+        return serializer.data
 
     @options(query_params={
         "message_id": {
@@ -94,20 +145,22 @@ class MessengerConsumer(GenericConsumer):
         },
         **CHATID_PARAM
     })
-    def action_delete_message(self, content, action, *args, **kwargs):
+    async def action_delete_message(self, content, action, *args, **kwargs):
         '''
         Delete message for an user.
 
         if {"hard":True} was in body, the message will be deleted for all users
         '''
+        await database_sync_to_async(self.perform_delete_message)(content)
+        await self.success(content)
+
+    def perform_delete_message(self, content):
         msg: Message = content.query.message_id_object
         if content.body.get('hard', False):
             msg.soft_delete()
         else:
             delete_message(msg.pk, self.scope.user.pk)
 
-        self.success(content)
-
     @options(query_params={
         "message_id": {
             'queryset': Message.objects.select_related('sender')
@@ -116,10 +169,15 @@ class MessengerConsumer(GenericConsumer):
         },
         **CHATID_PARAM
     })
-    def action_update_message(self, content, action, *args, **kwargs):
+    async def action_update_message(self, content, action, *args, **kwargs):
         """
         Update message content that user sent.
         """
+        data = await database_sync_to_async(
+            self.perform_update_message)(content, action)
+        await self.success(content, data)
+
+    def perform_update_message(self, content, action) -> dict:
         msg: Message = content.query.message_id_object
 
         serializer = self.get_serializer(
@@ -130,37 +188,45 @@ class MessengerConsumer(GenericConsumer):
         pre_update_message.send(msg.__class__, instance=msg)
         serializer.save()
         post_update_message.send(msg.__class__, instance=msg)
+        return serializer.data
 
-        self.success(content, serializer.data)
-
-    @options(query_params={
-        "message_id": {
-            'queryset': Message.objects.prefetch_related('chat')
-            .filter_not_deleted(),
-            **MSGID_OPTIONS
-        },
-        **CHATID_PARAM
-    })
-    def action_seen_message(self, content, action, *args, **kwargs):
+    @options(query_params=SEEN_PARAMS)
+    async def action_seen_message(self, content, action, *args, **kwargs):
         """Seen message by user"""
-        user = self.scope.user
+        await database_sync_to_async(self.perform_seen_message)(content, action)
+        await self.success(content)
+
+    def perform_seen_message(self, content, action):
         message = content.query.message_id_object
-        if user.pk == message.sender_id:
+        if self.scope.user.pk == message.sender_id:
             self.fail('seen_self', action=action)
+        self.perform_seen_until(content, action)
 
-        seen, created = Seen.objects.get_or_create(
-            message=message,
-            user=user,
-        )
-        if not created:
+    @options(query_params=SEEN_PARAMS)
+    async def action_seen_until(self, content, action, *args, **kwargs):
+        """
+        Seen all messages of chat until `message_id` by user.
+
+        Only user's read watermark of chat is moved forward, so
+        seeing a range of messages costs a single write.
+        """
+        await database_sync_to_async(self.perform_seen_until)(content, action)
+        await self.success(content)
+
+    def perform_seen_until(self, content, action):
+        user = self.scope.user
+        message = content.query.message_id_object
+        if not seen_until(message, user.pk):
             self.fail('seen_already', action=action)
 
-        self.success(content)
+        post_seen_message.send(Conversation, user=user,
+                               chat_id=message.chat_id,
+                               last_read_id=message.pk)
 
-    def action_send_alive(self, content, action, *args, **kwargs):
+    async def action_send_alive(self, content, action, *args, **kwargs):
         """Update user's `last_seen`"""
-        self.scope.user.set_online(save=True)
-        self.success(content)
+        await database_sync_to_async(self.scope.user.set_online)(save=True)
+        await self.success(content)
 
     @options(query_params={
         "message_id": {
@@ -171,20 +237,101 @@ class MessengerConsumer(GenericConsumer):
         "to_chat_id": CHATID_OPTIONS,
         **CHATID_PARAM
     })
-    def action_forward_message(self, content, action, *args, **kwargs):
-        forward_message(
+    async def action_forward_message(self, content, action, *args, **kwargs):
+        await database_sync_to_async(forward_message)(
             content.query.message_id_object,
             content.query.to_chat_id,
             self.scope.user
         )
-        self.success(content)
+        await self.success(content)
+
+    @options(query_params={
+        'event_id': {'type': int, 'regex': r'^\d+$'},
+    })
+    async def action_sync_since(self, content, action, *args, **kwargs):
+        """
+        Return message events that user missed after `event_id`
+        (`event_id` of last received event), at most
+        `SYNC_EVENTS_BATCH_SIZE` events in every call.
 
-    def event_change_in_message(self, event):
+        Call it again by returned `event_id` while `has_more` is `True`.
+        if events were expired, chats should be reloaded.
+        """
+        event_id = content.query.event_id
+        try:
+            events, has_more = await database_sync_to_async(
+                get_events_since)(self.groups | self.chat_ids, event_id,
+                                  SYNC_EVENTS_BATCH_SIZE)
+        except EventsExpired:
+            self.fail('sync_expired', action=action)
+
+        missed_events = []
+        for outbox_event in events:
+            event = await self.get_missed_event(
+                {**outbox_event.event, 'event_id': outbox_event.seq})
+            if event is not None:
+                missed_events.append(event)
+
+        await self.success(content, {
+            'events': missed_events,
+            'event_id': events[-1].seq if events else event_id,
+            'has_more': has_more,
+        })
+
+    async def get_missed_event(self, event) -> Optional[dict]:
+        """Return event as it would be sent to user,
+        or `None` if user shouldn't receive it"""
+        event_type = event.pop('type', None)
+        chat_id, msg_id = event.pop('chat_id', None), event.pop('msg_id', None)
+        if event_type == 'event.change_in_message':
+            deleted_messages = await self.get_deleted_messages(chat_id)
+            if msg_id in deleted_messages:
+                return None
+        elif event_type == 'event.delete_message':
+            message = event['message']
+            self.add_deleted_message(message['chat_id'],
+                                     message['message_id'])
+        elif event_type != 'event.send_message':
+            return None
+        return event
+
+    async def get_deleted_messages(self, chat_id) -> set[int]:
+        if (ids := self.deleted_messages.get(chat_id)) is None:
+            ids = set(await database_sync_to_async(get_deleted_message_ids)(
+                chat_id, self.scope.user.pk))
+            self.deleted_messages[chat_id] = ids
+        return ids
+
+    async def event_change_in_message(self, event):
         """Sends message event only if `message` wasn't deleted for user"""
-        msg_id = event.get('msg_id')
-        if not is_message_deleted(msg_id, self.scope.user.pk):
-            self.event_send_message({k: v for k, v in event.items() if k != 'msg_id'})
+        deleted_messages = await self.get_deleted_messages(event['chat_id'])
+        if event.get('msg_id') not in deleted_messages:
+            await self.event_send_message(
+                event if 'text' in event else
+                {k: v for k, v in event.items()
+                 if k not in ('msg_id', 'chat_id')})
+
+    def add_deleted_message(self, chat_id, msg_id):
+        if (ids := self.deleted_messages.get(chat_id)) is not None:
+            ids.add(msg_id)
+
+    async def event_delete_message(self, event):
+        """Adds message to user's deleted messages and sends event"""
+        self.add_deleted_message(event['chat_id'], event['msg_id'])
+        await self.event_send_message(event)
+
+    async def event_group_join(self, event):
+        """Add chat of event to user's chats"""
+        if (name := event.get('group_name')):
+            await self.chats_join([name])
+
+    async def event_member_rank(self, event):
+        """Updates rank of user in community, it isn't sent to client"""
+        if event['rank'] is None:
+            self.member_ranks.pop(event['community_id'], None)
+        else:
+            self.member_ranks[event['community_id']] = event['rank']
 
-    def event_send_online(self, event):
+    async def event_send_online(self, event):
         if event['user']['id'] != self.scope.user.pk:
-            self.event_send_message(event)
+            await self.event_send_message(event)
@@ -0,0 +1,84 @@
+from collections import defaultdict
+from typing import Iterable, Optional
+from django.conf import settings
+
+from core.json_codec import codec
+from generic_channels.frames import CHANNELS_MSGPACK_FRAMES, pack
+from .models import OutboxEvent
+from .querysets import get_chat_user_ids_cached
+
+FANOUT_CHAT = 'chat'
+"""Every socket joins a group per chat, events are sent to chat's group"""
+FANOUT_USER = 'user'
+"""Every socket only joins its user's group, events of a chat are
+sent to groups of chat's users"""
+
+CHANNELS_FANOUT_MODE = getattr(settings, 'CHANNELS_FANOUT_MODE', FANOUT_CHAT)
+
+ROUTING_EVENT_KEYS = ('type', 'chat_id', 'msg_id')
+"""Keys of events that are used by consumers and aren't sent to client"""
+ENCODED_EVENT_TYPES = frozenset({
+    'event.send_message', 'event.change_in_message', 'event.delete_message',
+})
+"""Types of events that are sent to client, they're pre-encoded"""
+
+
+def get_user_group_name(user_id) -> str:
+    return f'user_{user_id}'
+
+
+def is_chat_group(group_name: str) -> bool:
+    return group_name.lstrip('-').isdigit()
+
+
+def get_fanout_groups(group_names: Iterable[str],
+                      mode: Optional[str] = None) -> dict[str, list[str]]:
+    """Return channel-layer groups that events of every group
+    in `group_names` should be sent to"""
+    mode = mode or CHANNELS_FANOUT_MODE
+    targets = {name: [name] for name in group_names}
+    if mode != FANOUT_USER:
+        return targets
+
+    chat_ids = [int(name) for name in targets if is_chat_group(name)]
+    for chat_id, user_ids in get_chat_user_ids_cached(chat_ids).items():
+        targets[str(chat_id)] = [get_user_group_name(user_id)
+                                 for user_id in user_ids]
+    return targets
+
+
+def encode_event(event: dict) -> dict:
+    """
+    Return `event` as it's sent on channel layer: its routing keys, and
+    'text' (JSON) and 'bytes' (MessagePack, if `CHANNELS_MSGPACK_FRAMES`)
+    of the rest of it, as it's sent to client except 'action'.
+
+    Events that aren't sent to client are returned as is.
+    """
+    if event.get('type') not in ENCODED_EVENT_TYPES:
+        return event
+
+    routing = {k: event[k] for k in ROUTING_EVENT_KEYS if k in event}
+    data = {k: v for k, v in event.items() if k not in routing}
+    routing['text'] = codec.dumps(data)
+    if CHANNELS_MSGPACK_FRAMES:
+        routing['bytes'] = pack(data)
+    return routing
+
+
+def group_events(events: list[OutboxEvent],
+                 mode: Optional[str] = None) -> dict[str, list[dict]]:
+    """Return events by the groups that they should be sent to,
+    events of every group are kept in order.
+
+    Every event is encoded once (see `encode_event`), so consumers
+    forward it to all recipients without encoding it again."""
+    targets = get_fanout_groups({event.group_name for event in events}, mode)
+
+    groups = defaultdict(list)
+    for outbox_event in events:
+        event = encode_event(
+            {**outbox_event.event, 'event_id': outbox_event.seq})
+        for group_name in targets[outbox_event.group_name]:
+            groups[group_name].append(event)
+    return groups
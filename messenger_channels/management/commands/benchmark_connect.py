@@ -0,0 +1,52 @@
+import asyncio
+from time import perf_counter
+from django.core.management.base import BaseCommand
+
+from messenger_channels.consumers import MessengerConsumer
+from ..layers import DelayedChannelLayer
+
+
+class Command(BaseCommand):
+    help = ('Measures time of joining chat groups at connect, one by one '
+            'and in bulk, by a local channel layer with simulated latency')
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('-c', '--chats', type=int, default=2000,
+                            help='number of chats that user is in')
+        parser.add_argument('-l', '--latency', type=float, default=0.5,
+                            help='round-trip time of channel layer in ms')
+
+    async def get_consumer(self, layer) -> MessengerConsumer:
+        consumer = MessengerConsumer()
+        consumer.channel_layer = layer
+        consumer.channel_name = await layer.new_channel()
+        return consumer
+
+    async def measure_one_by_one(self, layer, group_names) -> float:
+        consumer = await self.get_consumer(layer)
+        start = perf_counter()
+        for name in group_names:
+            await consumer.group_join(name)
+        return perf_counter() - start
+
+    async def measure_bulk(self, layer, group_names) -> float:
+        consumer = await self.get_consumer(layer)
+        start = perf_counter()
+        await consumer.groups_join(group_names)
+        return perf_counter() - start
+
+    async def measure(self, chats: int, latency: float) -> tuple[float, float]:
+        group_names = [str(-chat_id) for chat_id in range(1, chats + 1)]
+        layer = DelayedChannelLayer(delay=latency / 1000)
+        before = await self.measure_one_by_one(layer, group_names)
+        after = await self.measure_bulk(layer, group_names)
+        return before, after
+
+    def handle(self, *args, **options):
+        chats, latency = options['chats'], options['latency']
+        before, after = asyncio.run(self.measure(chats, latency))
+
+        self.stdout.write(f"{chats} chats, {latency} ms latency")
+        self.stdout.write(f"One by one: {before * 1000:10.1f} ms")
+        self.stdout.write(f"Bulk:       {after * 1000:10.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"Speedup: x{before / after:.1f}"))
@@ -0,0 +1,81 @@
+import asyncio
+from time import perf_counter
+from django.core.management.base import BaseCommand
+
+from core.cache import cache
+from messenger_channels.fanout import (FANOUT_CHAT, FANOUT_USER,
+                                       get_user_group_name, group_events)
+from messenger_channels.models import OutboxEvent
+from messenger_channels.outbox import _send_events
+from ..layers import DelayedChannelLayer
+
+
+class Command(BaseCommand):
+    help = ('Measures sending chat events and size of group memberships '
+            'by per-chat groups and by user-centric fan-out, for a small '
+            'and a large chat, by a local channel layer with simulated '
+            'latency. users of chats are read from cache, like a warmed '
+            'up dispatcher')
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('-s', '--small', type=int, default=2,
+                            help='number of users of small chat')
+        parser.add_argument('-l', '--large', type=int, default=1000,
+                            help='number of users of large chat')
+        parser.add_argument('-c', '--chats', type=int, default=50,
+                            help='number of chats that every user is in')
+        parser.add_argument('-e', '--events', type=int, default=10,
+                            help='number of events that sent to chat')
+        parser.add_argument('--latency', type=float, default=0.5,
+                            help='round-trip time of channel layer in ms')
+
+    async def subscribe(self, layer, mode, user_ids, chat_ids):
+        """Subscribe a channel for every user, return number of
+        group memberships that layer keeps"""
+        for user_id in user_ids:
+            channel = await layer.new_channel()
+            if mode == FANOUT_USER:
+                await layer.group_add(get_user_group_name(user_id), channel)
+            else:
+                for chat_id in chat_ids:
+                    await layer.group_add(str(chat_id), channel)
+        return sum(len(channels) for channels in layer.groups.values())
+
+    def measure(self, mode, users, chats, count,
+                latency) -> tuple[int, float]:
+        user_ids = range(1, users + 1)
+        # Fake chat ids, users of the first one are cached
+        chat_ids = [-(10 ** 12) - i for i in range(chats)]
+        key = cache.format_key(chat_ids[0], key_name='chat_users')
+        cache.set(key, list(user_ids))
+
+        layer = DelayedChannelLayer(capacity=count * 2)
+        memberships = asyncio.run(
+            self.subscribe(layer, mode, user_ids, chat_ids))
+        layer.delay = latency / 1000
+        events = [
+            OutboxEvent(pk=i, seq=i, group_name=str(chat_ids[0]),
+                        event={'type': 'event.send_message', 'n': i})
+            for i in range(count)
+        ]
+
+        try:
+            start = perf_counter()
+            asyncio.run(_send_events(group_events(events, mode), layer))
+            elapsed = perf_counter() - start
+        finally:
+            cache.delete(key)
+        return memberships, elapsed
+
+    def handle(self, *args, **options):
+        chats, count = options['chats'], options['events']
+        self.stdout.write(f"{chats} chats per user, {count} events per chat")
+        self.stdout.write(f"{'users':>8} {'mode':>6} {'memberships':>12} "
+                          f"{'send ms':>10}")
+
+        for users in (options['small'], options['large']):
+            for mode in (FANOUT_CHAT, FANOUT_USER):
+                memberships, elapsed = self.measure(
+                    mode, users, chats, count, options['latency'])
+                self.stdout.write(f"{users:>8} {mode:>6} {memberships:>12} "
+                                  f"{elapsed * 1000:>10.1f}")
@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+from django.core.management.base import BaseCommand
+
+from core.json_codec import CODECS, orjson
+from generic_channels.frames import pack, unpack
+
+TRAFFIC_FILE = Path(__file__).resolve().parent.parent / 'traffic.jsonl'
+
+
+class Command(BaseCommand):
+    help = ('Compares size and encoding and decoding time of JSON and '
+            'MessagePack frames on recorded traffic of messenger socket. '
+            'Traffic file has a JSON frame per line, both sent and received')
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('-f', '--file', default=TRAFFIC_FILE,
+                            help='path of recorded traffic')
+        parser.add_argument('-n', '--number', type=int, default=1000,
+                            help='number of times traffic is coded')
+
+    def measure(self, func: Callable, frames: list, count: int) -> float:
+        """Call `func` by every frame for `count` times and
+        return microseconds per frame"""
+        start = perf_counter()
+        for _ in range(count):
+            for frame in frames:
+                func(frame)
+        return (perf_counter() - start) / (count * len(frames)) * 10 ** 6
+
+    def handle(self, *args, **options):
+        count = options['number']
+        with open(options['file'], encoding='utf-8') as file:
+            frames = [json.loads(line) for line in file if line.strip()]
+
+        formats = [
+            (codec.name, codec.dumps_bytes, codec.loads)
+            for codec in (codec_class() for codec_class in CODECS.values())
+            if codec.name != 'orjson' or orjson
+        ] + [('msgpack', pack, unpack)]
+
+        self.stdout.write(f"{len(frames)} frames")
+        self.stdout.write(f"{'format':>8} {'bytes':>8} {'avg':>7} "
+                          f"{'encode us':>10} {'decode us':>10}")
+        for name, encode, decode in formats:
+            encoded = [encode(frame) for frame in frames]
+            size = sum(map(len, encoded))
+            self.stdout.write(
+                f"{name:>8} {size:>8} {size / len(frames):>7.0f} "
+                f"{self.measure(encode, frames, count):>10.2f} "
+                f"{self.measure(decode, encoded, count):>10.2f}")
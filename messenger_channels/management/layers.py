@@ -0,0 +1,28 @@
+import asyncio
+from channels.layers import InMemoryChannelLayer
+
+
+class DelayedChannelLayer(InMemoryChannelLayer):
+    """
+    In-memory layer for benchmarks that every `group_add` and
+    `group_send` takes `delay` seconds, like a round-trip to a remote
+    layer.
+
+    Expired messages and groups aren't cleaned on every call, which
+    costs as much as the whole state of layer in `InMemoryChannelLayer`.
+    """
+
+    def __init__(self, delay: float = 0, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+
+    def _clean_expired(self):
+        pass
+
+    async def group_add(self, group, channel):
+        await asyncio.sleep(self.delay)
+        return await super().group_add(group, channel)
+
+    async def group_send(self, group, message):
+        await asyncio.sleep(self.delay)
+        return await super().group_send(group, message)
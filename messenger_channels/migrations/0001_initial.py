@@ -0,0 +1,27 @@
+# Generated by Django 3.2.25 on 2026-10-18 17:43
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('group_name', models.CharField(max_length=100, verbose_name='Group name')),
+                ('event', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Event')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
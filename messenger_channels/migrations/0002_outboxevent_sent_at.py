@@ -0,0 +1,26 @@
+# Generated by Django 3.2.25 on 2026-10-18 17:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messenger_channels', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxevent',
+            name='sent_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Sent at'),
+        ),
+        migrations.AddIndex(
+            model_name='outboxevent',
+            index=models.Index(fields=['sent_at', 'id'], name='outbox_sent_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='outboxevent',
+            index=models.Index(fields=['group_name', 'id'], name='outbox_group_id_idx'),
+        ),
+    ]
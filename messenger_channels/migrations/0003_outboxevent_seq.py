@@ -0,0 +1,35 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:39
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def set_sent_events_seq(apps, schema_editor):
+    """Sent events keep their id as cursor, so cursors
+    of clients stay valid"""
+    OutboxEvent = apps.get_model('messenger_channels', 'OutboxEvent')
+    OutboxEvent.objects.filter(sent_at__isnull=False).update(seq=F('id'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messenger_channels', '0002_outboxevent_sent_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='outboxevent',
+            name='outbox_group_id_idx',
+        ),
+        migrations.AddField(
+            model_name='outboxevent',
+            name='seq',
+            field=models.PositiveBigIntegerField(blank=True, null=True, unique=True, verbose_name='Sequence'),
+        ),
+        migrations.RunPython(set_sent_events_seq, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='outboxevent',
+            index=models.Index(fields=['group_name', 'seq'], name='outbox_group_seq_idx'),
+        ),
+    ]
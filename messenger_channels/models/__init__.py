@@ -0,0 +1 @@
+from .outbox_event import OutboxEvent
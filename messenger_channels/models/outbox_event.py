@@ -0,0 +1,33 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class OutboxEvent(models.Model):
+    """
+    Channel layer event that is waiting to be sent.
+
+    Events are created in the same transaction as the change that
+    caused them and are sent by `dispatch_outbox_events` in `id` order.
+    sent events are kept for `OUTBOX_RETENTION`, so clients can get
+    events that they missed.
+
+    `seq` is set by dispatcher right before sending, it's the cursor of
+    clients instead of `id`, because ids are assigned at insert and an
+    event with a lower id may be committed after a higher one is sent.
+    """
+    group_name = models.CharField(_("Group name"), max_length=100)
+    event = models.JSONField(_("Event"), encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
+    sent_at = models.DateTimeField(_("Sent at"), null=True, blank=True)
+    seq = models.PositiveBigIntegerField(_("Sequence"), null=True,
+                                         blank=True, unique=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['sent_at', 'id'],
+                         name='outbox_sent_id_idx'),
+            models.Index(fields=['group_name', 'seq'],
+                         name='outbox_group_seq_idx'),
+        ]
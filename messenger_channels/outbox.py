@@ -0,0 +1,173 @@
+import asyncio
+from functools import partial
+from django.conf import settings
+from django.core.cache import cache as backend_cache
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+from core.cache import cache
+from .models import OutboxEvent
+from .fanout import group_events
+
+OUTBOX_BATCH_SIZE = getattr(settings, 'OUTBOX_BATCH_SIZE', 100)
+OUTBOX_LOCK_TIMEOUT = getattr(settings, 'OUTBOX_LOCK_TIMEOUT', 60)
+OUTBOX_RETENTION = getattr(settings, 'OUTBOX_RETENTION',
+                           timezone.timedelta(days=1))
+
+
+def add_event(group_name, event: dict) -> OutboxEvent:
+    """
+    Save `event` for `group_name` in outbox and dispatch it
+    when current transaction committed.
+    """
+    outbox_event = OutboxEvent.objects.create(group_name=str(group_name),
+                                              event=event)
+    schedule_dispatch()
+    return outbox_event
+
+
+def _dispatch_on_commit(state: dict):
+    if state['dispatched']:
+        return
+    state['dispatched'] = True
+
+    from .tasks import dispatch_outbox_events
+    dispatch_outbox_events.delay()
+
+
+def schedule_dispatch(using=None):
+    """
+    Dispatch outbox events after current transaction committed,
+    only once for every transaction.
+
+    Callbacks of a transaction share a state on the connection, and only
+    the first one that runs dispatches. The state is replaced after it's
+    dispatched, so it's kept for next transaction if callbacks are
+    discarded by a rollback.
+    """
+    connection = transaction.get_connection(using)
+    state = getattr(connection, 'outbox_dispatch_state', None)
+    if state is None or state['dispatched']:
+        state = connection.outbox_dispatch_state = {'dispatched': False}
+    transaction.on_commit(partial(_dispatch_on_commit, state), using=using)
+
+
+async def _send_group_events(layer, group_name, events):
+    for event in events:
+        await layer.group_send(group_name, event)
+
+
+async def _send_events(groups: dict[str, list[dict]], layer=None):
+    """Send events of every group in order,
+    and events of different groups concurrently"""
+    layer = layer or get_channel_layer()
+    await asyncio.gather(*[
+        _send_group_events(layer, group_name, group_events)
+        for group_name, group_events in groups.items()
+    ])
+
+
+def _set_seqs(events: list[OutboxEvent]):
+    """
+    Set `seq` of events that don't have it, after the last `seq`.
+    It's saved before events are sent, so clients can sync from it.
+
+    `seq` isn't less than `id`, so it keeps growing after all events
+    are pruned too.
+    """
+    new_events = [event for event in events if event.seq is None]
+    if not new_events:
+        return
+
+    seq = OutboxEvent.objects.aggregate(Max('seq'))['seq__max'] or 0
+    for event in new_events:
+        seq = event.seq = max(seq + 1, event.pk)
+    OutboxEvent.objects.bulk_update(new_events, ['seq'])
+
+
+def send_outbox_events(batch_size: int = OUTBOX_BATCH_SIZE) -> int:
+    """Send a batch of outbox events and set their `seq` and `sent_at`,
+    return number of sent events"""
+    events = list(OutboxEvent.objects.filter(sent_at__isnull=True)
+                  .order_by('id')[:batch_size])
+    if events:
+        _set_seqs(events)
+        async_to_sync(_send_events)(group_events(events))
+        OutboxEvent.objects.filter(pk__in=[event.pk for event in events])\
+            .update(sent_at=timezone.now())
+    return len(events)
+
+
+def dispatch_outbox_events(batch_size: int = OUTBOX_BATCH_SIZE) -> int:
+    """
+    Send outbox events until outbox is empty and return number of sent events.
+
+    Only one dispatcher sends events at a time, so events are sent in order.
+    The lock is extended after every batch, and dispatcher stops if it's
+    lost (a batch took longer than `OUTBOX_LOCK_TIMEOUT`).
+    events are marked as sent after they're sent, so an event may be sent
+    again if dispatcher stopped before marking it.
+    """
+    lock_key = cache.format_key(key_name='outbox_lock')
+    sent = 0
+    while True:
+        if not (token := cache.acquire_lock(lock_key, OUTBOX_LOCK_TIMEOUT)):
+            return sent
+
+        try:
+            while (count := send_outbox_events(batch_size)):
+                sent += count
+                if not cache.extend_lock(lock_key, token,
+                                         OUTBOX_LOCK_TIMEOUT):
+                    return sent
+        finally:
+            cache.release_lock(lock_key, token)
+
+        # Events that added while lock was held
+        if not OutboxEvent.objects.filter(sent_at__isnull=True).exists():
+            return sent
+
+
+def prune_outbox_events(retention=OUTBOX_RETENTION) -> int:
+    """Delete events that sent before `retention` and
+    return number of deleted events"""
+    events = OutboxEvent.objects.filter(
+        sent_at__lt=timezone.now() - retention)
+    last_seq = events.aggregate(Max('seq'))['seq__max']
+    if last_seq is None:
+        return 0
+
+    backend_cache.set(cache.format_key(key_name='outbox_pruned_id'),
+                      last_seq, timeout=None)
+    return events.filter(seq__lte=last_seq).delete()[0]
+
+
+class EventsExpired(Exception):
+    """Events after requested id were pruned"""
+
+
+def get_events_since(group_names, event_id: int, limit: int
+                     ) -> tuple[list[OutboxEvent], bool]:
+    """
+    Return `(events, has_more)` that `events` are at most `limit` events
+    of `group_names` that their `seq` is greater than `event_id`.
+
+    Only events that their `seq` is set by dispatcher are returned,
+    an event that is committed late gets a greater `seq` than the ones
+    that are sent before it, so it isn't skipped by cursor of client.
+
+    `EventsExpired` is raised if some of the events were pruned.
+    """
+    pruned_id = backend_cache.get(
+        cache.format_key(key_name='outbox_pruned_id'), 0)
+    if event_id < pruned_id:
+        raise EventsExpired
+
+    events = list(OutboxEvent.objects.filter(
+        group_name__in=[str(name) for name in group_names],
+        seq__gt=event_id,
+    ).order_by('seq')[:limit + 1])
+    return events[:limit], len(events) > limit
@@ -1,2 +1,3 @@
-from .chat_qs import(get_chat_ids, get_pvchat_ids,
-                     get_validated_chat_id, get_pvchat_ids_cached)
+from .chat_qs import(get_chat_ids, get_pvchat_ids, get_member_ranks,
+                     get_validated_chat_id, get_pvchat_ids_cached,
+                     get_chat_user_ids_cached)
@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import Iterable, Optional
 
 from core.cache import cache
+from community.models import Member
 from conversation.models import Conversation, PrivateChat
 from conversation.querysets import get_or_create_pvchat
 
@@ -33,6 +34,39 @@ def get_chat_ids(user_id) -> set:
     )
 
 
+def get_chat_user_ids_cached(chat_ids: Iterable[int]) -> dict[int, list]:
+    """
+    Return ids of users that have a conversation with every chat of
+    `chat_ids`, cached ones are read by a single `get_many` and
+    the others by a single query.
+    """
+    keys = {cache.format_key(chat_id, key_name='chat_users'): chat_id
+            for chat_id in chat_ids}
+    user_ids = {keys[key]: ids for key, ids in cache.get_many(keys).items()}
+
+    missing = [chat_id for chat_id in keys.values()
+               if chat_id not in user_ids]
+    if missing:
+        found = {chat_id: [] for chat_id in missing}
+        for chat_id, user_id in Conversation.objects.filter(
+                chat_id__in=missing).values_list('chat_id', 'user_id'):
+            found[chat_id].append(user_id)
+        cache.set_many({
+            cache.format_key(chat_id, key_name='chat_users'): ids
+            for chat_id, ids in found.items()
+        })
+        user_ids |= found
+    return user_ids
+
+
+def get_member_ranks(user_id) -> dict[int, int]:
+    """Return ranks of user in communities by their id"""
+    return dict(
+        Member.objects.filter(user_id=user_id)
+        .values_list('community_id', 'rank')
+    )
+
+
 def get_validated_chat_id(chat_id, user_id) -> Optional[int]:
     """
     `chat_id` > 0, means that the client sent an user id as `chat_id`,
@@ -42,10 +76,8 @@ def get_validated_chat_id(chat_id, user_id) -> Optional[int]:
     if chat_id < 0:
         return chat_id
 
-    cache_key = cache.format_key(chat_id, user_id, key_name='pv_id')
-    if cache_key not in cache._cache:
-        cache_key = cache.format_key(user_id, chat_id, key_name='pv_id')
-
+    cache_key = cache.format_key(*sorted([chat_id, user_id]),
+                                 key_name='pv_id')
     pv_id = cache.get(cache_key)
 
     if not pv_id:
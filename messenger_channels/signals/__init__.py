@@ -1,3 +1,4 @@
 from .message_signals import *
 from .chat_signals import *
 from .user_signals import *
+from .member_signals import *
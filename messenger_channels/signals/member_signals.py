@@ -0,0 +1,26 @@
+from django.dispatch import receiver
+from django.db.models.signals import post_save, post_delete
+
+from messenger_channels.outbox import add_event
+from community.models import Member
+
+
+def send_member_rank(member: Member, rank):
+    add_event(
+        f'user_{member.user_id}',
+        {
+            'type': "event.member_rank",
+            'community_id': member.community_id,
+            'rank': rank,
+        }
+    )
+
+
+@receiver(post_save, sender=Member)
+def send_member_rank_to_consumers(sender, instance: Member, **kwargs):
+    send_member_rank(instance, instance.rank)
+
+
+@receiver(post_delete, sender=Member)
+def send_member_removed_to_consumers(sender, instance: Member, **kwargs):
+    send_member_rank(instance, None)
@@ -3,7 +3,8 @@ from django.dispatch import receiver, Signal
 
 from core.cache import cache
 from core.signals import post_soft_delete
-from message.models import Message, DeletedMessage, Seen
+from conversation.models import Conversation
+from message.models import Message, DeletedMessage
 from message.serializers import (MessageSerializer, DeletedMessageSerializer,
                                  HardDeletedMessageSerializer, SeenInfoSerializer)
 from messenger_channels.utils import send_message_event, send_event
@@ -11,6 +12,9 @@ from messenger_channels.utils import send_message_event, send_event
 
 pre_update_message = Signal(providing_args=['instance'])
 post_update_message = Signal(providing_args=['instance'])
+post_seen_message = Signal(providing_args=['user', 'chat_id', 'last_read_id'])
+"""Sent when read watermark of user's conversation moved forward
+to `last_read_id`"""
 
 
 @receiver(post_save, sender=Message)
@@ -28,22 +32,25 @@ def send_message_to_channels(sender, instance: Message,
 def send_delete_message_to_channels(sender,
                                     instance: DeletedMessage,
                                     created, **kwargs):
-    send_message_event(
+    send_event(
         group_name=f"user_{instance.user_id}",
         event_title="delete_message",
-        message=DeletedMessageSerializer(instance).data
+        event_type='delete_message',
+        message=DeletedMessageSerializer(instance).data,
+        msg_id=instance.message_id,
+        chat_id=instance.message.chat_id,
     )
 
 
 @receiver(post_save, sender=DeletedMessage)
-def add_deleted_message_to_cache(sender,
-                                 instance: DeletedMessage,
-                                 created, **kwargs):
+def remove_deleted_messages_from_cache(sender,
+                                       instance: DeletedMessage,
+                                       created, **kwargs):
 
-    cache_key = cache.format_key(key_name='deleted_message',
-                                 msg_id=instance.message_id,
+    cache_key = cache.format_key(key_name='deleted_messages',
+                                 chat_id=instance.message.chat_id,
                                  user_id=instance.user_id)
-    cache.set(cache_key, True)
+    cache.delete(cache_key)
 
 
 @receiver([post_soft_delete, post_delete], sender=Message)
@@ -54,6 +61,7 @@ def send_hard_delete_message_to_channels(sender, instance: Message, **_):
         event_type='change_in_message',
         message=HardDeletedMessageSerializer(instance).data,
         msg_id=instance.pk,
+        chat_id=instance.chat_id,
     )
 
 
@@ -65,6 +73,7 @@ def send_update_message_to_channels(sender, instance: Message, **_):
         event_type='change_in_message',
         message=MessageSerializer(instance).data,
         msg_id=instance.pk,
+        chat_id=instance.chat_id,
     )
 
 
@@ -75,13 +84,11 @@ def set_message_is_edited(sender, instance: Message, **_):
         instance.save()
 
 
-@receiver(post_save, sender=Seen)
-def send_seen_message_to_channels(sender, instance: Seen, created, **_):
-    if created:
-        send_event(
-            group_name=instance.message.chat_id,
-            event_title="seen_message",
-            event_type='change_in_message',
-            message=SeenInfoSerializer(instance).data,
-            msg_id=instance.message_id,
-        )
+@receiver(post_seen_message, sender=Conversation)
+def send_seen_message_to_channels(sender, user, chat_id, last_read_id, **_):
+    send_message_event(
+        group_name=chat_id,
+        event_title="seen_message",
+        message=SeenInfoSerializer({'user': user, 'chat_id': chat_id,
+                                    'last_read_id': last_read_id}).data,
+    )
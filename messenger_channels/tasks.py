@@ -0,0 +1,15 @@
+from celery import shared_task as task
+
+from . import outbox
+
+
+@task
+def dispatch_outbox_events():
+    """Send channel layer events that are waiting in outbox"""
+    return outbox.dispatch_outbox_events()
+
+
+@task
+def prune_outbox_events():
+    """Delete events that are kept for `OUTBOX_RETENTION`"""
+    return outbox.prune_outbox_events()
@@ -0,0 +1,33 @@
+from asgiref.sync import async_to_sync
+from channels.layers import InMemoryChannelLayer
+from django.test.testcases import SimpleTestCase
+
+from messenger_channels.consumers import MessengerConsumer
+
+
+class ConsumerGroupsTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.layer = InMemoryChannelLayer()
+        self.consumer = MessengerConsumer()
+        self.consumer.channel_layer = self.layer
+        self.consumer.channel_name = async_to_sync(self.layer.new_channel)()
+
+    def test_groups_is_set(self):
+        self.assertEqual(self.consumer.groups, set())
+
+    def test_groups_join(self):
+        async_to_sync(self.consumer.group_join)('1')
+        async_to_sync(self.consumer.groups_join)([1, '2', 2, -3])
+        self.assertEqual(self.consumer.groups, {'1', '2', '-3'})
+
+        for group in self.consumer.groups:
+            async_to_sync(self.layer.group_send)(group, {'type': group})
+            message = async_to_sync(self.layer.receive)(
+                self.consumer.channel_name)
+            self.assertEqual(message['type'], group)
+
+    def test_group_leave(self):
+        async_to_sync(self.consumer.groups_join)(['1', '2'])
+        async_to_sync(self.consumer.group_leave)('1')
+        async_to_sync(self.consumer.group_leave)('1')
+        self.assertEqual(self.consumer.groups, {'2'})
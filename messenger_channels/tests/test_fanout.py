@@ -0,0 +1,121 @@
+import json
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.test.testcases import TestCase
+
+from core.tests.mixins import ClearCacheMixin
+from conversation.models import Conversation
+from conversation.tests.utils import create_private_chat
+from user.tests.utils import create_active_user
+from messenger_channels import outbox
+from messenger_channels.consumers import MessengerConsumer
+from messenger_channels.fanout import FANOUT_CHAT, FANOUT_USER, group_events
+from messenger_channels.models import OutboxEvent
+
+
+class FanoutTest(ClearCacheMixin, TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.users = [create_active_user(), create_active_user()]
+        self.chat = create_private_chat(*self.users)
+        OutboxEvent.objects.all().delete()
+
+    def add_events(self) -> list[OutboxEvent]:
+        return [
+            outbox.add_event(self.chat.pk, {'type': 'event.test', 'n': 1}),
+            outbox.add_event('user_test', {'type': 'event.test', 'n': 2}),
+            outbox.add_event(self.chat.pk, {'type': 'event.test', 'n': 3}),
+        ]
+
+    def user_group(self, index) -> str:
+        return f'user_{self.users[index].pk}'
+
+    def get_numbers(self, groups, group_name) -> list:
+        return [event['n'] for event in groups[group_name]]
+
+    def test_chat_mode(self):
+        groups = group_events(self.add_events(), FANOUT_CHAT)
+        self.assertEqual(self.get_numbers(groups, str(self.chat.pk)), [1, 3])
+        self.assertEqual(self.get_numbers(groups, 'user_test'), [2])
+
+    def test_user_mode(self):
+        events = self.add_events()
+        groups = group_events(events, FANOUT_USER)
+
+        self.assertNotIn(str(self.chat.pk), groups)
+        for index in range(2):
+            self.assertEqual(
+                self.get_numbers(groups, self.user_group(index)), [1, 3])
+        self.assertEqual(self.get_numbers(groups, 'user_test'), [2])
+
+        # Users of chats are cached
+        with self.assertNumQueries(0):
+            group_events(events, FANOUT_USER)
+
+    def test_user_mode_chat_users_updated(self):
+        events = self.add_events()
+        group_events(events, FANOUT_USER)
+
+        Conversation.objects.filter(user=self.users[0]).delete()
+        groups = group_events(events, FANOUT_USER)
+        self.assertNotIn(self.user_group(0), groups)
+
+        new_user = create_active_user()
+        Conversation.objects.create(chat=self.chat, user=new_user)
+        groups = group_events(events, FANOUT_USER)
+        self.assertIn(f'user_{new_user.pk}', groups)
+
+    @patch('messenger_channels.fanout.CHANNELS_FANOUT_MODE', FANOUT_USER)
+    def test_dispatch_user_mode(self):
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(self.user_group(1), channel)
+
+        outbox.add_event(self.chat.pk, {'type': 'event.test'})
+        outbox.send_outbox_events()
+
+        event = async_to_sync(layer.receive)(channel)
+        self.assertEqual(event['type'], 'event.test')
+
+    @patch('messenger_channels.fanout.CHANNELS_MSGPACK_FRAMES', False)
+    def test_events_encoded_once(self):
+        outbox.add_event(self.chat.pk, {
+            'type': 'event.change_in_message', 'event': 'update_message',
+            'message': {'text': 'hi'}, 'msg_id': 1, 'chat_id': self.chat.pk})
+        outbox_event = OutboxEvent.objects.get()
+        outbox_event.seq = 5
+        event = group_events([outbox_event], FANOUT_CHAT)[str(self.chat.pk)][0]
+
+        # Only routing keys and encoded body are sent on channel layer
+        self.assertEqual(set(event), {'type', 'msg_id', 'chat_id', 'text'})
+        self.assertEqual(json.loads(event['text']), {
+            'event': 'update_message', 'message': {'text': 'hi'},
+            'event_id': 5})
+
+    def test_internal_events_not_encoded(self):
+        outbox.add_event('user_test', {'type': 'event.member_rank',
+                                       'community_id': 1, 'rank': None})
+        event = group_events(OutboxEvent.objects.all())['user_test'][0]
+        self.assertNotIn('text', event)
+        self.assertEqual(event['community_id'], 1)
+
+    def test_encoded_event_sent(self):
+        sent = []
+        consumer = MessengerConsumer()
+        consumer.deleted_messages = {self.chat.pk: set()}
+
+        async def send(text_data):
+            sent.append(json.loads(text_data))
+        consumer.send = send
+
+        event = {'type': 'event.change_in_message', 'event': 'test',
+                 'msg_id': 1, 'chat_id': self.chat.pk}
+        async_to_sync(consumer.event_change_in_message)(
+            {**event, 'text': '{"event": "test"}'})
+        async_to_sync(consumer.event_send_message)({'text': '{}'})
+
+        self.assertEqual(sent, [
+            {'event': 'test', 'action': consumer.GlobalActions.EVENT},
+            {'action': consumer.GlobalActions.EVENT},
+        ])
@@ -0,0 +1,98 @@
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from django.test.testcases import SimpleTestCase
+
+from generic_channels.frames import (JSON_SUBPROTOCOL, MSGPACK_SUBPROTOCOL,
+                                     pack, splice_msgpack, unpack)
+from messenger_channels.consumers import MessengerConsumer
+from messenger_channels.fanout import encode_event
+
+
+class SpliceMsgpackTest(SimpleTestCase):
+    def test_splice(self):
+        for size in (0, 1, 15, 16, 70000):
+            data = {f'k{i}': i for i in range(size)}
+            self.assertEqual(unpack(splice_msgpack(pack(data), action='a')),
+                             {**data, 'action': 'a'})
+
+    def test_not_map(self):
+        with self.assertRaises(ValueError):
+            splice_msgpack(pack([1]), action='a')
+
+
+@patch.object(MessengerConsumer, 'subprotocols',
+              (MSGPACK_SUBPROTOCOL, JSON_SUBPROTOCOL))
+@patch('messenger_channels.fanout.CHANNELS_MSGPACK_FRAMES', True)
+class MsgpackFramesTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.sent = []
+        self.consumer = MessengerConsumer()
+        self.consumer.scope = {'subprotocols': ['v2', 'msgpack', 'json']}
+
+        async def send(text_data=None, bytes_data=None, close=False):
+            self.sent.append(text_data or unpack(bytes_data))
+        self.consumer.send = send
+
+    def test_select_subprotocol(self):
+        self.assertEqual(self.consumer.select_subprotocol(), 'msgpack')
+        self.assertTrue(self.consumer.binary_frames)
+
+        consumer = MessengerConsumer()
+        consumer.scope = {'subprotocols': ['json']}
+        self.assertEqual(consumer.select_subprotocol(), 'json')
+        self.assertFalse(consumer.binary_frames)
+
+    def test_send_json(self):
+        self.consumer.select_subprotocol()
+        async_to_sync(self.consumer.send_json)({'status': 'success'})
+        self.assertEqual(self.sent, [{'status': 'success'}])
+
+    def test_receive(self):
+        received = []
+
+        async def receive_json(content, **kwargs):
+            received.append(content.toDict())
+        self.consumer.receive_json = receive_json
+
+        self.consumer.select_subprotocol()
+        content = {'action': 'send_message', 'query': {'chat_id': 1}}
+        async_to_sync(self.consumer.receive)(bytes_data=pack(content))
+        self.assertEqual(received[0]['action'], content['action'])
+        self.assertEqual(received[0]['query'], content['query'])
+
+    def test_receive_invalid_frame(self):
+        self.consumer.select_subprotocol()
+        for data in (b'\xc1', b'\x92\x01', pack({}) + b'\x00'):
+            async_to_sync(self.consumer.receive)(bytes_data=data)
+        self.assertEqual(self.sent, [{
+            'status': 'error', 'detail': 'Invalid MessagePack frame'}] * 3)
+
+    def test_receive_bytes_of_json_connection(self):
+        with self.assertRaises(ValueError):
+            async_to_sync(self.consumer.receive)(bytes_data=pack({}))
+
+    def test_encoded_event_sent(self):
+        self.consumer.select_subprotocol()
+        event = encode_event(
+            {'type': 'event.send_message', 'event': 'test', 'n': 1})
+        self.assertEqual(unpack(event['bytes']), {'event': 'test', 'n': 1})
+
+        async_to_sync(self.consumer.event_send_message)(event)
+        del event['bytes']
+        async_to_sync(self.consumer.event_send_message)(event)
+        self.assertEqual(self.sent, [
+            {'event': 'test', 'n': 1, 'action': '__event__'}] * 2)
+
+
+@patch.object(MessengerConsumer, 'subprotocols', (JSON_SUBPROTOCOL,))
+@patch('messenger_channels.fanout.CHANNELS_MSGPACK_FRAMES', False)
+class MsgpackDisabledTest(SimpleTestCase):
+    def test_not_selected(self):
+        consumer = MessengerConsumer()
+        consumer.scope = {'subprotocols': ['msgpack']}
+        self.assertIsNone(consumer.select_subprotocol())
+        self.assertFalse(consumer.binary_frames)
+
+    def test_not_encoded(self):
+        event = encode_event({'type': 'event.send_message', 'event': 'test'})
+        self.assertNotIn('bytes', event)
@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+from asgiref.sync import async_to_sync
+from django.test.testcases import TestCase
+
+from community.models import Member
+from community.permissions import get_member_rank
+from community.tests.utils import create_member
+from messenger_channels.consumers import MessengerConsumer
+from messenger_channels.models import OutboxEvent
+from messenger_channels.querysets import get_member_ranks
+
+
+class MemberRanksTest(TestCase):
+    def setUp(self) -> None:
+        self.member = create_member(rank=Member.RankChoices.ADMIN)
+        self.consumer = MessengerConsumer()
+        self.consumer.member_ranks = get_member_ranks(self.member.user_id)
+
+    def get_rank_events(self) -> list:
+        return [
+            event.event for event in OutboxEvent.objects.filter(
+                group_name=f'user_{self.member.user_id}').order_by('pk')
+            if event.event['type'] == 'event.member_rank'
+        ]
+
+    def send_events(self):
+        for event in self.get_rank_events():
+            async_to_sync(self.consumer.event_member_rank)(event)
+
+    def get_rank(self):
+        request = SimpleNamespace(
+            user=self.member.user,
+            query={'chat_id': self.member.community_id})
+        with self.assertNumQueries(0):
+            return get_member_rank(request, self.consumer)
+
+    def test_ranks_loaded(self):
+        self.assertEqual(self.consumer.member_ranks,
+                         {self.member.community_id: Member.RankChoices.ADMIN})
+        self.assertEqual(self.get_rank(), Member.RankChoices.ADMIN)
+
+    def test_rank_updated_by_event(self):
+        self.member.rank = Member.RankChoices.BANNED
+        self.member.save()
+        self.send_events()
+        self.assertEqual(self.get_rank(), Member.RankChoices.BANNED)
+
+    def test_rank_removed_by_event(self):
+        self.member.delete()
+        self.assertIsNone(self.get_rank_events()[-1]['rank'])
+        self.send_events()
+        self.assertIsNone(self.get_rank())
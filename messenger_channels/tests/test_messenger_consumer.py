@@ -0,0 +1,95 @@
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.test.testcases import TransactionTestCase
+from django.utils import timezone
+
+from auth_app.tests.utils import create_access
+from conversation.tests.utils import create_private_chat
+from core.tests.mixins import ClearCacheMixin
+from message.tests.utils import create_message
+from messenger.asgi import websocket_application
+from messenger_channels import outbox
+
+
+@patch('messenger_channels.tasks.dispatch_outbox_events.delay',
+       outbox.dispatch_outbox_events)
+class MessengerConsumerTest(ClearCacheMixin, TransactionTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.accesses = [
+            create_access(activate_user=True, last_used=timezone.now())
+            for _ in range(2)]
+        self.chat = create_private_chat(
+            *[access.user for access in self.accesses])
+
+    def get_communicator(self, access=None) -> WebsocketCommunicator:
+        headers = ([(b'token', access.encrypted_token.encode())]
+                   if access else [])
+        return WebsocketCommunicator(websocket_application, '/ws/message/',
+                                     headers=headers)
+
+    def test_connect_denied(self):
+        async def run():
+            communicator = self.get_communicator()
+            await communicator.connect()
+            response = await communicator.receive_json_from()
+            self.assertEqual(response['status'], 'error')
+            self.assertEqual((await communicator.receive_output())['type'],
+                             'websocket.close')
+        async_to_sync(run)()
+
+    def test_send_message(self):
+        sender, receiver = self.accesses
+
+        async def run():
+            communicators = [self.get_communicator(access)
+                             for access in self.accesses]
+            for communicator in communicators:
+                connected, _ = await communicator.connect()
+                self.assertTrue(connected)
+
+            await communicators[0].send_json_to({
+                'action': 'send_message',
+                'query': {'chat_id': receiver.user_id},
+                'body': {'content_type': 'text', 'content': {'text': 'hi'}},
+            })
+            response = await communicators[0].receive_json_from(timeout=5)
+            self.assertEqual(response['status'], 'success')
+
+            for communicator in communicators:
+                event = await communicator.receive_json_from(timeout=5)
+                self.assertEqual(event['action'], '__event__')
+                self.assertEqual(event['event'], 'receive_message')
+                self.assertEqual(event['message']['content'], {'text': 'hi'})
+                self.assertNotIn('type', event)
+                await communicator.disconnect()
+
+        async_to_sync(run)()
+
+    def test_seen_until(self):
+        sender, receiver = self.accesses
+        message = create_message(sender=sender.user, chat=self.chat)
+
+        async def run():
+            communicator = self.get_communicator(sender)
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            receiver_communicator = self.get_communicator(receiver)
+            await receiver_communicator.connect()
+
+            await receiver_communicator.send_json_to({
+                'action': 'seen_until',
+                'query': {'chat_id': sender.user_id, 'message_id': message.pk},
+            })
+            event = await communicator.receive_json_from(timeout=5)
+            self.assertEqual(event['event'], 'seen_message')
+            self.assertEqual(event['message']['user']['id'],
+                             receiver.user_id)
+            self.assertEqual(event['message']['chat_id'], self.chat.pk)
+            self.assertEqual(event['message']['message_id'], message.pk)
+
+            await communicator.disconnect()
+            await receiver_communicator.disconnect()
+
+        async_to_sync(run)()
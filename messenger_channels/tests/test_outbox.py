@@ -0,0 +1,164 @@
+import json
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.cache import cache as backend_cache
+from django.db import transaction
+from django.test.testcases import TestCase
+from django.utils import timezone
+
+from core.cache import cache
+from core.tests.mixins import ClearCacheMixin
+from messenger_channels import outbox
+from messenger_channels.models import OutboxEvent
+from messenger_channels.utils import send_event
+
+
+class OutboxTest(ClearCacheMixin, TestCase):
+    def __send(self, group_name='test', title='test_event', **data):
+        send_event(group_name, title, event_type='send_message', **data)
+
+    def __add_channel(self, group_name='test') -> str:
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(group_name, channel)
+        return channel
+
+    def __receive(self, channel) -> dict:
+        """Return encoded body of received event"""
+        event = async_to_sync(get_channel_layer().receive)(channel)
+        return json.loads(event['text'])
+
+    def test_event_saved(self):
+        self.__send(number=1)
+        event = OutboxEvent.objects.get()
+        self.assertEqual(event.group_name, 'test')
+        self.assertEqual(event.event, {'type': 'event.send_message',
+                                       'event': 'test_event', 'number': 1})
+
+    def test_rolled_back_event_not_saved(self):
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                self.__send()
+                raise ValueError
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    @patch('messenger_channels.tasks.dispatch_outbox_events.delay')
+    def test_dispatch_scheduled_once_per_transaction(self, delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.__send()
+            self.__send(group_name='test2')
+            self.__send(group_name='test3')
+        delay.assert_called_once_with()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.__send()
+        self.assertEqual(delay.call_count, 2)
+
+    @patch('messenger_channels.tasks.dispatch_outbox_events.delay')
+    def test_dispatch_scheduled_after_rollback(self, delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError):
+                with transaction.atomic():
+                    self.__send()
+                    raise ValueError
+            self.__send()
+        delay.assert_called_once_with()
+
+    def test_dispatch(self):
+        channel = self.__add_channel()
+        other_channel = self.__add_channel('test2')
+        for number in range(3):
+            self.__send(number=number)
+        self.__send(group_name='test2')
+
+        self.assertEqual(outbox.dispatch_outbox_events(batch_size=2), 4)
+        self.assertFalse(OutboxEvent.objects.filter(
+            sent_at__isnull=True).exists())
+        events = [self.__receive(channel) for _ in range(3)]
+        self.assertEqual([event['number'] for event in events], [0, 1, 2])
+        self.assertEqual(events[0]['event_id'], OutboxEvent.objects.first().seq)
+        self.assertEqual(self.__receive(other_channel)['event'], 'test_event')
+
+    def test_dispatch_locked(self):
+        self.__send()
+        backend_cache.add(cache.format_key(key_name='outbox_lock'), True)
+        with patch.object(outbox, 'send_outbox_events') as send:
+            self.assertEqual(outbox.dispatch_outbox_events(), 0)
+            send.assert_not_called()
+        self.assertTrue(OutboxEvent.objects.exists())
+
+    def test_dispatch_stops_when_lock_lost(self):
+        lock_key = cache.format_key(key_name='outbox_lock')
+
+        def send_batch(batch_size):
+            # Lock expired while sending and is taken by another dispatcher
+            backend_cache.set(lock_key, 'other')
+            return 1
+
+        with patch.object(outbox, 'send_outbox_events',
+                          side_effect=send_batch) as send:
+            self.assertEqual(outbox.dispatch_outbox_events(), 1)
+            send.assert_called_once()
+        self.assertEqual(backend_cache.get(lock_key), 'other')
+
+    def test_events_since(self):
+        self.__send(number=0)
+        self.__send(group_name='test2')
+        self.__send(number=1)
+        self.__send(group_name='other')
+        outbox.dispatch_outbox_events()
+        first_seq = OutboxEvent.objects.first().seq
+
+        events, has_more = outbox.get_events_since(
+            ['test', 'test2'], first_seq, limit=1)
+        self.assertEqual([e.group_name for e in events], ['test2'])
+        self.assertTrue(has_more)
+
+        events, has_more = outbox.get_events_since(
+            ['test', 'test2'], events[-1].seq, limit=10)
+        self.assertEqual([e.event['number'] for e in events], [1])
+        self.assertFalse(has_more)
+
+    def test_unsent_events_not_synced(self):
+        self.__send()
+        self.assertEqual(outbox.get_events_since(['test'], 0, limit=10),
+                         ([], False))
+
+    def test_late_committed_event_synced(self):
+        # Id of first event is taken by a transaction that isn't committed
+        reserved = OutboxEvent.objects.create(group_name='test', event={})
+        reserved_id = reserved.pk
+        reserved.delete()
+        self.__send(number=2)
+        outbox.dispatch_outbox_events()
+        events, _ = outbox.get_events_since(['test'], 0, limit=10)
+        cursor = events[-1].seq
+
+        # Transaction of first event is committed
+        OutboxEvent.objects.create(pk=reserved_id, group_name='test',
+                                   event={'number': 1})
+        outbox.dispatch_outbox_events()
+
+        events, _ = outbox.get_events_since(['test'], cursor, limit=10)
+        self.assertEqual([e.pk for e in events], [reserved_id])
+        self.assertGreater(events[0].seq, cursor)
+
+    def test_prune(self):
+        self.__send()
+        self.__send()
+        outbox.dispatch_outbox_events()
+        self.__send()
+        first_seq = OutboxEvent.objects.first().seq
+
+        OutboxEvent.objects.filter(sent_at__isnull=False).update(
+            sent_at=timezone.now() - timezone.timedelta(days=2))
+        self.assertEqual(outbox.prune_outbox_events(
+            retention=timezone.timedelta(days=1)), 2)
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+
+        with self.assertRaises(outbox.EventsExpired):
+            outbox.get_events_since(['test'], first_seq, limit=10)
+        outbox.dispatch_outbox_events()
+        events, _ = outbox.get_events_since(['test'], first_seq + 1, limit=10)
+        self.assertEqual(len(events), 1)
@@ -1,7 +1,4 @@
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
-
-layer = get_channel_layer()
+from .outbox import add_event
 
 
 def send_event(group_name, event_title: str,
@@ -9,14 +6,17 @@ def send_event(group_name, event_title: str,
     '''
     Calls `event_type` method of channels in `group_name`
 
+    Event is saved in outbox and will be sent after
+    current transaction committed.
+
     PS: "event." will add to `event_type` if not exists.
     e.g. "send" -> "event.send"
     '''
     event_type = (event_type
                   if event_type.lower().startswith('event')
                   else f"event.{event_type}")
-    async_to_sync(layer.group_send)(
-        str(group_name),
+    add_event(
+        group_name,
         {
             'type': event_type,
             'event': event_title,
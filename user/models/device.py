@@ -1,14 +1,14 @@
 from django.conf import settings
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from django.contrib.auth.hashers import PBKDF2PasswordHasher
 
 from core.models.base import BaseToken
+from core.models.utils.hashers import HMACTokenHasher
 
 
 class Device(BaseToken):
     _token_length = 32
-    _hasher = PBKDF2PasswordHasher()
+    _hasher = HMACTokenHasher()
     _encrypt_key = settings.DEVICETOKEN_KEY
 
     class TypeChoices(models.TextChoices):
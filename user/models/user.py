@@ -8,10 +8,11 @@ from django.utils import timezone
 
 from picturic.fields import PictureField
 from global_id.models.mixins import GUIDMixin
+from global_id.models.manager import GUIDMixinManager
 from user.signals import user_online
 
 
-class UserManager(models.Manager):
+class UserManager(GUIDMixinManager):
     def _create_user(self, email, **extra_fields):
         """
         Create and save a user.
@@ -9,3 +9,10 @@ def get_user_contacts(user_id) -> QuerySet:
     """
     return Contact.objects.select_related("contacted_user")\
         .filter(user_id=user_id)
+
+
+def get_contacts_index(user) -> dict[int, Contact]:
+    """Return contacts of `user` by their `contacted_user_id`,
+    prefetched `user.contacts` is used if exists"""
+    return {contact.contacted_user_id: contact
+            for contact in user.contacts.all()}
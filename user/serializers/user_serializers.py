@@ -2,7 +2,9 @@ from rest_framework import serializers
 
 from core.utils import get_context_user
 from picturic.serializer_fields import PictureField
+from global_id.list_serializers import GUIDListSerializer
 from user.models import User
+from user.querysets import get_contacts_index
 
 
 class UserInfoSerializer(serializers.ModelSerializer):
@@ -11,6 +13,7 @@ class UserInfoSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = User
+        list_serializer_class = GUIDListSerializer
         fields = [
             'id',
             'first_name',
@@ -27,23 +30,30 @@ class UserInfoSerializer(serializers.ModelSerializer):
             'type',
         ]
 
+    def get_contacts_index(self, user) -> dict:
+        """Contacts of `user` are fetched once per serialization, and
+        shared between every nested or listed `UserInfoSerializer`"""
+        context = self.context
+        index = context.get('contacts_index')
+        if index is None:
+            index = context['contacts_index'] = get_contacts_index(user)
+        return index
+
     def to_representation(self, instance):
         data = super().to_representation(instance)
 
-        user = get_context_user(self.context)
+        # Serializers that are used outside of views (e.g. for channel
+        # events) don't have a user to show contact names for
+        user = (get_context_user(self.context)
+                if 'view' in self.context else None)
         if (not (user and hasattr(user, 'contacts'))
                 or instance == user):
             return data
 
-        contact_filter = list(filter(
-            lambda c: c.contacted_user_id == instance.pk,
-            user.contacts.all()
-        ))
-
-        if not contact_filter:
+        contact = self.get_contacts_index(user).get(instance.pk)
+        if not contact:
             return data
 
-        contact = contact_filter[0]
         data['first_name'] = contact.first_name
         data['last_name'] = contact.last_name
         data['full_name'] = contact.full_name
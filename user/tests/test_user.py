@@ -1,12 +1,16 @@
 from django.test.testcases import TestCase
+from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from datetime import timedelta
+from types import SimpleNamespace
 from unittest.mock import patch
 import time
 
 from auth_app.tests.utils import create_access
+from user.models import User
+from user.serializers import UserInfoSerializer
 from .utils.creators import create_user, create_contact
 from .utils.callers import UserViewCaller
 
@@ -22,6 +26,33 @@ class UserModelTest(TestCase):
             self.assertEqual(user.is_online, False)
 
 
+class UserInfoSerializerTest(TestCase):
+    def setUp(self) -> None:
+        self.user = create_user()
+        self.context = {
+            'view': SimpleNamespace(request=SimpleNamespace(user=self.user))
+        }
+
+    def serialize(self, users):
+        return UserInfoSerializer(users, many=True, context=self.context).data
+
+    def test_contacts_fetched_once(self):
+        users = [create_user() for _ in range(4)]
+        for index, user in enumerate(users[:2]):
+            create_contact(self.user, user, first_name=f'contact{index}')
+
+        ContentType.objects.get_for_model(User)
+        # One query for contacts and one for guids
+        with self.assertNumQueries(2):
+            data = self.serialize(users + [self.user])
+
+        self.assertEqual([u['is_contact'] for u in data],
+                         [True, True, False, False, False])
+        self.assertEqual([u['first_name'] for u in data[:2]],
+                         ['contact0', 'contact1'])
+        self.assertEqual(data[2]['first_name'], users[2].first_name)
+
+
 class UserViewTest(APITestCase):
     caller: UserViewCaller
 